@@ -0,0 +1,65 @@
+# Reports how much memory the AST of a large generated program takes:
+# node counts by class, bytes per node and the total size of the nodes and
+# the lists holding them. Shared nodes (singleton and pooled literals) are
+# counted once, as they are stored.
+#
+#   python benchmarks/ast_memory.py [megabytes]
+import os
+import sys
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.regex_scanner import RegexScanner
+from pylox.parser import Parser
+from pylox.expr import Expr
+from pylox.stmt import Stmt
+from scanner import generate
+
+
+def fields(node):
+    for cls in type(node).__mro__:
+        yield from getattr(cls, "__slots__", ())
+    yield from getattr(node, "__dict__", ())
+
+
+def measure(statements):
+    seen = set()
+    counts = Counter()
+    node_bytes = 0
+    list_bytes = 0
+    pending = [statements]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, list):
+            list_bytes += sys.getsizeof(item)
+            pending.extend(item)
+        elif isinstance(item, (Expr, Stmt)) and id(item) not in seen:
+            seen.add(id(item))
+            counts[type(item).__name__] += 1
+            node_bytes += sys.getsizeof(item)
+            if hasattr(item, "__dict__"):
+                node_bytes += sys.getsizeof(item.__dict__)
+            for name in fields(item):
+                pending.append(getattr(item, name))
+    return counts, node_bytes, list_bytes
+
+
+if __name__ == '__main__':
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    source = generate(megabytes)
+    tracemalloc.start()
+    statements = Parser(RegexScanner(source).iter_tokens()).parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    counts, node_bytes, list_bytes = measure(statements)
+    nodes = sum(counts.values())
+    print(f"source:         {len(source) / 1024 / 1024:.1f} MB")
+    for name, count in counts.most_common():
+        print(f"  {name:<12} {count}")
+    print(f"nodes:          {nodes}")
+    print(f"bytes per node: {node_bytes / nodes:.1f}")
+    print(f"AST size:       {(node_bytes + list_bytes) / 1024 / 1024:.1f} MB "
+          f"(nodes {node_bytes / 1024 / 1024:.1f} MB, lists {list_bytes / 1024 / 1024:.1f} MB)")
+    print(f"parse peak:     {peak / 1024 / 1024:.1f} MB (including tokens)")
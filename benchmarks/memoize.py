@@ -0,0 +1,40 @@
+# Runs recursive fib (benchmarks/fib.lox) as written and with fib
+# memoized by the memoize native, so every subproblem is computed once.
+#
+#   python benchmarks/memoize.py [trials]
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.session import Session
+
+
+def measure(source, trials):
+    best = None
+    for _ in range(trials):
+        session = Session()
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            session.run(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output.getvalue()
+
+
+if __name__ == '__main__':
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with open(os.path.join(os.path.dirname(__file__), "fib.lox")) as file:
+        source = file.read()
+    # Rebinding the global name routes the recursive calls through the cache.
+    memoized_source = source.replace("print fib(", "fib = memoize(fib, 1000);\nprint fib(")
+    plain, expected = measure(source, trials)
+    memoized, result = measure(memoized_source, trials)
+    assert result == expected, (result, expected)
+    print(f"plain:    {plain:.4f}s")
+    print(f"memoized: {memoized:.4f}s")
+    print(f"speedup:  {plain / memoized:.0f}x")
@@ -0,0 +1,52 @@
+# Compares returning from Lox functions through completion values (the
+# tree-walking Interpreter) with unwinding through ReturnException, on
+# recursive fib.
+#
+#   python benchmarks/return_path.py [trials]
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.session import Session
+from pylox.interpreter import Interpreter
+from pylox.return_exception import ReturnException
+
+
+# The previous return path: raise out of the function body and let
+# LoxFunction.call catch it.
+class ExceptionReturnInterpreter(Interpreter):
+
+    def visit_return_stmt(self, stmt):
+        value = None
+        if stmt.value is not None:
+            value = self._evaluate(stmt.value)
+        raise ReturnException(value)
+
+
+def measure(interpreter_class, path, trials):
+    with open(path) as file:
+        source = file.read()
+    session = Session()
+    session.interpreter = interpreter_class(session.reporter)
+    best = None
+    for _ in range(trials):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            session.run(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    path = os.path.join(os.path.dirname(__file__), "fib.lox")
+    exception = measure(ExceptionReturnInterpreter, path, trials)
+    completion = measure(Interpreter, path, trials)
+    print(f"ReturnException:   {exception:.3f}s")
+    print(f"completion values: {completion:.3f}s")
+    print(f"speedup:           {exception / completion:.2f}x")
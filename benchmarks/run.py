@@ -0,0 +1,162 @@
+# Runs the benchmark programs and times each phase separately: scanning,
+# parsing, resolving and interpreting. Every program is run for a number
+# of trials in a fresh Session and the per-phase minimum, median and mean
+# are reported. --output writes the results as JSON; --baseline compares
+# against such a file and exits 1 if any phase got slower than the
+# threshold allows. By default runs are compared with the committed
+# benchmarks/baseline.json, when it was made with the same engine, scanner
+# and generated size; refresh it with --output after an intended change.
+#
+#   python benchmarks/run.py [names ...] [--engine E] [--trials N]
+#                            [--output FILE] [--baseline FILE | --no-baseline]
+#                            [--threshold F]
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.session import Session
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.deep_stack import call_with_deep_stack
+from scanner import generate
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+BASELINE = os.path.join(DIRECTORY, "baseline.json")
+
+PROGRAMS = ["fib", "loops", "closures", "strings", "scopes", "collections"]
+
+PHASES = ["scan", "parse", "resolve", "interpret"]
+
+
+def load(name, megabytes):
+    if name == "generated":
+        return generate(megabytes)
+    with open(os.path.join(DIRECTORY, name + ".lox")) as file:
+        return file.read()
+
+
+def trial(source, engine, scanner):
+    session = Session(engine, scanner)
+    reporter = session.reporter
+    times = {}
+    start = time.perf_counter()
+    tokens = session.scanner(source, reporter).scan_tokens()
+    times["scan"] = time.perf_counter() - start
+    start = time.perf_counter()
+    statements = call_with_deep_stack(Parser(tokens, reporter, session.interpreter.max_nesting).parse)
+    times["parse"] = time.perf_counter() - start
+    start = time.perf_counter()
+    resolver = Resolver(reporter)
+    call_with_deep_stack(resolver.resolve, statements)
+    times["resolve"] = time.perf_counter() - start
+    if reporter.had_error:
+        raise SystemExit(f"benchmark failed to compile: {reporter.errors[0]}")
+    session.interpreter.globals.reserve(resolver.slot_count)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        session.interpreter.interpret(statements)
+    times["interpret"] = time.perf_counter() - start
+    if reporter.had_runtime_error:
+        raise SystemExit(f"benchmark failed to run: {reporter.errors[0]}")
+    return times
+
+
+def measure(source, engine, scanner, trials):
+    samples = [trial(source, engine, scanner) for _ in range(trials)]
+    result = {}
+    for phase in PHASES + ["total"]:
+        if phase == "total":
+            values = [sum(sample.values()) for sample in samples]
+        else:
+            values = [sample[phase] for sample in samples]
+        result[phase] = {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.mean(values),
+        }
+    return result
+
+
+# Compares the minimum time of each phase with the baseline's. Phases too
+# short to time reliably are skipped. Returns the regressions found.
+def compare(results, baseline, threshold, floor=0.001):
+    regressions = []
+    for name, phases in results.items():
+        if name not in baseline:
+            continue
+        for phase, stats in phases.items():
+            before = baseline[name].get(phase, {}).get("min")
+            after = stats["min"]
+            if before is None or max(before, after) < floor:
+                continue
+            ratio = after / before
+            marker = ""
+            if ratio > 1 + threshold:
+                marker = "  REGRESSION"
+                regressions.append((name, phase, ratio))
+            elif ratio < 1 - threshold:
+                marker = "  improved"
+            print(f"  {name:<10} {phase:<10} {before:9.4f}s -> {after:9.4f}s  {ratio:5.2f}x{marker}")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="benchmarks/run.py")
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"benchmarks to run (default: all of {', '.join(PROGRAMS + ['generated'])})")
+    parser.add_argument("--engine", choices=list(Session.engines), default="tree")
+    parser.add_argument("--scanner", choices=list(Session.scanners), default="regex")
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--megabytes", type=float, default=1,
+                        help="size of the generated source (default: 1)")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON to FILE")
+    parser.add_argument("--baseline", metavar="FILE", default=BASELINE,
+                        help="compare against results saved with --output (default: benchmarks/baseline.json)")
+    parser.add_argument("--no-baseline", dest="baseline", action="store_const", const=None,
+                        help="don't compare against a baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="fraction a phase may slow down before it counts as a regression (default: 0.10)")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    names = args.names or PROGRAMS + ["generated"]
+    results = {}
+    for name in names:
+        results[name] = measure(load(name, args.megabytes), args.engine, args.scanner, args.trials)
+        phases = results[name]
+        print(f"{name:<10} " + "  ".join(f"{phase} {phases[phase]['min']:.4f}s" for phase in PHASES + ["total"]))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "engine": args.engine,
+                "scanner": args.scanner,
+                "trials": args.trials,
+                "megabytes": args.megabytes,
+                "benchmarks": results,
+            }, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        settings = {"engine": args.engine, "scanner": args.scanner, "megabytes": args.megabytes}
+        different = [key for key, value in settings.items() if baseline.get(key) != value]
+        if different:
+            print(f"not comparing against {args.baseline}: it was made with a different "
+                  + ", ".join(f"{key} ({baseline.get(key)})" for key in different))
+        else:
+            print(f"against {args.baseline} (threshold {args.threshold:.0%}):")
+            regressions = compare(results, baseline["benchmarks"], args.threshold)
+            if regressions:
+                print(f"{len(regressions)} regression(s)")
+                sys.exit(1)
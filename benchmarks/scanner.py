@@ -0,0 +1,68 @@
+# Compares the character-by-character Scanner with the RegexScanner on a
+# large generated source, and checks both produce the same tokens.
+#
+#   python benchmarks/scanner.py [megabytes] [trials]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.scanner import Scanner
+from pylox.regex_scanner import RegexScanner
+
+UNIT = """// Generated unit {n}
+fun add_{n}(a, b) {{
+  var result = a + b * 2.5 - (a / 3);
+  if (result >= 100 and !(b == nil)) {{
+    print "large result in unit {n}";
+  }} else {{
+    result = result <= 0 or a != b;
+  }}
+  while (result < 10) result = result + 1;
+  return result;
+}}
+print add_{n}({n}, {n}.75);
+"""
+
+
+def generate(megabytes):
+    parts = []
+    size = 0
+    n = 0
+    while size < megabytes * 1024 * 1024:
+        unit = UNIT.format(n=n)
+        parts.append(unit)
+        size += len(unit)
+        n += 1
+    return "".join(parts)
+
+
+def measure(scanner, source, trials):
+    best = None
+    for _ in range(trials):
+        start = time.perf_counter()
+        tokens = scanner(source).scan_tokens()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, tokens
+
+
+def same_tokens(left, right):
+    return len(left) == len(right) and all(
+        (a.type, a.lexeme, a.literal, a.line) == (b.type, b.lexeme, b.literal, b.line)
+        for a, b in zip(left, right))
+
+
+if __name__ == '__main__':
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    trials = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    source = generate(megabytes)
+    char_time, char_tokens = measure(Scanner, source, trials)
+    regex_time, regex_tokens = measure(RegexScanner, source, trials)
+    if not same_tokens(char_tokens, regex_tokens):
+        sys.exit("token streams differ")
+    print(f"source:  {len(source) / 1024 / 1024:.1f} MB, {len(char_tokens)} tokens")
+    print(f"Scanner:      {char_time:.3f}s")
+    print(f"RegexScanner: {regex_time:.3f}s")
+    print(f"speedup:      {char_time / regex_time:.2f}x")
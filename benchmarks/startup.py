@@ -0,0 +1,66 @@
+# Times running a large script cold (no __loxcache__ entry, so it is
+# scanned, parsed, resolved and then cached) against warm (loaded from the
+# cache) and with the cache disabled. The script only declares functions,
+# so the times are dominated by startup.
+#
+#   python benchmarks/startup.py [megabytes] [trials]
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+UNIT = """fun unit_{n}(a, b) {{
+  var result = a + b * 2.5 - (a / 3);
+  if (result >= 100 and !(b == nil)) {{
+    print "large result in unit {n}";
+  }} else {{
+    result = result <= 0 or a != b;
+  }}
+  while (result < 10) result = result + 1;
+  return result;
+}}
+"""
+
+
+def generate(megabytes):
+    parts = []
+    size = 0
+    n = 0
+    while size < megabytes * 1024 * 1024:
+        parts.append(UNIT.format(n=n))
+        size += len(parts[-1])
+        n += 1
+    return "".join(parts)
+
+
+def run(script, *options):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "lox.py"), *options, script], check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    trials = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    directory = tempfile.mkdtemp()
+    try:
+        script = os.path.join(directory, "large.lox")
+        with open(script, "w") as file:
+            file.write(generate(megabytes))
+        cold, warm, uncached = [], [], []
+        for _ in range(trials):
+            shutil.rmtree(os.path.join(directory, "__loxcache__"), ignore_errors=True)
+            cold.append(run(script))
+            warm.append(run(script))
+            uncached.append(run(script, "--no-cache"))
+        print(f"script:   {megabytes} MB")
+        print(f"cold:     {min(cold):.3f}s")
+        print(f"warm:     {min(warm):.3f}s")
+        print(f"no cache: {min(uncached):.3f}s")
+        print(f"speedup:  {min(uncached) / min(warm):.2f}x")
+    finally:
+        shutil.rmtree(directory)
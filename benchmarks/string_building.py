@@ -0,0 +1,59 @@
+# Builds a string of the given size in a Lox loop, `s = s + chunk;`, with
+# Rope concatenation (the tree-walking Interpreter) and with plain str
+# concatenation, which copies the whole string on every iteration.
+#
+#   python benchmarks/string_building.py [megabytes] [trials]
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.session import Session
+from pylox.interpreter import Interpreter
+from pylox.token_type import TokenType
+
+CHUNK = "0123456789abcdef" * 4
+
+PROGRAM = """var chunk = "{chunk}";
+var s = "";
+for (var i = 0; i < {count}; i = i + 1) s = s + chunk;
+print s == s;
+"""
+
+
+# The previous concatenation: a new str every time.
+class StrConcatInterpreter(Interpreter):
+
+    def _binary(self, operator, left, right):
+        if operator.type == TokenType.PLUS and isinstance(left, str) and isinstance(right, str):
+            return left + right
+        return super()._binary(operator, left, right)
+
+
+def measure(interpreter_class, source, trials):
+    session = Session()
+    session.interpreter = interpreter_class(session.reporter)
+    best = None
+    for _ in range(trials):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            session.run(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    trials = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    count = int(megabytes * 1024 * 1024) // len(CHUNK)
+    source = PROGRAM.format(chunk=CHUNK, count=count)
+    plain = measure(StrConcatInterpreter, source, trials)
+    rope = measure(Interpreter, source, trials)
+    print(f"string:  {megabytes} MB in {count} appends")
+    print(f"str:     {plain:.3f}s")
+    print(f"Rope:    {rope:.3f}s")
+    print(f"speedup: {plain / rope:.2f}x")
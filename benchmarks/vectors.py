@@ -0,0 +1,52 @@
+# Compares a numeric workload written as Lox loops with the same workload
+# written with the vector natives: fill a vector with 0..n-1, scale it,
+# and take its dot product with itself.
+#
+#   python benchmarks/vectors.py [size] [trials]
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.session import Session
+
+LOOPS = """var n = {size};
+var v = Vector(n);
+for (var i = 0; i < n; i = i + 1) vectorSet(v, i, i);
+for (var i = 0; i < n; i = i + 1) vectorSet(v, i, vectorGet(v, i) * 0.5);
+var dot = 0;
+for (var i = 0; i < n; i = i + 1) dot = dot + vectorGet(v, i) * vectorGet(v, i);
+print dot;
+"""
+
+VECTORIZED = """var v = vectorMul(vectorRange(0, {size}), 0.5);
+print vectorDot(v, v);
+"""
+
+
+def measure(source, trials):
+    best = None
+    for _ in range(trials):
+        session = Session()
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            session.run(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output.getvalue().strip()
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    trials = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    loops, expected = measure(LOOPS.format(size=size), trials)
+    vectorized, result = measure(VECTORIZED.format(size=size), trials)
+    assert result == expected, (result, expected)
+    print(f"size:       {size}")
+    print(f"loops:      {loops:.3f}s")
+    print(f"vectorized: {vectorized:.3f}s")
+    print(f"speedup:    {loops / vectorized:.1f}x")
@@ -0,0 +1,70 @@
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from .session import Session
+from .script_result import ScriptResult
+
+# Runs many independent scripts on a pool of worker processes. Each worker
+# imports pylox and builds its Session once, in the pool initializer, and
+# then resets it between scripts, so a script only pays for its own run.
+# Results come back in the order the scripts were given.
+class BatchRunner:
+
+    def __init__(self, jobs=None, engine="tree", scanner="regex", optimize=False, cache=True):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.options = (engine, scanner, optimize, cache)
+
+    def run(self, paths):
+        paths = list(paths)
+        if not paths:
+            return []
+        jobs = min(self.jobs, len(paths))
+        # Hand out scripts a few at a time to keep the per-task overhead
+        # down, but in small enough chunks that the workers stay balanced.
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(jobs, initializer=_start_worker, initargs=self.options) as pool:
+            return list(pool.map(_run_script, paths, chunksize=chunksize))
+
+    # Reads a manifest: one script path per line, relative to the
+    # manifest's directory. Blank lines and lines starting with '#' are
+    # skipped.
+    @staticmethod
+    def read_manifest(path):
+        directory = os.path.dirname(path)
+        with open(path, 'r') as file:
+            lines = [line.strip() for line in file]
+        return [os.path.join(directory, line) for line in lines if line and not line.startswith("#")]
+
+
+# The worker's session, set up once by _start_worker.
+_session = None
+
+
+def _start_worker(engine, scanner, optimize, cache):
+    global _session
+    _session = Session(engine, scanner, optimize, cache)
+
+
+def _run_script(path):
+    _session.reset()
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    _session.reporter.stream = stderr
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(stdout):
+            exit_code = _session.run_file(path).exit_code
+    except OSError as error:
+        # Unreadable script: sysexits' EX_NOINPUT.
+        print(f"Can't open {path}: {error.strerror}", file=stderr)
+        exit_code = 66
+    except Exception:
+        # A crash in pylox itself fails this script only: sysexits'
+        # EX_SOFTWARE, with the traceback in its stderr.
+        traceback.print_exc(file=stderr)
+        exit_code = 70
+    return ScriptResult(path, exit_code, stdout.getvalue(), stderr.getvalue(),
+                        time.perf_counter() - start)
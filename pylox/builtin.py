@@ -0,0 +1,15 @@
+from .native_function import NativeFunction
+
+# A native implemented by a plain Python function, called with the
+# interpreter followed by the Lox arguments.
+class Builtin(NativeFunction):
+
+    def __init__(self, function, arity):
+        self._function = function
+        self._arity = arity
+
+    def call_native(self, interpreter, arguments):
+        return self._function(interpreter, *arguments)
+
+    def arity(self):
+        return self._arity
@@ -0,0 +1,107 @@
+from .visitor import Visitor
+from .expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from .stmt import Block, Expression, Function, If, Print, Return, Var, While
+from .deep_stack import descend
+
+# Decides for every Block whether a closure can capture one of its
+# variables. Only captured blocks need their own Environment per
+# execution; the Resolver hoists the others into the enclosing frame.
+class CaptureAnalyzer(Visitor):
+
+    def __init__(self):
+        # Each scope is (names declared so far, owning Block or None for a
+        # function scope, function nesting level).
+        self._scopes = []
+        self._function_level = 0
+        self._depth = 0
+
+    def analyze(self, statements):
+        for statement in statements:
+            self._analyze(statement)
+
+    def visit_block_stmt(self, stmt: Block):
+        stmt.scoped = False
+        self._scopes.append((set(), stmt, self._function_level))
+        self.analyze(stmt.statements)
+        self._scopes.pop()
+
+    def visit_var_stmt(self, stmt: Var):
+        if stmt.initializer is not None:
+            self._analyze(stmt.initializer)
+        self._declare(stmt.name)
+
+    def visit_function_stmt(self, stmt: Function):
+        self._declare(stmt.name)
+        self._function_level += 1
+        self._scopes.append((set(param.lexeme for param in stmt.params), None, self._function_level))
+        self.analyze(stmt.body)
+        self._scopes.pop()
+        self._function_level -= 1
+
+    def visit_expression_stmt(self, stmt: Expression):
+        self._analyze(stmt.expression)
+
+    def visit_if_stmt(self, stmt: If):
+        self._analyze(stmt.condittion)
+        self._analyze(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self._analyze(stmt.else_branch)
+
+    def visit_print_stmt(self, stmt: Print):
+        self._analyze(stmt.expression)
+
+    def visit_return_stmt(self, stmt: Return):
+        if stmt.value is not None:
+            self._analyze(stmt.value)
+
+    def visit_while_stmt(self, stmt: While):
+        self._analyze(stmt.condition)
+        self._analyze(stmt.body)
+
+    def visit_variable_expr(self, expr: Variable):
+        self._reference(expr.name)
+
+    def visit_assign_expr(self, expr: Assign):
+        self._analyze(expr.value)
+        self._reference(expr.name)
+
+    def visit_binary_expr(self, expr: Binary):
+        self._analyze(expr.left)
+        self._analyze(expr.right)
+
+    def visit_call_expr(self, expr: Call):
+        self._analyze(expr.callee)
+        for argument in expr.arguments:
+            self._analyze(argument)
+
+    def visit_grouping_expr(self, expr: Grouping):
+        self._analyze(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal):
+        pass
+
+    def visit_logical_expr(self, expr: Logical):
+        self._analyze(expr.left)
+        self._analyze(expr.right)
+
+    def visit_unary_expr(self, expr: Unary):
+        self._analyze(expr.right)
+
+    def _analyze(self, node):
+        self._depth += 1
+        if self._depth & 15:
+            node.accept(self)
+        else:
+            descend(node.accept, self)
+        self._depth -= 1
+
+    def _declare(self, name):
+        if self._scopes:
+            self._scopes[-1][0].add(name.lexeme)
+
+    def _reference(self, name):
+        for names, block, function_level in reversed(self._scopes):
+            if name.lexeme in names:
+                if block is not None and function_level < self._function_level:
+                    block.scoped = True
+                return
@@ -0,0 +1,306 @@
+from .closure_function import ClosureFunction
+from .lox_callable import LoxCallable
+from .runtime_exception import RuntimeException
+from .rope import STRINGS, concat
+from .native_error import NativeError
+from .visitor import Visitor
+from .expr import Assign, Binary, Grouping, Literal, Unary, Variable, Logical, Call
+from .stmt import Return, Print, Expression, Var, Block, If, While, Function
+from .token_type import TokenType
+from .environment import Environment
+
+# Compiles Expr/Stmt trees once into nested Python closures. Every node
+# becomes a function of the current Environment with its operator, slot
+# and depth already baked in, so running it involves no visitor dispatch.
+#
+# Expression closures return the value. Statement closures return None
+# when they complete normally and a one-element tuple holding the value
+# when a `return` is executed, which the enclosing function unwraps.
+class ClosureCompiler(Visitor):
+
+    def __init__(self, interpreter):
+        self._interpreter = interpreter
+
+    def compile(self, node):
+        return node.accept(self)
+
+    def compile_block(self, statements):
+        compiled = [self.compile(statement) for statement in statements]
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block(env):
+            for statement in compiled:
+                completion = statement(env)
+                if completion is not None:
+                    return completion
+        return block
+
+    def visit_literal_expr(self, expr: Literal):
+        value = expr.value
+        return lambda env: value
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return self.compile(expr.expression)
+
+    def visit_variable_expr(self, expr: Variable):
+        slot = expr.slot
+        if expr.depth is None:
+            get = self._interpreter.globals.get
+            name = expr.name
+            return lambda env: get(name)
+        if expr.depth == 0:
+            return lambda env: env._slots[slot]
+        if expr.depth == 1:
+            return lambda env: env._enclosing._slots[slot]
+        depth = expr.depth
+        return lambda env: env.ancestor(depth)._slots[slot]
+
+    def visit_assign_expr(self, expr: Assign):
+        value = self.compile(expr.value)
+        slot = expr.slot
+        if expr.depth is None:
+            assign = self._interpreter.globals._assign
+            name = expr.name
+
+            def assign_global(env):
+                result = value(env)
+                assign(name, result)
+                return result
+            return assign_global
+        if expr.depth == 0:
+            def assign_local(env):
+                result = env._slots[slot] = value(env)
+                return result
+            return assign_local
+        depth = expr.depth
+
+        def assign_enclosing(env):
+            result = env.ancestor(depth)._slots[slot] = value(env)
+            return result
+        return assign_enclosing
+
+    def visit_binary_expr(self, expr: Binary):
+        left = self.compile(expr.left)
+        right = self.compile(expr.right)
+        operator = expr.operator
+        check = self._interpreter._check_number_operands
+        is_equal = self._interpreter._is_equal
+        operator_type = operator.type
+
+        if operator_type == TokenType.MINUS:
+            def minus(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                return float(left_value) - float(right_value)
+            return minus
+        if operator_type == TokenType.SLASH:
+            def slash(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                if is_equal(right_value, 0):
+                    return None
+                return float(left_value) / float(right_value)
+            return slash
+        if operator_type == TokenType.STAR:
+            def star(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                return float(left_value) * float(right_value)
+            return star
+        if operator_type == TokenType.PLUS:
+            def plus(env):
+                left_value = left(env)
+                right_value = right(env)
+                if isinstance(left_value, (int, float)) and isinstance(right_value, (int, float)):
+                    return left_value + right_value
+                if isinstance(left_value, STRINGS) and isinstance(right_value, STRINGS):
+                    return concat(left_value, right_value)
+                raise RuntimeException(operator, "Operands must be two numbers or two strings.")
+            return plus
+        if operator_type == TokenType.GREATER:
+            def greater(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                return float(left_value) > float(right_value)
+            return greater
+        if operator_type == TokenType.GREATER_EQUAL:
+            def greater_equal(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                return float(left_value) >= float(right_value)
+            return greater_equal
+        if operator_type == TokenType.LESS:
+            def less(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                return float(left_value) < float(right_value)
+            return less
+        if operator_type == TokenType.LESS_EQUAL:
+            def less_equal(env):
+                left_value = left(env)
+                right_value = right(env)
+                check(operator, left_value, right_value)
+                return float(left_value) <= float(right_value)
+            return less_equal
+        if operator_type == TokenType.BANG_EQUAL:
+            return lambda env: not is_equal(left(env), right(env))
+        if operator_type == TokenType.EQUAL_EQUAL:
+            return lambda env: is_equal(left(env), right(env))
+
+        def unknown(env):
+            left(env)
+            right(env)
+            return None
+        return unknown
+
+    def visit_logical_expr(self, expr: Logical):
+        left = self.compile(expr.left)
+        right = self.compile(expr.right)
+        is_truthy = self._interpreter._is_truthy
+
+        if expr.operator.type == TokenType.OR:
+            def logical_or(env):
+                left_value = left(env)
+                if is_truthy(left_value):
+                    return left_value
+                return right(env)
+            return logical_or
+
+        def logical_and(env):
+            left_value = left(env)
+            if not is_truthy(left_value):
+                return left_value
+            return right(env)
+        return logical_and
+
+    def visit_unary_expr(self, expr: Unary):
+        right = self.compile(expr.right)
+        operator = expr.operator
+
+        if operator.type == TokenType.BANG:
+            is_truthy = self._interpreter._is_truthy
+            return lambda env: not is_truthy(right(env))
+        if operator.type == TokenType.MINUS:
+            check = self._interpreter._check_number_operand
+
+            def negate(env):
+                right_value = right(env)
+                check(operator, right_value)
+                return -float(right_value)
+            return negate
+
+        def unknown(env):
+            right(env)
+            return None
+        return unknown
+
+    def visit_call_expr(self, expr: Call):
+        callee = self.compile(expr.callee)
+        arguments = [self.compile(argument) for argument in expr.arguments]
+        paren = expr.paren
+        interpreter = self._interpreter
+
+        def call(env):
+            function = callee(env)
+            values = [argument(env) for argument in arguments]
+            if not isinstance(function, LoxCallable):
+                raise RuntimeException(paren, "Can only call functions and classes.")
+            if len(values) != function.arity():
+                raise RuntimeException(paren, f"Expected {function.arity()} arguments but got {len(values)}.")
+            try:
+                return function.call(interpreter, values)
+            except NativeError as error:
+                raise RuntimeException(paren, error.message)
+        return call
+
+    def visit_expression_stmt(self, stmt: Expression):
+        expression = self.compile(stmt.expression)
+
+        def expression_statement(env):
+            expression(env)
+        return expression_statement
+
+    def visit_print_stmt(self, stmt: Print):
+        expression = self.compile(stmt.expression)
+        interpreter = self._interpreter
+        stringify = interpreter._stringify
+
+        def print_statement(env):
+            interpreter.output.write_line(stringify(expression(env)))
+        return print_statement
+
+    def visit_var_stmt(self, stmt: Var):
+        initializer = self.compile(stmt.initializer) if stmt.initializer else None
+        define = self._define(stmt.name, stmt.slot)
+        if initializer is None:
+            return lambda env: define(env, None)
+        return lambda env: define(env, initializer(env))
+
+    def visit_function_stmt(self, stmt: Function):
+        body = self.compile_block(stmt.body)
+        define = self._define(stmt.name, stmt.slot)
+        return lambda env: define(env, ClosureFunction(stmt, body, env))
+
+    def visit_return_stmt(self, stmt: Return):
+        if stmt.value is None:
+            return lambda env: (None,)
+        value = self.compile(stmt.value)
+        return lambda env: (value(env),)
+
+    def visit_block_stmt(self, stmt: Block):
+        if not stmt.statements:
+            return lambda env: None
+        body = self.compile_block(stmt.statements)
+        if not stmt.scoped:
+            return body
+        slot_count = stmt.slot_count
+        return lambda env: body(Environment(env, slot_count))
+
+    def visit_if_stmt(self, stmt: If):
+        condition = self.compile(stmt.condittion)
+        then_branch = self.compile(stmt.then_branch)
+        else_branch = self.compile(stmt.else_branch) if stmt.else_branch is not None else None
+        is_truthy = self._interpreter._is_truthy
+
+        if else_branch is None:
+            def if_statement(env):
+                if is_truthy(condition(env)):
+                    return then_branch(env)
+            return if_statement
+
+        def if_else_statement(env):
+            if is_truthy(condition(env)):
+                return then_branch(env)
+            return else_branch(env)
+        return if_else_statement
+
+    def visit_while_stmt(self, stmt: While):
+        condition = self.compile(stmt.condition)
+        body = self.compile(stmt.body)
+        is_truthy = self._interpreter._is_truthy
+
+        def while_statement(env):
+            while is_truthy(condition(env)):
+                completion = body(env)
+                if completion is not None:
+                    return completion
+        return while_statement
+
+    def _define(self, name, slot):
+        if slot is None:
+            lexeme = name.lexeme
+
+            def define_global(env, value):
+                env.define(lexeme, value)
+            return define_global
+
+        def define_local(env, value):
+            env._slots[slot] = value
+        return define_local
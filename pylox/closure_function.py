@@ -0,0 +1,23 @@
+from .lox_callable import LoxCallable
+from .environment import Environment
+
+
+class ClosureFunction(LoxCallable):
+    def __init__(self, declaration, body, closure: Environment) -> None:
+        self._declaration = declaration
+        self._body = body
+        self._closure = closure
+
+    def call(self, interpreter, arguments):
+        environment = Environment(self._closure, self._declaration.slot_count)
+        environment._slots[:len(arguments)] = arguments
+        completion = self._body(environment)
+        if completion is not None:
+            return completion[0]
+        return None
+    
+    def arity(self):
+        return len(self._declaration.params)
+    
+    def __repr__(self) -> str:
+        return f"<fn {self._declaration.name.lexeme}>"
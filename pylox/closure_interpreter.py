@@ -0,0 +1,20 @@
+from .closure_compiler import ClosureCompiler
+from .interpreter import Interpreter
+from .runtime_exception import RuntimeException
+
+# Execution engine that compiles the resolved program into closures with
+# ClosureCompiler and runs those instead of walking the tree. It shares
+# globals, natives and value semantics with the tree-walking Interpreter.
+class ClosureInterpreter(Interpreter):
+
+    def __init__(self, reporter=None):
+        super().__init__(reporter)
+        self._compiler = ClosureCompiler(self)
+
+    def interpret(self, statements):
+        program = [self._compiler.compile(statement) for statement in statements]
+        try:
+            for statement in program:
+                statement(self.globals)
+        except RuntimeException as err:
+            self.reporter.runtime_error(err)
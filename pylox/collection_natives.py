@@ -0,0 +1,133 @@
+from .builtin import Builtin
+from .lox_file import LoxFile
+from .lox_iterator import LoxIterator
+from .lox_list import LoxList
+from .lox_map import LoxMap
+from .native_error import NativeError
+from .vector import Vector
+
+# Natives for the List and Map collections and for iterating over them.
+# As with vectors, operations are global functions taking the collection
+# first:
+#
+#   var names = List();
+#   listAppend(names, "lox");
+#   var counts = Map();
+#   mapSet(counts, "lox", mapGet(counts, "lox", 0) + 1);
+#   var it = iterate(counts);
+#   while (hasNext(it)) print next(it);
+
+def _list(value):
+    if type(value) is not LoxList:
+        raise NativeError("Expected a list.")
+    return value.values
+
+def _map(value):
+    if type(value) is not LoxMap:
+        raise NativeError("Expected a map.")
+    return value.entries
+
+def _index(value, limit):
+    if not isinstance(value, (int, float)) or not float(value).is_integer():
+        raise NativeError("List index must be a whole number.")
+    index = int(value)
+    if not 0 <= index < limit:
+        raise NativeError("List index out of range.")
+    return index
+
+
+def new_list(interpreter):
+    return LoxList()
+
+def list_append(interpreter, list, value):
+    _list(list).append(value)
+    return None
+
+def list_pop(interpreter, list):
+    values = _list(list)
+    if not values:
+        raise NativeError("Can't pop from an empty list.")
+    return values.pop()
+
+def list_get(interpreter, list, index):
+    values = _list(list)
+    return values[_index(index, len(values))]
+
+def list_set(interpreter, list, index, value):
+    values = _list(list)
+    values[_index(index, len(values))] = value
+    return None
+
+def list_length(interpreter, list):
+    return float(len(_list(list)))
+
+
+def new_map(interpreter):
+    return LoxMap()
+
+def map_get(interpreter, map, key, default):
+    return _map(map).get(key, default)
+
+def map_set(interpreter, map, key, value):
+    _map(map)[key] = value
+    return None
+
+def map_has(interpreter, map, key):
+    return key in _map(map)
+
+def map_remove(interpreter, map, key):
+    return _map(map).pop(key, None)
+
+def map_length(interpreter, map):
+    return float(len(_map(map)))
+
+def map_keys(interpreter, map):
+    return LoxList(list(_map(map)))
+
+def map_values(interpreter, map):
+    return LoxList(list(_map(map).values()))
+
+
+def iterate(interpreter, collection):
+    if type(collection) is LoxList:
+        return LoxIterator(collection.values)
+    if type(collection) is LoxMap:
+        # Over a snapshot of the keys, so the loop may change the map.
+        return LoxIterator(list(collection.entries))
+    if type(collection) is Vector:
+        return LoxIterator(collection.values)
+    if type(collection) is LoxFile:
+        return LoxIterator(collection.lines())
+    raise NativeError("Can only iterate over lists, maps, vectors and files.")
+
+def _iterator(value):
+    if type(value) is not LoxIterator:
+        raise NativeError("Expected an iterator.")
+    return value
+
+def has_next(interpreter, iterator):
+    return _iterator(iterator).has_next()
+
+def next_value(interpreter, iterator):
+    return _iterator(iterator).next()
+
+
+COLLECTION_NATIVES = {
+    "List": Builtin(new_list, 0),
+    "listAppend": Builtin(list_append, 2),
+    "listPop": Builtin(list_pop, 1),
+    "listGet": Builtin(list_get, 2),
+    "listSet": Builtin(list_set, 3),
+    "listLength": Builtin(list_length, 1),
+    "Map": Builtin(new_map, 0),
+    "mapGet": Builtin(map_get, 3),
+    "mapSet": Builtin(map_set, 3),
+    "mapHas": Builtin(map_has, 2),
+    "mapRemove": Builtin(map_remove, 2),
+    "mapLength": Builtin(map_length, 1),
+    "mapKeys": Builtin(map_keys, 1),
+    "mapValues": Builtin(map_values, 1),
+    "iterate": Builtin(iterate, 1),
+    "hasNext": Builtin(has_next, 1),
+    "next": Builtin(next_value, 1),
+}
@@ -0,0 +1,57 @@
+import sys
+import threading
+
+# The front end (Parser, CaptureAnalyzer, Resolver, Optimizer) and the
+# ProgramCache recurse once per level of nesting in the source, so deeply
+# nested source can exhaust Python's recursion limit. That limit is
+# process-wide, so rather than raising it these passes run on threads of
+# their own: frames are counted per thread, and every new thread starts
+# with an empty Python stack.
+#
+# call_with_deep_stack() runs a pass on a fresh thread. Inside it, the
+# passes count how deep they are and make every 16th level of recursive
+# call through descend(), which carries the recursion on in yet another
+# thread when the current one is close to the limit. Only deeply nested
+# programs ever need more than the first one.
+STACK_SIZE = 16 * 1024 * 1024
+
+# Frames left unused on each thread, for the 16 levels of recursion until
+# the next descend() and for reporting errors.
+HEADROOM = 250
+
+_lock = threading.Lock()
+
+def call_with_deep_stack(function, *args):
+    outcome = []
+
+    def run():
+        try:
+            outcome.append((True, function(*args)))
+        except BaseException as error:
+            outcome.append((False, error))
+
+    with _lock:
+        previous_size = threading.stack_size(STACK_SIZE)
+        try:
+            thread = threading.Thread(target=run)
+            try:
+                thread.start()
+            except RuntimeError:
+                # Out of threads: as far as the caller can tell, out of stack.
+                raise RecursionError("maximum recursion depth exceeded")
+        finally:
+            threading.stack_size(previous_size)
+    thread.join()
+    succeeded, value = outcome[0]
+    if not succeeded:
+        raise value
+    return value
+
+# Calls function(*args), on a new thread if this one has fewer than
+# HEADROOM frames left.
+def descend(function, *args):
+    try:
+        sys._getframe(max(sys.getrecursionlimit() - HEADROOM, 0))
+    except ValueError:
+        return function(*args)
+    return call_with_deep_stack(function, *args)
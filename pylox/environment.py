@@ -1,10 +1,14 @@
 from .token import Token
+from .runtime_exception import RuntimeException
 
 class Environment:
     
-    def __init__(self, enclosing=None):
+    def __init__(self, enclosing=None, size=0):
         self._enclosing = enclosing
         self._values = {}
+        # Locals resolved by the Resolver live in indexed slots; only
+        # globals are looked up by name.
+        self._slots = [None] * size
 
     def define(self, name, value):
         self._values[name] = value
@@ -16,7 +20,7 @@ class Environment:
         if self._enclosing:
             return self._enclosing.get(token)
         
-        raise RuntimeError(token, f"Undefined variable '{token.lexeme}'.")
+        raise RuntimeException(token, f"Undefined variable '{token.lexeme}'.")
     
     def _assign(self, token: Token, value):
         if token.lexeme in self._values:
@@ -27,4 +31,20 @@ class Environment:
             self._enclosing._assign(token, value)
             return
         
-        raise RuntimeError(token, f"Undefined variable '{token.lexeme}'.")
+        raise RuntimeException(token, f"Undefined variable '{token.lexeme}'.")
+
+    def reserve(self, size):
+        if len(self._slots) < size:
+            self._slots.extend([None] * (size - len(self._slots)))
+
+    def ancestor(self, depth):
+        environment = self
+        for _ in range(depth):
+            environment = environment._enclosing
+        return environment
+
+    def get_at(self, depth, slot):
+        return self.ancestor(depth)._slots[slot]
+
+    def assign_at(self, depth, slot, value):
+        self.ancestor(depth)._slots[slot] = value
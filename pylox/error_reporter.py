@@ -0,0 +1,39 @@
+from .lox_error import LoxError
+from .token_type import TokenType
+
+# Collects the errors reported by the scanner, parser, resolver and an
+# interpreter. Every session has its own. Given a stream, it also prints
+# each error as it is reported, the way the command line shows them,
+# after flushing `output` so the program's output so far comes first.
+class ErrorReporter:
+    def __init__(self, stream=None, output=None):
+        self.stream = stream
+        self.output = output
+        self.reset()
+
+    def reset(self):
+        self.errors = []
+        self.had_error = False
+        self.had_runtime_error = False
+
+    # Reports a compile error at a line number (from the scanner) or at a
+    # token (from the later passes).
+    def error(self, token, message):
+        if isinstance(token, int):
+            self._report(LoxError(LoxError.COMPILE, token, message))
+        elif token.type == TokenType.EOF:
+            self._report(LoxError(LoxError.COMPILE, token.line, message, " at end"))
+        else:
+            self._report(LoxError(LoxError.COMPILE, token.line, message, " at '" + token.lexeme + "'"))
+        self.had_error = True
+
+    def runtime_error(self, error):
+        self._report(LoxError(LoxError.RUNTIME, error.token.line, error.message))
+        self.had_runtime_error = True
+
+    def _report(self, error):
+        self.errors.append(error)
+        if self.stream is not None:
+            if self.output is not None:
+                self.output.flush()
+            print(error, file=self.stream)
@@ -3,17 +3,25 @@ from .token import Token
 from typing import List
 
 class Expr:
-    pass
+    __slots__ = ()
 
 class Assign(Expr):
+    __slots__ = ('name', 'value', 'depth', 'slot',)
+    KIND = 0
+
     def __init__(self, name: Token, value: Expr):
         self.name = name
         self.value = value
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_assign_expr(self)
 
 class Binary(Expr):
+    __slots__ = ('left', 'operator', 'right',)
+    KIND = 1
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -23,6 +31,9 @@ class Binary(Expr):
         return visitor.visit_binary_expr(self)
 
 class Call(Expr):
+    __slots__ = ('callee', 'paren', 'arguments',)
+    KIND = 2
+
     def __init__(self, callee: Expr, paren: Token, arguments: List[Expr]):
         self.callee = callee
         self.paren = paren
@@ -32,6 +43,9 @@ class Call(Expr):
         return visitor.visit_call_expr(self)
 
 class Grouping(Expr):
+    __slots__ = ('expression',)
+    KIND = 3
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -39,6 +53,9 @@ class Grouping(Expr):
         return visitor.visit_grouping_expr(self)
 
 class Literal(Expr):
+    __slots__ = ('value',)
+    KIND = 4
+
     def __init__(self, value):
         self.value = value
 
@@ -46,6 +63,9 @@ class Literal(Expr):
         return visitor.visit_literal_expr(self)
 
 class Logical(Expr):
+    __slots__ = ('left', 'operator', 'right',)
+    KIND = 5
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -55,6 +75,9 @@ class Logical(Expr):
         return visitor.visit_logical_expr(self)
 
 class Unary(Expr):
+    __slots__ = ('operator', 'right',)
+    KIND = 6
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
@@ -63,9 +86,17 @@ class Unary(Expr):
         return visitor.visit_unary_expr(self)
 
 class Variable(Expr):
+    __slots__ = ('name', 'depth', 'slot',)
+    KIND = 7
+
     def __init__(self, name: Token):
         self.name = name
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_variable_expr(self)
 
+Literal.TRUE = Literal(True)
+Literal.FALSE = Literal(False)
+Literal.NIL = Literal(None)
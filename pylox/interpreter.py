@@ -1,77 +1,104 @@
 from pylox.lox_callable import LoxCallable
 from pylox.lox_function import LoxFunction
-from pylox.return_exception import ReturnException
+from pylox.native_function import NativeFunction
+from pylox.native_error import NativeError
+from pylox.vector_natives import VECTOR_NATIVES
+from pylox.collection_natives import COLLECTION_NATIVES
+from pylox.io_natives import IO_NATIVES
+from pylox.memo_natives import MEMO_NATIVES
+from pylox.stringify import stringify
+from pylox.output import Output
+from pylox.rope import STRINGS, concat
 from pylox.runtime_exception import RuntimeException
 from .visitor import Visitor
 from .expr import Assign, Binary, Grouping, Literal, Unary, Variable, Logical, Call
 from .stmt import Return, Stmt, Print, Expression, Var, Block, If, While, Function
 from .token_type import TokenType
 from .environment import Environment
+from .error_reporter import ErrorReporter
 from typing import List
-import pylox.lox
+import sys
 import time
 
+# Each Interpreter owns its globals, so independent instances can run
+# programs side by side. Runtime errors go to its ErrorReporter.
 class Interpreter(Visitor):
 
-    globals = Environment()
-    _environment = globals
+    # How deeply nested a program the Parser accepts for this engine. It
+    # recurses in Python once per level, so deeper programs would run out
+    # of stack; they are a "Too much nesting." compile error instead.
+    max_nesting = 256
 
-    def __init__(self):
-        class Clock(LoxCallable):
+    def __init__(self, reporter=None):
+        self.output = Output()
+        # Where readLine reads from; sys.stdin when None.
+        self.input = None
+        self.reporter = reporter or ErrorReporter(sys.stderr, self.output)
 
-            def call(self, interpreter, arguments):
+        class Clock(NativeFunction):
+
+            def call_native(self, interpreter, arguments):
                 return time.time() / 1000
 
             def arity(self):
                 return 0
-            
-            def __repr__(self) -> str:
-                return "<native fn>"
 
-        self.globals.define("clock", Clock())
+        self.natives = {"clock": Clock(), **VECTOR_NATIVES, **COLLECTION_NATIVES, **IO_NATIVES,
+                        **MEMO_NATIVES}
+        self.reset()
+
+    # Forgets every global but the natives, which are reused as they are.
+    def reset(self):
+        self.globals = Environment()
+        self._environment = self.globals
+        for name, native in self.natives.items():
+            self.globals.define(name, native)
     
     def interpret(self, statements):
         try:
             for statement in statements:
                 self._execute(statement)
         except RuntimeException as err:
-            pylox.lox.Lox.runtime_error(err)
+            self.reporter.runtime_error(err)
 
     def visit_binary_expr(self, expr: Binary):
         left = self._evaluate(expr.left)
         right = self._evaluate(expr.right)
+        return self._binary(expr.operator, left, right)
 
-        if expr.operator.type == TokenType.MINUS:
-            self._check_number_operands(expr.operator, left, right)
+    def _binary(self, operator, left, right):
+        if operator.type == TokenType.MINUS:
+            self._check_number_operands(operator, left, right)
             return float(left) - float(right)
-        elif expr.operator.type == TokenType.SLASH:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.SLASH:
+            self._check_number_operands(operator, left, right)
             if self._is_equal(right, 0):
                 return None
             return float(left) / float(right)
-        elif expr.operator.type == TokenType.STAR:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.STAR:
+            self._check_number_operands(operator, left, right)
             return float(left) * float(right)
-        elif expr.operator.type == TokenType.PLUS:
-            if (isinstance(left, (int, float)) and isinstance(right, (int, float))) or \
-                (isinstance(left, str) and isinstance(right, str)):
+        elif operator.type == TokenType.PLUS:
+            if isinstance(left, (int, float)) and isinstance(right, (int, float)):
                 return left + right
-            raise RuntimeException(expr.operator, "Operands must be two numbers or two strings.")
-        elif expr.operator.type == TokenType.GREATER:
-            self._check_number_operands(expr.operator, left, right)
+            if isinstance(left, STRINGS) and isinstance(right, STRINGS):
+                return concat(left, right)
+            raise RuntimeException(operator, "Operands must be two numbers or two strings.")
+        elif operator.type == TokenType.GREATER:
+            self._check_number_operands(operator, left, right)
             return float(left) > float(right)
-        elif expr.operator.type == TokenType.GREATER_EQUAL:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.GREATER_EQUAL:
+            self._check_number_operands(operator, left, right)
             return float(left) >= float(right)
-        elif expr.operator.type == TokenType.LESS:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.LESS:
+            self._check_number_operands(operator, left, right)
             return float(left) < float(right)
-        elif expr.operator.type == TokenType.LESS_EQUAL:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.LESS_EQUAL:
+            self._check_number_operands(operator, left, right)
             return float(left) <= float(right)
-        elif expr.operator.type == TokenType.BANG_EQUAL:
+        elif operator.type == TokenType.BANG_EQUAL:
             return not self._is_equal(left, right)
-        elif expr.operator.type == TokenType.EQUAL_EQUAL:
+        elif operator.type == TokenType.EQUAL_EQUAL:
             return self._is_equal(left, right)
 
         return None
@@ -82,13 +109,17 @@ class Interpreter(Visitor):
         for argument in expr.arguments:
             arguments.append(self._evaluate(argument))
 
+        self._check_call(expr.paren, callee, arguments)
+        try:
+            return callee.call(self, arguments)
+        except NativeError as error:
+            raise RuntimeException(expr.paren, error.message)
+
+    def _check_call(self, paren, callee, arguments):
         if not isinstance(callee, LoxCallable):
-            raise RuntimeException(expr.paren, "Can only call functions and classes.")
-        
-        function = callee
-        if len(arguments) != function.arity():
-            raise RuntimeException(expr.paren, f"Expected {function.arity()} arguments but got {len(arguments)}.")
-        return function.call(self, arguments)
+            raise RuntimeException(paren, "Can only call functions and classes.")
+        if len(arguments) != callee.arity():
+            raise RuntimeException(paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
 
     def visit_grouping_expr(self, expr: Grouping):
         return self._evaluate(expr.expression)
@@ -108,67 +139,97 @@ class Interpreter(Visitor):
 
     def visit_unary_expr(self, expr: Unary):
         right = self._evaluate(expr.right)
-        if expr.operator.type == TokenType.BANG:
-            return self._is_truthy(right)
-        elif expr.operator.type == TokenType.MINUS:
-            self._check_number_operand(expr.operator, expr.right)
+        return self._unary(expr.operator, right)
+
+    def _unary(self, operator, right):
+        if operator.type == TokenType.BANG:
+            return not self._is_truthy(right)
+        elif operator.type == TokenType.MINUS:
+            self._check_number_operand(operator, right)
             return -float(right)
         return None
     
     def visit_variable_expr(self, expr: Variable):
-        return self._environment.get(expr.name)
+        if expr.depth is None:
+            return self.globals.get(expr.name)
+        return self._environment.get_at(expr.depth, expr.slot)
     
     def visit_if_stmt(self, stmt: If):
         if self._is_truthy(self._evaluate(stmt.condittion)):
-            self._execute(stmt.then_branch)
+            return self._execute(stmt.then_branch)
         elif stmt.else_branch is not None:
-            self._execute(stmt.else_branch)
+            return self._execute(stmt.else_branch)
 
     def visit_print_stmt(self, stmt: Expression):
         value = self._evaluate(stmt.expression)
-        print(self._stringify(value))
+        self.output.write_line(self._stringify(value))
     
     def visit_return_stmt(self, stmt: Return):
         value = None
         if stmt.value is not None:
             value = self._evaluate(stmt.value)
-        raise ReturnException(value)
+        return (value,)
     
     def visit_block_stmt(self, stmt: Block):
-        self._execute_block(stmt.statements, Environment(self._environment))
+        if stmt.scoped:
+            return self._execute_block(stmt.statements, Environment(self._environment, stmt.slot_count))
+        else:
+            # Nothing in the block is captured, so its variables live in
+            # hoisted slots of the current frame.
+            for statement in stmt.statements:
+                completion = self._execute(statement)
+                if completion is not None:
+                    return completion
 
     def visit_expression_stmt(self, stmt: Expression):
         self._evaluate(stmt.expression)
     
     def visit_function_stmt(self, stmt: Function):
         function = LoxFunction(stmt, self._environment)
-        self._environment.define(stmt.name.lexeme, function)
+        self._define(stmt.name, stmt.slot, function)
 
     def visit_var_stmt(self, stmt: Var):
         name = stmt.name
         value = None
         if stmt.initializer:
             value = self._evaluate(stmt.initializer)
-        self._environment.define(name.lexeme, value)
+        self._define(name, stmt.slot, value)
     
     def visit_while_stmt(self, stmt: While):
         while self._is_truthy(self._evaluate(stmt.condition)):
-            self._execute(stmt.body)
+            completion = self._execute(stmt.body)
+            if completion is not None:
+                return completion
 
     def visit_assign_expr(self, expr: Assign):
         value = self._evaluate(expr.value)
-        self._environment._assign(expr.name, value)
+        if expr.depth is None:
+            self.globals._assign(expr.name, value)
+        else:
+            self._environment.assign_at(expr.depth, expr.slot, value)
         return value
 
+    def _define(self, name, slot, value):
+        if slot is None:
+            self._environment.define(name.lexeme, value)
+        else:
+            self._environment._slots[slot] = value
+
+    # Statements complete normally by returning None. A return statement
+    # completes with a 1-tuple holding the returned value, which every
+    # enclosing statement passes up unchanged until LoxFunction.call
+    # unwraps it.
     def _execute(self, stmt):
-        stmt.accept(self)
+        return stmt.accept(self)
     
     def _execute_block(self, statements: List[Stmt], environment: Environment):
         previous = self._environment
         try:
             self._environment = environment
             for statement in statements:
-                self._execute(statement)
+                completion = self._execute(statement)
+                if completion is not None:
+                    return completion
         finally:
             self._environment = previous
 
@@ -197,13 +258,4 @@ class Interpreter(Visitor):
             raise RuntimeException(operator, "Operand must be a number.")
     
     def _stringify(self, object):
-        if object is None:
-            return "nil"
-        
-        if isinstance(object, float):
-            text = str(float(object))
-            if text.endswith(".0"):
-                text = text[0:len(text)-2]
-            return text
-
-        return str(object)
\ No newline at end of file
+        return stringify(object)
\ No newline at end of file
@@ -0,0 +1,69 @@
+import sys
+from .builtin import Builtin
+from .lox_file import LoxFile
+from .lox_iterator import LoxIterator
+from .native_error import NativeError
+
+# Natives reading input: lines from the interpreter's input (sys.stdin
+# unless the Session was given another stream) and lines or chunks from
+# files. Every read returns nil at the end of the input, so a script can
+# loop with
+#
+#   var file = openFile("data.txt");
+#   var line = fileReadLine(file);
+#   while (line != nil) { ...; line = fileReadLine(file); }
+#
+# or iterate over fileLines(file) with hasNext and next.
+
+def _file(value):
+    if type(value) is not LoxFile:
+        raise NativeError("Expected a file.")
+    return value
+
+def _size(value):
+    if not isinstance(value, (int, float)) or not float(value).is_integer() or value < 1:
+        raise NativeError("Read size must be a positive whole number.")
+    return int(value)
+
+
+def read_line(interpreter):
+    # Anything printed so far, such as a prompt, should be visible first.
+    interpreter.output.flush()
+    stream = sys.stdin if interpreter.input is None else interpreter.input
+    line = stream.readline()
+    if not line:
+        return None
+    if line.endswith("\n"):
+        return line[:-1]
+    return line
+
+def open_file(interpreter, path):
+    if not isinstance(path, str):
+        raise NativeError("File path must be a string.")
+    try:
+        return LoxFile(path)
+    except OSError as error:
+        raise NativeError(f"Can't open file '{path}': {error.strerror}.")
+
+def file_read_line(interpreter, file):
+    return _file(file).read_line()
+
+def file_read(interpreter, file, size):
+    return _file(file).read(_size(size))
+
+def file_lines(interpreter, file):
+    return LoxIterator(_file(file).lines())
+
+def close_file(interpreter, file):
+    _file(file).close()
+    return None
+
+
+IO_NATIVES = {
+    "readLine": Builtin(read_line, 0),
+    "openFile": Builtin(open_file, 1),
+    "fileReadLine": Builtin(file_read_line, 1),
+    "fileRead": Builtin(file_read, 2),
+    "fileLines": Builtin(file_lines, 1),
+    "closeFile": Builtin(close_file, 1),
+}
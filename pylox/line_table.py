@@ -0,0 +1,31 @@
+from array import array
+from bisect import bisect_left
+
+# Maps source offsets to line numbers. The newline index is only built the
+# first time a line is asked for, which for most runs is never (tree
+# engines need lines only to report errors).
+class LineTable:
+    def __init__(self, source):
+        self.source = source
+        self._newlines = None
+
+    # Reads from a copy of the source from now on, so lines can still be
+    # found once a memory-mapped source has been closed.
+    def detach(self):
+        if not isinstance(self.source, (str, bytes)):
+            self.source = bytes(self.source)
+
+    def line_of(self, offset):
+        if self._newlines is None:
+            self._newlines = self._index()
+        return bisect_left(self._newlines, offset) + 1
+
+    def _index(self):
+        newline = "\n" if isinstance(self.source, str) else b"\n"
+        find = self.source.find
+        newlines = array("q")
+        offset = find(newline)
+        while offset != -1:
+            newlines.append(offset)
+            offset = find(newline, offset + 1)
+        return newlines
@@ -1,69 +1,168 @@
+import argparse
+import json
 import sys
+import time
 
-from pylox.token_type import TokenType
-from .scanner import Scanner
-from .parser import Parser
-from .ast_printer import AstPrinter
-from pylox.interpreter import Interpreter
+from .session import Session
+from .batch_runner import BatchRunner
+from .output import Output
+from .transpiled_interpreter import TranspiledInterpreter
 
+# Command line front end. Everything it runs goes through one Session;
+# embedders use Session directly.
 class Lox:
-    interpreter = Interpreter()
-    had_error = False
-    had_runtime_error = False
 
-    def __init__(self):
-        args = sys.argv
-        if len(args) > 2:
-            print("Usage: python lox [script]")
+    def __init__(self, argv=None):
+        args = self._parse_args(sys.argv[1:] if argv is None else argv)
+        if args.manifest or len(args.scripts) > 1:
+            self.run_batch(args)
+            return
+        args.script = args.scripts[0] if args.scripts else None
+        self.session = Session(args.engine, args.scanner, args.optimize,
+                               cache=not args.no_cache, stream=sys.stderr, stats=args.stats,
+                               output_buffer=args.output_buffer)
+        interpreter = self.session.interpreter
+        if args.disassemble:
+            if args.engine != "vm":
+                print("--disassemble requires --engine vm", file=sys.stderr)
+                sys.exit(64)
+            interpreter.show_disassembly = True
+        if args.max_depth is not None:
+            if args.engine != "stack":
+                print("--max-depth requires --engine stack", file=sys.stderr)
+                sys.exit(64)
+            interpreter.max_depth = args.max_depth
+        if args.quickening_stats and args.engine != "quicken":
+            print("--quickening-stats requires --engine quicken", file=sys.stderr)
             sys.exit(64)
-        elif len(args) == 2:
-            self.run_file(args[1])
+        profiler = None
+        if args.profile or args.profile_stacks:
+            if args.engine not in ("tree", "quicken"):
+                print("--profile requires --engine tree or quicken", file=sys.stderr)
+                sys.exit(64)
+            profiler = self.session.profile()
+        if args.transpile:
+            if not args.script:
+                print("--transpile requires a script", file=sys.stderr)
+                sys.exit(64)
+            self.transpile_file(args.script, args.transpile)
+        elif args.script:
+            try:
+                self.run_file(args.script)
+            finally:
+                if args.quickening_stats:
+                    print(interpreter.quickening_report(), file=sys.stderr)
+                if profiler is not None:
+                    self.write_profile(profiler, args.profile_stacks)
         else:
             self.run_prompt()
 
+    @staticmethod
+    def _parse_args(argv):
+        parser = argparse.ArgumentParser(prog="lox", usage="python lox [options] [script ...]")
+        parser.add_argument("scripts", nargs="*", metavar="script",
+                            help="script to run; several scripts are run as a batch")
+        parser.add_argument("--engine", choices=list(Session.engines), default="tree",
+                            help="execution engine (default: tree)")
+        parser.add_argument("--scanner", choices=list(Session.scanners), default="regex",
+                            help="lexer implementation (default: regex)")
+        parser.add_argument("-O", "--optimize", action="store_true",
+                            help="fold constants and remove dead code before running")
+        parser.add_argument("--no-cache", action="store_true",
+                            help="don't read or write the compiled program cache (__loxcache__)")
+        parser.add_argument("--disassemble", action="store_true",
+                            help="print the bytecode before running it (vm engine)")
+        parser.add_argument("--transpile", metavar="OUT",
+                            help="write the script as a Python module to OUT instead of running it")
+        parser.add_argument("--max-depth", type=int, metavar="N",
+                            help="maximum Lox call depth (stack engine, default: 100000)")
+        parser.add_argument("--quickening-stats", action="store_true",
+                            help="report specialised and deoptimised sites after the run (quicken engine)")
+        parser.add_argument("--profile", action="store_true",
+                            help="report time spent in each Lox function after the run (tree and quicken engines)")
+        parser.add_argument("--profile-stacks", metavar="FILE",
+                            help="profile, and write collapsed stacks for a flame graph to FILE")
+        parser.add_argument("--output-buffer", type=int, metavar="N", default=Output.DEFAULT_BUFFER_SIZE,
+                            help="characters of printed output to buffer before writing it; 0 writes "
+                                 f"every line at once (default: {Output.DEFAULT_BUFFER_SIZE})")
+        parser.add_argument("--stats", action="store_true",
+                            help="report phase times, program size and interpreter counters after the run")
+        parser.add_argument("--manifest", metavar="FILE",
+                            help="run the scripts listed in FILE (one per line) as a batch")
+        parser.add_argument("-j", "--jobs", type=int, metavar="N",
+                            help="worker processes for a batch (default: one per CPU)")
+        parser.add_argument("--json", action="store_true",
+                            help="report a batch as JSON instead of text")
+        try:
+            return parser.parse_args(argv)
+        except SystemExit as exit:
+            sys.exit(64 if exit.code else 0)
+
     def run_file(self, path):
-        with open(path, 'r') as file:
-            self.run(file.read())
-            if Lox.had_error:
-                sys.exit(65)
-            if Lox.had_runtime_error:
-                sys.exit(70)
+        result = self.session.run_file(path)
+        if result.stats is not None:
+            print(result.stats.report(), file=sys.stderr)
+        if result.exit_code:
+            sys.exit(result.exit_code)
 
+    # Runs every script independently on a worker pool, then replays each
+    # one's output in order under a header with its exit status and time.
+    # Exits with the highest status any script had.
+    def run_batch(self, args):
+        for option in ("disassemble", "transpile", "max_depth", "quickening_stats",
+                       "profile", "profile_stacks", "stats"):
+            if getattr(args, option):
+                print(f"--{option.replace('_', '-')} can't be used with a batch", file=sys.stderr)
+                sys.exit(64)
+        paths = list(args.scripts)
+        if args.manifest:
+            try:
+                paths.extend(BatchRunner.read_manifest(args.manifest))
+            except OSError as error:
+                print(f"Can't read manifest {args.manifest}: {error.strerror}", file=sys.stderr)
+                sys.exit(66)
+        runner = BatchRunner(args.jobs, args.engine, args.scanner, args.optimize, not args.no_cache)
+        start = time.perf_counter()
+        results = runner.run(paths)
+        seconds = time.perf_counter() - start
+        failed = [result for result in results if result.exit_code]
+        if args.json:
+            json.dump({"scripts": [result.as_dict() for result in results],
+                       "failed": len(failed), "seconds": seconds}, sys.stdout, indent=2)
+            print()
+        else:
+            for result in results:
+                print(f"==> {result.path}: exit {result.exit_code} in {result.seconds:.3f}s")
+                sys.stdout.write(result.stdout)
+                sys.stdout.flush()
+                sys.stderr.write(result.stderr)
+                sys.stderr.flush()
+            print(f"{len(results)} scripts, {len(failed)} failed, {seconds:.3f}s")
+        if failed:
+            sys.exit(max(result.exit_code for result in failed))
+
+    def write_profile(self, profiler, stacks):
+        print(profiler.report(), file=sys.stderr)
+        if stacks:
+            with open(stacks, 'w') as file:
+                file.write(profiler.collapsed_stacks())
+
+    def transpile_file(self, path, out):
+        with open(path, 'r') as file:
+            statements = self.session.compile(file.read())
+        if statements is None:
+            sys.exit(65)
+        with open(out, 'w') as file:
+            file.write(TranspiledInterpreter.transpile(statements, path))
 
     def run_prompt(self):
         while True:
-            line = input("> ")
+            try:
+                line = input("> ")
+            except EOFError:
+                print()
+                return
             if line:
-                self.run(line)
-                Lox.had_error = False
-
-    def run(self, source):
-        # print(source)
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
-        parser = Parser(tokens)
-        statements = parser.parse()
-        if Lox.had_error:
-            return
-        self.interpreter.interpret(statements)
-
-    @staticmethod
-    def error(line, message):
-        Lox._report(line, "", message)
-    
-    @staticmethod
-    def _report(line, where, message):
-        print("[line " + str(line) + "] Error" + where + ": " + message, file=sys.stderr)
-        Lox.had_error = True
-
-    @staticmethod
-    def error(token, message):
-        if token.type == TokenType.EOF:
-            Lox._report(token.line, " at end", message)
-        else:
-            Lox._report(token.line, " at '" + token.lexeme + "'", message)
-
-    @staticmethod
-    def runtime_error(error):
-        print(f"{error.message}\n[line {error.token.line}]", file=sys.stderr)
-        Lox.had_runtime_error = True
\ No newline at end of file
+                result = self.session.run(line)
+                if result.stats is not None:
+                    print(result.stats.report(), file=sys.stderr)
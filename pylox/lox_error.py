@@ -0,0 +1,19 @@
+# A compile or runtime error reported while running a program. str() gives
+# the text the command line prints for it.
+class LoxError:
+    COMPILE = "compile"
+    RUNTIME = "runtime"
+
+    def __init__(self, kind, line, message, where=""):
+        self.kind = kind
+        self.line = line
+        self.message = message
+        self.where = where
+
+    def __str__(self):
+        if self.kind == LoxError.RUNTIME:
+            return f"{self.message}\n[line {self.line}]"
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+    def __repr__(self):
+        return f"LoxError({self.kind!r}, {self.line!r}, {self.message!r}, {self.where!r})"
@@ -0,0 +1,57 @@
+from .native_error import NativeError
+
+# A text file opened for reading by the openFile native. Reads go through
+# a large buffer, so a script can stream a file of any size line by line
+# or chunk by chunk in constant memory.
+class LoxFile:
+    __slots__ = ("path", "file")
+
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'r', encoding="utf-8", buffering=self.BUFFER_SIZE)
+
+    # The next line without its line ending, or None at the end of the file.
+    def read_line(self):
+        try:
+            return _line(self.file.readline())
+        except (UnicodeDecodeError, ValueError) as error:
+            raise self._error(error)
+
+    # Up to size characters, or None at the end of the file.
+    def read(self, size):
+        try:
+            return self.file.read(size) or None
+        except (UnicodeDecodeError, ValueError) as error:
+            raise self._error(error)
+
+    def lines(self):
+        try:
+            for line in self.file:
+                yield _line(line)
+        except (UnicodeDecodeError, ValueError) as error:
+            raise self._error(error)
+
+    def close(self):
+        self.file.close()
+
+    # Decoding fails on bytes that aren't UTF-8; anything else reading can
+    # raise ValueError for is reading a closed file.
+    def _error(self, error):
+        if isinstance(error, UnicodeDecodeError):
+            return NativeError(f"File '{self.path}' is not valid UTF-8.")
+        return NativeError("File is closed.")
+
+    def __str__(self):
+        return f"<file {self.path}>"
+
+    __repr__ = __str__
+
+
+def _line(line):
+    if not line:
+        return None
+    if line.endswith("\n"):
+        return line[:-1]
+    return line
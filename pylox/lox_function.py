@@ -1,5 +1,3 @@
-from codecs import EncodedFile
-
 from pylox.return_exception import ReturnException
 from .lox_callable import LoxCallable
 from .stmt import Function
@@ -12,14 +10,19 @@ class LoxFunction(LoxCallable):
         self._closure = closure
 
     def call(self, interpreter, arguments):
-        environment = Environment(self._closure)
-        for i in range(len(self._declaration.params)):
-            environment.define(self._declaration.params[i].lexeme, arguments[i])
+        environment = Environment(self._closure, self._declaration.slot_count)
+        # Parameters occupy the first slots of the function's scope.
+        environment._slots[:len(arguments)] = arguments
         
         try:
-            interpreter._execute_block(self._declaration.body, environment)
+            completion = interpreter._execute_block(self._declaration.body, environment)
         except ReturnException as return_value:
+            # The Interpreter returns completion values; only the
+            # ExceptionReturnInterpreter in benchmarks/return_path.py still
+            # unwinds with ReturnException, to time the old path.
             return return_value.value
+        if completion is not None:
+            return completion[0]
     
     def arity(self):
         return len(self._declaration.params)
@@ -0,0 +1,32 @@
+# Steps through the elements of a list or vector, the keys of a map or the
+# lines of a file.
+# hasNext looks one element ahead so a Lox loop can tell the end apart
+# from a nil element; next returns nil once the end is reached.
+class LoxIterator:
+    __slots__ = ("_iterator", "_next", "_has_next")
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._advance()
+
+    def _advance(self):
+        try:
+            self._next = next(self._iterator)
+            self._has_next = True
+        except StopIteration:
+            self._next = None
+            self._has_next = False
+
+    def has_next(self):
+        return self._has_next
+
+    def next(self):
+        value = self._next
+        if self._has_next:
+            self._advance()
+        return value
+
+    def __str__(self):
+        return "<iterator>"
+
+    __repr__ = __str__
@@ -0,0 +1,19 @@
+from reprlib import recursive_repr
+from .stringify import stringify
+
+# A growable Lox list, created by the List native. Appending is amortized
+# O(1), as it is for the Python list underneath.
+class LoxList:
+    __slots__ = ("values",)
+
+    def __init__(self, values=None):
+        self.values = [] if values is None else values
+
+    def __len__(self):
+        return len(self.values)
+
+    @recursive_repr("[...]")
+    def __str__(self):
+        return "[" + ", ".join(map(stringify, self.values)) + "]"
+
+    __repr__ = __str__
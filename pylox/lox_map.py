@@ -0,0 +1,22 @@
+from reprlib import recursive_repr
+from .stringify import stringify
+
+# A Lox hash map, created by the Map native. Keys match when the
+# interpreter's _is_equal says they are equal, which is Python equality,
+# so a dict keyed by the Lox values themselves has the same semantics.
+# Lists, maps and functions are keys by identity.
+class LoxMap:
+    __slots__ = ("entries",)
+
+    def __init__(self):
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    @recursive_repr("{...}")
+    def __str__(self):
+        return "{" + ", ".join(f"{stringify(key)}: {stringify(value)}"
+                               for key, value in self.entries.items()) + "}"
+
+    __repr__ = __str__
@@ -0,0 +1,69 @@
+from .builtin import Builtin
+from .lox_callable import LoxCallable
+from .lox_map import LoxMap
+from .memoized_function import MemoizedFunction
+from .native_error import NativeError
+from .purity_checker import PurityChecker
+
+# Natives for caching function results:
+#
+#   fib = memoize(fib, 1000);     // always cache, up to 1000 results
+#   fib = memoizePure(fib, nil);  // cache, without limit, if fib is pure
+#   print memoStats(fib);         // {hits: ..., misses: ..., size: ..., capacity: ...}
+#   memoClear(fib);
+#
+# Assigning the memoized function back to the function's global name makes
+# its recursive calls go through the cache too.
+
+def _capacity(value):
+    if value is None:
+        return None
+    if not isinstance(value, (int, float)) or not float(value).is_integer() or value < 1:
+        raise NativeError("Capacity must be a positive whole number or nil.")
+    return int(value)
+
+def _memoized(value):
+    if type(value) is not MemoizedFunction:
+        raise NativeError("Expected a memoized function.")
+    return value
+
+
+def memoize(interpreter, function, capacity):
+    if not isinstance(function, LoxCallable):
+        raise NativeError("Can only memoize functions.")
+    return MemoizedFunction(function, _capacity(capacity))
+
+def memoize_pure(interpreter, function, capacity):
+    capacity = _capacity(capacity)
+    if not PurityChecker(interpreter).is_pure(function):
+        return function
+    if type(function) is MemoizedFunction:
+        return function
+    return MemoizedFunction(function, capacity)
+
+def is_pure(interpreter, function):
+    return PurityChecker(interpreter).is_pure(function)
+
+def memo_stats(interpreter, function):
+    function = _memoized(function)
+    stats = LoxMap()
+    stats.entries.update({
+        "hits": float(function.hits),
+        "misses": float(function.misses),
+        "size": float(len(function.cache)),
+        "capacity": None if function.capacity is None else float(function.capacity),
+    })
+    return stats
+
+def memo_clear(interpreter, function):
+    _memoized(function).clear()
+    return None
+
+
+MEMO_NATIVES = {
+    "memoize": Builtin(memoize, 2),
+    "memoizePure": Builtin(memoize_pure, 2),
+    "isPure": Builtin(is_pure, 1),
+    "memoStats": Builtin(memo_stats, 1),
+    "memoClear": Builtin(memo_clear, 1),
+}
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from .native_function import NativeFunction
+
+# Argument types a memoized call can be keyed on. Anything else (lists,
+# maps, functions, ...) could change or be compared by identity, so such
+# calls go straight to the function.
+_KEY_TYPES = frozenset((float, int, bool, str, type(None)))
+
+# A function wrapped by the memoize native. Results are cached by
+# argument values in least recently used order; once the cache holds
+# `capacity` results (unbounded when None) the oldest is evicted.
+class MemoizedFunction(NativeFunction):
+
+    def __init__(self, function, capacity):
+        self.function = function
+        self.capacity = capacity
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def call_native(self, interpreter, arguments):
+        kinds = tuple(map(type, arguments))
+        if not _KEY_TYPES.issuperset(kinds):
+            return self.function.call(interpreter, arguments)
+        # Lox equality makes true equal to 1, so the types are part of the
+        # key to keep f(true) and f(1) apart.
+        key = (kinds, tuple(arguments))
+        cache = self.cache
+        try:
+            value = cache[key]
+        except KeyError:
+            pass
+        else:
+            cache.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self.function.call(interpreter, arguments)
+        cache[key] = value
+        if self.capacity is not None and len(cache) > self.capacity:
+            cache.popitem(last=False)
+        return value
+
+    def arity(self):
+        return self.function.arity()
+
+    def clear(self):
+        self.cache.clear()
+
+    def __repr__(self) -> str:
+        return repr(self.function)
@@ -0,0 +1,7 @@
+# Raised by a native for a runtime error. Natives don't know where they
+# were called from, so each engine turns it into a RuntimeException at
+# the call site.
+class NativeError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
@@ -0,0 +1,23 @@
+from abc import abstractmethod
+from .lox_callable import LoxCallable
+from .rope import Rope
+
+# Base class for functions implemented in Python. Natives implement
+# call_native, which receives strings built by concatenation as plain str
+# rather than as Ropes.
+class NativeFunction(LoxCallable):
+
+    def call(self, interpreter, arguments):
+        for argument in arguments:
+            if type(argument) is Rope:
+                arguments = [str(argument) if type(argument) is Rope else argument
+                             for argument in arguments]
+                break
+        return self.call_native(interpreter, arguments)
+
+    @abstractmethod
+    def call_native(self, interpreter, arguments):
+        pass
+
+    def __repr__(self) -> str:
+        return "<native fn>"
@@ -0,0 +1,144 @@
+from .visitor import Visitor
+from .expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from .stmt import Block, Expression, Function, If, Print, Return, Var, While
+from .runtime_exception import RuntimeException
+from .rope import flatten
+from .token_type import TokenType
+from .deep_stack import descend
+
+# Simplifies a resolved program before it is run: folds operators over
+# literals, drops Grouping wrappers, removes If branches and While loops
+# whose condition is a constant, and strips statements after a Return.
+# Folding uses the interpreter's own operator semantics; an operation that
+# would raise a runtime error is left in place so it still fails when (and
+# if) it runs, on the same line.
+class Optimizer(Visitor):
+
+    def __init__(self, interpreter):
+        self._interpreter = interpreter
+        self._depth = 0
+
+    def optimize(self, statements):
+        result = []
+        for statement in statements:
+            statement = self._optimize(statement)
+            if statement is not None:
+                result.append(statement)
+                if isinstance(statement, Return):
+                    break
+        return result
+
+    def _optimize(self, node):
+        self._depth += 1
+        if self._depth & 15:
+            node = node.accept(self)
+        else:
+            node = descend(node.accept, self)
+        self._depth -= 1
+        return node
+
+    def _optimize_branch(self, stmt):
+        # Branches of If and While must stay statements.
+        stmt = self._optimize(stmt)
+        if stmt is None:
+            stmt = Block([])
+            stmt.slot_count = 0
+            stmt.scoped = False
+        return stmt
+
+    def visit_block_stmt(self, stmt: Block):
+        stmt.statements = self.optimize(stmt.statements)
+        return stmt
+
+    def visit_expression_stmt(self, stmt: Expression):
+        stmt.expression = self._optimize(stmt.expression)
+        if isinstance(stmt.expression, Literal):
+            return None
+        return stmt
+
+    def visit_function_stmt(self, stmt: Function):
+        stmt.body = self.optimize(stmt.body)
+        return stmt
+
+    def visit_if_stmt(self, stmt: If):
+        stmt.condittion = self._optimize(stmt.condittion)
+        if isinstance(stmt.condittion, Literal):
+            if self._interpreter._is_truthy(stmt.condittion.value):
+                return self._optimize(stmt.then_branch)
+            if stmt.else_branch is not None:
+                return self._optimize(stmt.else_branch)
+            return None
+        stmt.then_branch = self._optimize_branch(stmt.then_branch)
+        if stmt.else_branch is not None:
+            stmt.else_branch = self._optimize_branch(stmt.else_branch)
+        return stmt
+
+    def visit_print_stmt(self, stmt: Print):
+        stmt.expression = self._optimize(stmt.expression)
+        return stmt
+
+    def visit_return_stmt(self, stmt: Return):
+        if stmt.value is not None:
+            stmt.value = self._optimize(stmt.value)
+        return stmt
+
+    def visit_var_stmt(self, stmt: Var):
+        if stmt.initializer is not None:
+            stmt.initializer = self._optimize(stmt.initializer)
+        return stmt
+
+    def visit_while_stmt(self, stmt: While):
+        stmt.condition = self._optimize(stmt.condition)
+        if isinstance(stmt.condition, Literal) and not self._interpreter._is_truthy(stmt.condition.value):
+            return None
+        stmt.body = self._optimize_branch(stmt.body)
+        return stmt
+
+    def visit_assign_expr(self, expr: Assign):
+        expr.value = self._optimize(expr.value)
+        return expr
+
+    def visit_binary_expr(self, expr: Binary):
+        expr.left = self._optimize(expr.left)
+        expr.right = self._optimize(expr.right)
+        if isinstance(expr.left, Literal) and isinstance(expr.right, Literal):
+            try:
+                value = self._interpreter._binary(expr.operator, expr.left.value, expr.right.value)
+                # Literals hold plain values, never a Rope.
+                return Literal(flatten(value))
+            except RuntimeException:
+                pass
+        return expr
+
+    def visit_call_expr(self, expr: Call):
+        expr.callee = self._optimize(expr.callee)
+        expr.arguments = [self._optimize(argument) for argument in expr.arguments]
+        return expr
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return self._optimize(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal):
+        return expr
+
+    def visit_logical_expr(self, expr: Logical):
+        expr.left = self._optimize(expr.left)
+        expr.right = self._optimize(expr.right)
+        if isinstance(expr.left, Literal):
+            truthy = self._interpreter._is_truthy(expr.left.value)
+            if truthy == (expr.operator.type == TokenType.OR):
+                return expr.left
+            return expr.right
+        return expr
+
+    def visit_unary_expr(self, expr: Unary):
+        expr.right = self._optimize(expr.right)
+        if isinstance(expr.right, Literal):
+            try:
+                return Literal(self._interpreter._unary(expr.operator, expr.right.value))
+            except RuntimeException:
+                pass
+        return expr
+
+    def visit_variable_expr(self, expr: Variable):
+        return expr
@@ -0,0 +1,32 @@
+import sys
+
+# Where Lox `print` statements write. Lines are collected in memory and
+# written to the stream in a single call once buffer_size characters are
+# waiting, and whenever flush() is called: at the end of every run (so
+# before the REPL prompts again) and before an error is reported, so
+# output and error reports stay in order. A buffer_size of 0 writes each
+# line as it is printed. With no stream, lines go to whatever sys.stdout
+# is when they are written.
+class Output:
+    DEFAULT_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._lines = []
+        self._size = 0
+
+    def write_line(self, text):
+        self._lines.append(text)
+        self._size += len(text) + 1
+        if self._size > self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        stream = sys.stdout if self.stream is None else self.stream
+        if self._lines:
+            self._lines.append("")
+            stream.write("\n".join(self._lines))
+            self._lines.clear()
+            self._size = 0
+        stream.flush()
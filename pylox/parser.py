@@ -1,15 +1,29 @@
 from .token_type import TokenType
 from .expr import Binary, Unary, Literal, Grouping, Variable, Assign, Logical, Call
 from .stmt import Block, Function, Print, Expression, Return, Var, If, While
-import pylox.lox
+from .error_reporter import ErrorReporter
+from .deep_stack import descend
+import sys
 
 class Parser:
-    current = 0
     class ParseError(Exception):
         pass
 
-    def __init__(self, tokens):
-        self.tokens = tokens
+    # tokens can be a list or a generator; the parser only ever looks at
+    # the current token and the one before it.
+    #
+    # max_nesting bounds how deep the tree may get, for engines that
+    # recurse over it; anything deeper is a "Too much nesting." error.
+    # Without a bound, any depth parses (see deep_stack).
+    def __init__(self, tokens, reporter=None, max_nesting=None):
+        self._reporter = reporter or ErrorReporter(sys.stderr)
+        self._tokens = iter(tokens)
+        self._current = next(self._tokens)
+        self._previous_token = None
+        # Number and string literals with the same value share one node.
+        self._constants = {}
+        self._max_nesting = sys.maxsize if max_nesting is None else max_nesting
+        self._depth = 0
     
     def parse(self):
         statements = []
@@ -18,6 +32,7 @@ class Parser:
         return statements
     
     def _declaration(self):
+        depth = self._depth
         try:
             if self._match(TokenType.FUN):
                 return self._function("function")
@@ -25,6 +40,12 @@ class Parser:
                 return self._var_declaration()
             return self._statement()
         except self.ParseError:
+            self._depth = depth
+            self._synchronize()
+            return None
+        except RecursionError:
+            self._depth = depth
+            self._error(self._peek(), "Too much nesting.")
             self._synchronize()
             return None
     
@@ -91,7 +112,7 @@ class Parser:
             increment = self.expression()
         self._consume(TokenType.RIGHT_PAREN, "Expect ';' after for clauses.")
 
-        body = self._statement()
+        body = self._nested(self._statement)
         if increment is not None:
             new_body = []
             new_body.append(body)
@@ -99,12 +120,12 @@ class Parser:
             body = Block(new_body)
         
         if condition is None:
-            condition = Literal(True)
+            condition = Literal.TRUE
         body = While(condition, body)
         
         if initializer is not None:
             new_body = []
-            new_body.append(Expression(initializer))
+            new_body.append(initializer)
             new_body.append(body)
             body = Block(new_body)
 
@@ -114,17 +135,17 @@ class Parser:
         self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
         expr = self.expression()
         self._consume(TokenType.RIGHT_PAREN, "Expect ')' after if condition.")
-        then_branch = self._statement()
+        then_branch = self._nested(self._statement)
         else_branch = None
         if self._match(TokenType.ELSE):
-            else_branch = self._statement()
+            else_branch = self._nested(self._statement)
         return If(expr, then_branch, else_branch)
 
     def _while_statement(self):
         self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
         expr = self.expression()
         self._consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
-        body = self._statement()
+        body = self._nested(self._statement)
         return While(expr, body)
         
     def _print_statement(self):
@@ -143,7 +164,7 @@ class Parser:
     def _block_statement(self):
         statements = []
         while (not self._check(TokenType.RIGHT_BRACE)) and (not self._is_at_end()):
-            statements.append(self._declaration())
+            statements.append(self._nested(self._declaration))
         
         self._consume(TokenType.RIGHT_BRACE, "Expect '}' after block.")
         
@@ -155,14 +176,14 @@ class Parser:
         return Expression(expr)
 
     def expression(self):
-        return self._assignment()
+        return self._nested(self._assignment)
     
     def _assignment(self):
         expr = self._or()
 
         if self._match(TokenType.EQUAL):
             equals = self._previous()
-            value = self._assignment()
+            value = self._nested(self._assignment)
 
             if isinstance(expr, Variable):
                 token = expr.name
@@ -171,68 +192,88 @@ class Parser:
         
         return expr
     
+    # Each operator in a chain like a + b + c adds a level to the tree, so
+    # the loops below count towards the nesting depth too.
     def _or(self):
         expr = self._and()
+        depth = self._depth
         while self._match(TokenType.OR):
             operator = self._previous()
+            self._deepen()
             right = self._and()
             expr = Logical(expr, operator, right)
         
+        self._depth = depth
         return expr
     
     def _and(self):
         expr = self.equality()
-        if self._match(TokenType.AND):
+        depth = self._depth
+        while self._match(TokenType.AND):
             operator = self._previous()
+            self._deepen()
             right = self.equality()
             expr = Logical(expr, operator, right)
         
+        self._depth = depth
         return expr
 
     def equality(self):
         expr = self.comparison()
+        depth = self._depth
 
         while(self._match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL)):
             operator = self._previous()
+            self._deepen()
             right = self.comparison()
             expr = Binary(expr, operator, right)
         
+        self._depth = depth
         return expr
 
     def comparison(self):
         expr = self.term()
+        depth = self._depth
 
         while(self._match(TokenType.LESS, TokenType.LESS_EQUAL, TokenType.GREATER, TokenType.GREATER_EQUAL)):
             operator = self._previous()
+            self._deepen()
             right = self.term()
             expr = Binary(expr, operator, right)
         
+        self._depth = depth
         return expr
 
     def term(self):
         expr = self.factor()
+        depth = self._depth
 
         while(self._match(TokenType.PLUS, TokenType.MINUS)):
             operator = self._previous()
+            self._deepen()
             right = self.factor()
             expr = Binary(expr, operator, right)
         
+        self._depth = depth
         return expr
 
     def factor(self):
         expr = self.unary()
+        depth = self._depth
 
         while(self._match(TokenType.STAR, TokenType.SLASH)):
             operator = self._previous()
+            self._deepen()
             right = self.unary()
             expr = Binary(expr, operator, right)
         
+        self._depth = depth
         return expr
         
     def unary(self):
         if self._match(TokenType.MINUS, TokenType.BANG):
             operator = self._previous()
-            right = self.unary()
+            right = self._nested(self.unary)
             return Unary(operator, right)
         
         return self._call()
@@ -266,16 +307,16 @@ class Parser:
 
     def primary(self):
         if self._match(TokenType.TRUE):
-            return Literal(True)
+            return Literal.TRUE
         
         if self._match(TokenType.FALSE):
-            return Literal(False)
+            return Literal.FALSE
         
         if self._match(TokenType.NIL):
-            return Literal(None)
+            return Literal.NIL
         
         if self._match(TokenType.NUMBER, TokenType.STRING):
-            return Literal(self._previous().literal)
+            return self._constant(self._previous().literal)
         
         if self._match(TokenType.LEFT_PAREN):
             expr = self.expression()
@@ -287,6 +328,31 @@ class Parser:
         
         raise self._error(self._peek(), "Expect expression.")
     
+    def _constant(self, value):
+        # Keyed by type as well, since 1.0 == True in Python.
+        key = (type(value), value)
+        literal = self._constants.get(key)
+        if literal is None:
+            literal = self._constants[key] = Literal(value)
+        return literal
+
+    # Parses one level deeper into the tree, on a new thread if this one is
+    # running out of stack.
+    def _nested(self, function):
+        self._deepen()
+        try:
+            if self._depth & 15:
+                return function()
+            return descend(function)
+        finally:
+            self._depth -= 1
+
+    def _deepen(self):
+        self._depth += 1
+        if self._depth > self._max_nesting:
+            self._depth -= 1
+            raise self._error(self._peek(), "Too much nesting.")
+
     def _match(self, *types):
         for type in types:
             if self._check(type):
@@ -302,25 +368,26 @@ class Parser:
     
     def _advance(self):
         if not self._is_at_end():
-            self.current += 1
+            self._previous_token = self._current
+            self._current = next(self._tokens)
         return self._previous()
     
     def _is_at_end(self):
         return self._peek().type == TokenType.EOF
     
     def _peek(self):
-        return self.tokens[self.current]
+        return self._current
     
     def _previous(self):
-        return self.tokens[self.current - 1]
+        return self._previous_token
     
     def _consume(self, type, message):
         if self._check(type):
             return self._advance()
-        return self._error(self._peek(), message)
+        raise self._error(self._peek(), message)
     
     def _error(self, token, message):
-        pylox.lox.Lox.error(token, message)
+        self._reporter.error(token, message)
         return self.ParseError(message)
     
     def _synchronize(self):
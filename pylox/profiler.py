@@ -0,0 +1,110 @@
+import time
+from .deep_stack import descend
+from .lox_function import LoxFunction
+from .memoized_function import MemoizedFunction
+from .native_error import NativeError
+from .runtime_exception import RuntimeException
+
+# Profiles a program at the level of Lox functions: calls, self and
+# cumulative time per function, calls and the callee's self time per
+# caller -> callee edge, and the self time of every distinct call stack
+# for flame graphs. Functions are keyed by name and declaration line;
+# natives by their global name.
+#
+# attach() replaces the call visitor of that one interpreter instance, so
+# an interpreter that isn't being profiled runs exactly as before. It
+# works with the tree-walking interpreters (tree and quicken), which make
+# every call through LoxCallable.call. Profiled calls take more Python
+# frames, so they carry on in a new thread when this one runs low (see
+# deep_stack). Calls nested deeper than max_depth raise a "Stack
+# overflow." runtime error, so runaway recursion still ends.
+class Profiler:
+    max_depth = 1000
+
+    def __init__(self):
+        self.calls = {}
+        self.self_time = {}
+        self.cumulative_time = {}
+        self.edges = {}
+        self.stacks = {}
+        # One [key, time spent in callees] per active call.
+        self._frames = []
+        self._active = {}
+        self._native_names = {}
+
+    def attach(self, interpreter):
+        self._native_names.update((id(native), name) for name, native in interpreter.natives.items())
+        evaluate = interpreter._evaluate
+
+        def visit_call_expr(expr):
+            callee = evaluate(expr.callee)
+            arguments = [evaluate(argument) for argument in expr.arguments]
+            interpreter._check_call(expr.paren, callee, arguments)
+            if len(self._frames) >= self.max_depth:
+                raise RuntimeException(expr.paren, "Stack overflow.")
+            try:
+                return self.call(interpreter, callee, arguments)
+            except NativeError as error:
+                raise RuntimeException(expr.paren, error.message)
+
+        interpreter.visit_call_expr = visit_call_expr
+        return self
+
+    def call(self, interpreter, callee, arguments):
+        key = self._key(callee)
+        frame = [key, 0.0]
+        self._frames.append(frame)
+        self._active[key] = self._active.get(key, 0) + 1
+        start = time.perf_counter()
+        try:
+            if len(self._frames) & 15:
+                return callee.call(interpreter, arguments)
+            return descend(callee.call, interpreter, arguments)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._frames.pop()
+            self._active[key] -= 1
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.self_time[key] = self.self_time.get(key, 0.0) + elapsed - frame[1]
+            # A recursive function's cumulative time is only counted for its
+            # outermost call, or it would be counted once per level.
+            if not self._active[key]:
+                self.cumulative_time[key] = self.cumulative_time.get(key, 0.0) + elapsed
+            stack = tuple(active[0] for active in self._frames) + (key,)
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - frame[1]
+            caller = self._frames[-1][0] if self._frames else "<script>"
+            if self._frames:
+                self._frames[-1][1] += elapsed
+            count, total = self.edges.get((caller, key), (0, 0.0))
+            self.edges[(caller, key)] = (count + 1, total + elapsed - frame[1])
+
+    def _key(self, callee):
+        if type(callee) is LoxFunction:
+            name = callee._declaration.name
+            return f"{name.lexeme}:{name.line}"
+        if type(callee) is MemoizedFunction:
+            return self._key(callee.function) + " (memoized)"
+        return self._native_names.get(id(callee), repr(callee)) + " (native)"
+
+    # Functions by self time, then the call edges by the callee's self time.
+    def report(self, limit=None):
+        lines = [f"{'calls':>10} {'self (s)':>10} {'cumul (s)':>10} {'per call (ms)':>14}  function"]
+        keys = sorted(self.calls, key=lambda key: self.self_time[key], reverse=True)
+        for key in keys[:limit]:
+            calls = self.calls[key]
+            lines.append(f"{calls:>10} {self.self_time[key]:>10.4f} {self.cumulative_time[key]:>10.4f} "
+                         f"{self.cumulative_time[key] / calls * 1000:>14.4f}  {key}")
+        lines.append("")
+        lines.append(f"{'calls':>10} {'self (s)':>10}  caller -> callee")
+        edges = sorted(self.edges.items(), key=lambda item: item[1][1], reverse=True)
+        for (caller, callee), (count, total) in edges[:limit]:
+            lines.append(f"{count:>10} {total:>10.4f}  {caller} -> {callee}")
+        return "\n".join(lines)
+
+    # Brendan Gregg's collapsed stack format, one stack per line with its
+    # self time in microseconds, as flamegraph.pl and speedscope read it.
+    def collapsed_stacks(self):
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            lines.append(f"{';'.join(stack)} {round(seconds * 1e6)}")
+        return "\n".join(lines) + "\n"
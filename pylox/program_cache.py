@@ -0,0 +1,183 @@
+import hashlib
+import marshal
+import os
+from typing import List
+import pylox
+from .deep_stack import descend
+from .expr import Expr, Literal
+from .line_table import LineTable
+from .stmt import Stmt
+from .token import Token
+from .token_store import TokenStore
+from .token_type import TokenType
+
+# On-disk cache of resolved (and optionally optimized) programs, kept like
+# __pycache__ in a __loxcache__ directory next to the script. An entry is
+# the magic number, a SHA-256 key over the pylox version, the cache format,
+# the front-end options and the source bytes, then the marshalled AST.
+# Nodes are stored as (KIND, field, ...) tuples and tokens as (type, lexeme,
+# offset, line) tuples; which is which follows from the node classes'
+# constructor annotations. Tokens from the RegexScanner are stored by
+# source offset and loaded back into a TokenStore over the source, so
+# their lines are still only worked out if an error needs one; tokens
+# from the char Scanner carry their line. A stale or unreadable entry is
+# ignored and rewritten.
+class ProgramCache:
+    MAGIC = b"LOXC"
+    FORMAT = 1
+    DIRECTORY = "__loxcache__"
+
+    _CLASSES = {cls.KIND: cls for base in (Expr, Stmt) for cls in base.__subclasses__()}
+    _FIELD_CODECS = {
+        Token: "token",
+        Expr: "node",
+        Stmt: "node",
+        List[Token]: "tokens",
+        List[Expr]: "nodes",
+        List[Stmt]: "nodes",
+    }
+    _TYPES = tuple(TokenType)
+
+    def __init__(self, options=()):
+        self._options = repr(tuple(options)).encode()
+        self._schemas = {}
+        self._constants = {}
+        self._depth = 0
+        # The TokenStore the last load() put the tokens it read in.
+        self.token_store = None
+
+    @staticmethod
+    def path_for(script):
+        directory, name = os.path.split(os.path.abspath(script))
+        return os.path.join(directory, ProgramCache.DIRECTORY, os.path.splitext(name)[0] + ".loxc")
+
+    def key(self, source):
+        digest = hashlib.sha256()
+        digest.update(f"{pylox.__version__}/{self.FORMAT}/".encode())
+        digest.update(self._options)
+        digest.update(source.encode() if isinstance(source, str) else source)
+        return digest.digest()
+
+    # Returns (statements, slot_count), or None when there is no valid entry.
+    def load(self, script, source):
+        try:
+            with open(self.path_for(script), "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        header = self.MAGIC + self.key(source)
+        if not data.startswith(header):
+            return None
+        try:
+            statements, slot_count = marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        self._constants = {}
+        self.token_store = TokenStore(source, LineTable(source))
+        return [self._decode(statement) for statement in statements], slot_count
+
+    def store(self, script, source, statements, slot_count):
+        path = self.path_for(script)
+        try:
+            data = marshal.dumps(([self._encode(statement) for statement in statements], slot_count))
+        except ValueError:
+            # Nested too deeply for marshal; run without a cache entry.
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(self.MAGIC + self.key(source) + data)
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    def _schema(self, cls):
+        schema = self._schemas.get(cls)
+        if schema is None:
+            hints = cls.__init__.__annotations__
+            schema = self._schemas[cls] = [(name, self._FIELD_CODECS.get(hints.get(name))) for name in cls.__slots__]
+        return schema
+
+    # Encoding and decoding recurse once per level of the tree; see
+    # deep_stack.
+    def _encode(self, node):
+        self._depth += 1
+        if self._depth & 15:
+            values = self._encode_node(node)
+        else:
+            values = descend(self._encode_node, node)
+        self._depth -= 1
+        return values
+
+    def _encode_node(self, node):
+        values = [node.KIND]
+        for name, codec in self._schema(type(node)):
+            value = getattr(node, name)
+            if value is None or codec is None:
+                values.append(value)
+            elif codec == "node":
+                values.append(self._encode(value))
+            elif codec == "nodes":
+                values.append([self._encode(item) for item in value])
+            elif codec == "token":
+                values.append(self._encode_token(value))
+            else:
+                values.append([self._encode_token(item) for item in value])
+        return tuple(values)
+
+    def _encode_token(self, token):
+        offset = getattr(token, "offset", None)
+        if offset is None:
+            return (token.type.value, token.lexeme, None, token.line)
+        return (token.type.value, token.lexeme, offset, None)
+
+    def _decode(self, values):
+        self._depth += 1
+        if self._depth & 15:
+            node = self._decode_node(values)
+        else:
+            node = descend(self._decode_node, values)
+        self._depth -= 1
+        return node
+
+    def _decode_node(self, values):
+        cls = self._CLASSES[values[0]]
+        if cls is Literal:
+            return self._literal(values[1])
+        node = cls.__new__(cls)
+        for (name, codec), value in zip(self._schema(cls), values[1:]):
+            if value is None or codec is None:
+                pass
+            elif codec == "node":
+                value = self._decode(value)
+            elif codec == "nodes":
+                value = [self._decode(item) for item in value]
+            elif codec == "token":
+                value = self._decode_token(value)
+            else:
+                value = [self._decode_token(item) for item in value]
+            setattr(node, name, value)
+        return node
+
+    def _decode_token(self, values):
+        type, lexeme, offset, line = values
+        if offset is None:
+            return Token(self._TYPES[type], lexeme, None, line)
+        store = self.token_store
+        length = len(lexeme) if isinstance(store.source, str) else len(lexeme.encode())
+        return store.add(self._TYPES[type], offset, offset + length, lexeme)
+
+    # Literal nodes are shared again the way the Parser shares them.
+    def _literal(self, value):
+        if value is True:
+            return Literal.TRUE
+        if value is False:
+            return Literal.FALSE
+        if value is None:
+            return Literal.NIL
+        key = (type(value), value)
+        literal = self._constants.get(key)
+        if literal is None:
+            literal = self._constants[key] = Literal(value)
+        return literal
@@ -0,0 +1,127 @@
+from .visitor import Visitor
+from .expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from .stmt import Block, Expression, Function, If, Print, Return, Var, While
+from .lox_function import LoxFunction
+from .memoized_function import MemoizedFunction
+
+# Decides whether a Lox function is pure: its body only reads and writes
+# its own parameters and locals, and only calls global functions that are
+# pure themselves (including itself). Printing, reading globals or
+# captured variables, declaring closures and calling natives make a
+# function impure. Functions of the engines that don't keep the AST
+# (closure, vm, python) are never considered pure.
+#
+# Locals are recognised from the Resolver's annotations: a variable
+# belongs to the function when it is fewer frames away than the frames
+# the function has entered so far.
+class PurityChecker(Visitor):
+
+    def __init__(self, interpreter):
+        self._globals = interpreter.globals
+        self._checking = set()
+        self._depth = 0
+
+    def is_pure(self, function):
+        if type(function) is MemoizedFunction:
+            function = function.function
+        if type(function) is not LoxFunction:
+            return False
+        declaration = function._declaration
+        # A function calling itself is pure if the rest of it is.
+        if declaration in self._checking:
+            return True
+        self._checking.add(declaration)
+        depth = self._depth
+        self._depth = 0
+        try:
+            return all(self._check(statement) for statement in declaration.body)
+        finally:
+            self._depth = depth
+            self._checking.discard(declaration)
+
+    # Nodes are dispatched on their KIND rather than through accept(), so
+    # nodes the quicken engine has specialised are checked as what they
+    # were parsed as.
+    def _check(self, node):
+        return self._VISITS[node.KIND](self, node)
+
+    def _is_local(self, expr):
+        return expr.depth is not None and expr.depth <= self._depth
+
+    def visit_assign_expr(self, expr: Assign):
+        return self._is_local(expr) and self._check(expr.value)
+
+    def visit_binary_expr(self, expr: Binary):
+        return self._check(expr.left) and self._check(expr.right)
+
+    def visit_call_expr(self, expr: Call):
+        callee = expr.callee
+        if type(callee) is not Variable or callee.depth is not None:
+            return False
+        function = self._globals._values.get(callee.name.lexeme)
+        return self.is_pure(function) and all(self._check(argument) for argument in expr.arguments)
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return self._check(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal):
+        return True
+
+    def visit_logical_expr(self, expr: Logical):
+        return self._check(expr.left) and self._check(expr.right)
+
+    def visit_unary_expr(self, expr: Unary):
+        return self._check(expr.right)
+
+    def visit_variable_expr(self, expr: Variable):
+        return self._is_local(expr)
+
+    def visit_block_stmt(self, stmt: Block):
+        if stmt.scoped:
+            self._depth += 1
+        try:
+            return all(self._check(statement) for statement in stmt.statements)
+        finally:
+            if stmt.scoped:
+                self._depth -= 1
+
+    def visit_expression_stmt(self, stmt: Expression):
+        return self._check(stmt.expression)
+
+    def visit_function_stmt(self, stmt: Function):
+        return False
+
+    def visit_if_stmt(self, stmt: If):
+        return (self._check(stmt.condittion) and self._check(stmt.then_branch)
+                and (stmt.else_branch is None or self._check(stmt.else_branch)))
+
+    def visit_print_stmt(self, stmt: Print):
+        return False
+
+    def visit_return_stmt(self, stmt: Return):
+        return stmt.value is None or self._check(stmt.value)
+
+    def visit_var_stmt(self, stmt: Var):
+        return stmt.initializer is None or self._check(stmt.initializer)
+
+    def visit_while_stmt(self, stmt: While):
+        return self._check(stmt.condition) and self._check(stmt.body)
+
+    _VISITS = {
+        Assign.KIND: visit_assign_expr,
+        Binary.KIND: visit_binary_expr,
+        Call.KIND: visit_call_expr,
+        Grouping.KIND: visit_grouping_expr,
+        Literal.KIND: visit_literal_expr,
+        Logical.KIND: visit_logical_expr,
+        Unary.KIND: visit_unary_expr,
+        Variable.KIND: visit_variable_expr,
+        Block.KIND: visit_block_stmt,
+        Expression.KIND: visit_expression_stmt,
+        Function.KIND: visit_function_stmt,
+        If.KIND: visit_if_stmt,
+        Print.KIND: visit_print_stmt,
+        Return.KIND: visit_return_stmt,
+        Var.KIND: visit_var_stmt,
+        While.KIND: visit_while_stmt,
+    }
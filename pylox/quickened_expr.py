@@ -0,0 +1,120 @@
+from .expr import Binary, Logical, Unary
+
+# Specialised forms of Binary, Unary and Logical nodes. The
+# QuickeningInterpreter rewrites a node in place (by swapping its class) into
+# one of these once it has seen the operand types at that site. Each form
+# guards its assumption and falls back to the generic path when it fails.
+# The classes add no fields, so a node can move between them freely.
+
+class FloatAdd(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_add_expr(self)
+
+class StringConcat(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_string_concat_expr(self)
+
+class FloatSubtract(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_subtract_expr(self)
+
+class FloatMultiply(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_multiply_expr(self)
+
+class FloatDivide(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_divide_expr(self)
+
+class FloatGreater(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_greater_expr(self)
+
+class FloatGreaterEqual(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_greater_equal_expr(self)
+
+class FloatLess(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_less_expr(self)
+
+class FloatLessEqual(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_less_equal_expr(self)
+
+# Equality needs no type guard, only the operator dispatch is skipped.
+class Equal(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_equal_expr(self)
+
+class NotEqual(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_not_equal_expr(self)
+
+# A site whose guard failed. It stays on the generic path for good so a
+# polymorphic site doesn't keep flipping between forms.
+class MegamorphicBinary(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_megamorphic_binary_expr(self)
+
+class FloatNegate(Unary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_float_negate_expr(self)
+
+class Not(Unary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_not_expr(self)
+
+class MegamorphicUnary(Unary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_megamorphic_unary_expr(self)
+
+# Logical operators whose left operand has only ever been a boolean, so
+# truthiness is the value itself.
+class BoolAnd(Logical):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_bool_and_expr(self)
+
+class BoolOr(Logical):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_bool_or_expr(self)
+
+class MegamorphicLogical(Logical):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_megamorphic_logical_expr(self)
@@ -0,0 +1,209 @@
+from collections import Counter
+from .interpreter import Interpreter
+from .quickened_expr import (FloatAdd, StringConcat, FloatSubtract, FloatMultiply, FloatDivide,
+                             FloatGreater, FloatGreaterEqual, FloatLess, FloatLessEqual, Equal,
+                             NotEqual, MegamorphicBinary, FloatNegate, Not, MegamorphicUnary,
+                             BoolAnd, BoolOr, MegamorphicLogical)
+from .token_type import TokenType
+from .rope import STRINGS, concat
+
+# Tree-walking interpreter that specialises Binary, Unary and Logical nodes
+# in place from the operand types it observes. Specialised nodes run a
+# guarded fast path and are rewritten to a megamorphic (generic) form the
+# first time the guard fails. Counters record which sites were specialised
+# and which had to be deoptimised.
+class QuickeningInterpreter(Interpreter):
+
+    _FLOAT_FORMS = {
+        TokenType.PLUS: FloatAdd,
+        TokenType.MINUS: FloatSubtract,
+        TokenType.STAR: FloatMultiply,
+        TokenType.SLASH: FloatDivide,
+        TokenType.GREATER: FloatGreater,
+        TokenType.GREATER_EQUAL: FloatGreaterEqual,
+        TokenType.LESS: FloatLess,
+        TokenType.LESS_EQUAL: FloatLessEqual,
+    }
+
+    def __init__(self, reporter=None):
+        super().__init__(reporter)
+        self.specialized = Counter()
+        self.deoptimized = Counter()
+
+    def quickening_report(self):
+        lines = [f"specialized sites: {sum(self.specialized.values())}"]
+        for form, count in sorted(self.specialized.items()):
+            lines.append(f"  {form}: {count}")
+        lines.append(f"deoptimized sites: {sum(self.deoptimized.values())}")
+        for form, count in sorted(self.deoptimized.items()):
+            lines.append(f"  {form}: {count}")
+        return "\n".join(lines)
+
+    # Generic nodes: evaluate, then pick a specialised form for next time.
+
+    def visit_binary_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        operator = expr.operator.type
+        form = None
+        if operator == TokenType.EQUAL_EQUAL:
+            form = Equal
+        elif operator == TokenType.BANG_EQUAL:
+            form = NotEqual
+        elif type(left) is float and type(right) is float:
+            form = self._FLOAT_FORMS.get(operator)
+        elif operator == TokenType.PLUS and isinstance(left, STRINGS) and isinstance(right, STRINGS):
+            form = StringConcat
+        if form is not None:
+            self._specialize(expr, form)
+        return self._binary(expr.operator, left, right)
+
+    def visit_unary_expr(self, expr):
+        right = self._evaluate(expr.right)
+        if expr.operator.type == TokenType.BANG:
+            self._specialize(expr, Not)
+        elif type(right) is float:
+            self._specialize(expr, FloatNegate)
+        return self._unary(expr.operator, right)
+
+    def visit_logical_expr(self, expr):
+        left = self._evaluate(expr.left)
+        if type(left) is bool:
+            self._specialize(expr, BoolOr if expr.operator.type == TokenType.OR else BoolAnd)
+        if expr.operator.type == TokenType.OR:
+            if self._is_truthy(left):
+                return left
+        else:
+            if not self._is_truthy(left):
+                return left
+        return self._evaluate(expr.right)
+
+    def _specialize(self, expr, form):
+        expr.__class__ = form
+        self.specialized[form.__name__] += 1
+
+    def _deoptimize(self, expr, form):
+        self.deoptimized[type(expr).__name__] += 1
+        expr.__class__ = form
+
+    # Specialised Binary forms.
+
+    def visit_float_add_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left + right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_string_concat_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if isinstance(left, STRINGS) and isinstance(right, STRINGS):
+            return concat(left, right)
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_subtract_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left - right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_multiply_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left * right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_divide_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            if right == 0:
+                return None
+            return left / right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_greater_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left > right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_greater_equal_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left >= right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_less_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left < right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_float_less_equal_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if type(left) is float and type(right) is float:
+            return left <= right
+        return self._deoptimize_binary(expr, left, right)
+
+    def visit_equal_expr(self, expr):
+        return self._is_equal(self._evaluate(expr.left), self._evaluate(expr.right))
+
+    def visit_not_equal_expr(self, expr):
+        return not self._is_equal(self._evaluate(expr.left), self._evaluate(expr.right))
+
+    def visit_megamorphic_binary_expr(self, expr):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        return self._binary(expr.operator, left, right)
+
+    def _deoptimize_binary(self, expr, left, right):
+        self._deoptimize(expr, MegamorphicBinary)
+        return self._binary(expr.operator, left, right)
+
+    # Specialised Unary forms.
+
+    def visit_float_negate_expr(self, expr):
+        right = self._evaluate(expr.right)
+        if type(right) is float:
+            return -right
+        self._deoptimize(expr, MegamorphicUnary)
+        return self._unary(expr.operator, right)
+
+    def visit_not_expr(self, expr):
+        return not self._is_truthy(self._evaluate(expr.right))
+
+    def visit_megamorphic_unary_expr(self, expr):
+        return self._unary(expr.operator, self._evaluate(expr.right))
+
+    # Specialised Logical forms.
+
+    def visit_bool_and_expr(self, expr):
+        left = self._evaluate(expr.left)
+        if left is False:
+            return left
+        if left is not True:
+            self._deoptimize(expr, MegamorphicLogical)
+            if not self._is_truthy(left):
+                return left
+        return self._evaluate(expr.right)
+
+    def visit_bool_or_expr(self, expr):
+        left = self._evaluate(expr.left)
+        if left is True:
+            return left
+        if left is not False:
+            self._deoptimize(expr, MegamorphicLogical)
+            if self._is_truthy(left):
+                return left
+        return self._evaluate(expr.right)
+
+    def visit_megamorphic_logical_expr(self, expr):
+        return Interpreter.visit_logical_expr(self, expr)
@@ -0,0 +1,122 @@
+import re
+import sys
+from .scanner import Scanner
+from .token_type import TokenType
+from .line_table import LineTable
+from .token_store import TokenStore
+from .token_view import TokenView
+from .error_reporter import ErrorReporter
+
+# Whitespace is skipped as a prefix of every match; the alternatives are
+# ordered by how often they occur. CHARACTER is filled in with a pattern
+# matching one (possibly multi-byte) character.
+_PATTERN = r"""
+    [ \r\t]*
+    (?:
+          (?P<identifier>[A-Za-z_][A-Za-z_0-9]*)
+        | (?P<comment>//[^\n]*)
+        | (?P<operator>!=|==|>=|<=|[(){},.\-+;*!=<>/])
+        | (?P<newline>\n)
+        | (?P<number>[0-9]+(?:\.[0-9]+)?)
+        | (?P<string>"[^"]*")
+        | (?P<unterminated>"[^"]*)
+        | (?P<error>CHARACTER)
+        | (?P<end>\Z)
+    )
+"""
+
+# Scanner driven by one compiled master regular expression. The regex
+# engine consumes whole lexemes (runs of whitespace, comments, numbers,
+# identifiers) in C, leaving one dispatch per token in Python. It emits
+# the same tokens and errors as the character-by-character Scanner.
+#
+# The source may be a str or any bytes-like buffer such as an mmap of the
+# script, which is scanned in place as UTF-8. Tokens are recorded in a
+# compact TokenStore and iter_tokens() yields a TokenView for each as it
+# is matched. Lines come from a LineTable built only if one is asked for.
+# Identifier names are interned so environment lookups compare by
+# identity.
+class RegexScanner:
+    _TOKEN = re.compile(_PATTERN.replace("CHARACTER", "."), re.VERBOSE | re.DOTALL)
+    _BINARY_TOKEN = re.compile(_PATTERN.replace("CHARACTER", r"[\xc0-\xff][\x80-\xbf]*|.").encode(),
+                               re.VERBOSE | re.DOTALL)
+
+    _OPERATORS = {
+        "(": TokenType.LEFT_PAREN,
+        ")": TokenType.RIGHT_PAREN,
+        "{": TokenType.LEFT_BRACE,
+        "}": TokenType.RIGHT_BRACE,
+        ",": TokenType.COMMA,
+        ".": TokenType.DOT,
+        "-": TokenType.MINUS,
+        "+": TokenType.PLUS,
+        ";": TokenType.SEMICOLON,
+        "*": TokenType.STAR,
+        "/": TokenType.SLASH,
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "=": TokenType.EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+    }
+    _BINARY_OPERATORS = {lexeme.encode(): type for lexeme, type in _OPERATORS.items()}
+    _CODES = {type: type.value for type in TokenType}
+
+    def __init__(self, source, reporter=None):
+        self._reporter = reporter or ErrorReporter(sys.stderr)
+        self.source = source
+        self.lines = LineTable(source)
+        self.store = TokenStore(source, self.lines)
+
+    def scan_tokens(self):
+        return list(self.iter_tokens())
+
+    def iter_tokens(self):
+        keywords = Scanner.keywords
+        lines = self.lines
+        store = self.store
+        # The store's arrays are filled in directly; this loop is the hot
+        # path of scanning.
+        add_type = store.types.append
+        add_start = store.starts.append
+        add_end = store.ends.append
+        index = len(store) - 1
+        intern = sys.intern
+        binary = not isinstance(self.source, str)
+        pattern = self._BINARY_TOKEN if binary else self._TOKEN
+        operators = self._BINARY_OPERATORS if binary else self._OPERATORS
+        for match in pattern.finditer(self.source):
+            kind = match.lastgroup
+            if kind == "newline" or kind == "comment" or kind == "end":
+                continue
+            if kind == "operator":
+                type = operators[match.group(kind)]
+                lexeme = None
+            elif kind == "identifier":
+                lexeme = match.group(kind)
+                if binary:
+                    lexeme = lexeme.decode()
+                lexeme = intern(lexeme)
+                type = keywords.get(lexeme, TokenType.IDENTIFIER)
+            elif kind == "number":
+                type = TokenType.NUMBER
+                lexeme = None
+            elif kind == "string":
+                type = TokenType.STRING
+                lexeme = None
+            elif kind == "unterminated":
+                self._reporter.error(lines.line_of(match.end(kind)), "Unterminated string.")
+                continue
+            else:
+                self._reporter.error(lines.line_of(match.start(kind)), "Unexpceted character.")
+                continue
+            start, end = match.span(kind)
+            add_type(self._CODES[type])
+            add_start(start)
+            add_end(end)
+            index += 1
+            yield TokenView(store, index, type, lexeme)
+        yield store.add(TokenType.EOF, len(self.source), len(self.source), "")
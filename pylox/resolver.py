@@ -0,0 +1,176 @@
+from enum import Enum
+from .capture_analyzer import CaptureAnalyzer
+from .visitor import Visitor
+from .expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from .stmt import Block, Expression, Function, If, Print, Return, Var, While
+from .error_reporter import ErrorReporter
+from .deep_stack import descend
+import sys
+
+class FunctionType(Enum):
+    NONE = 0
+    FUNCTION = 1
+
+# Static pass run between parsing and interpretation. Every local gets a
+# slot in the frame (runtime Environment) that holds it and every
+# Variable/Assign node is annotated with the number of frames to hop
+# (depth) and the slot to index, so locals are never looked up by name.
+# Unresolved names (depth None) are globals.
+#
+# Blocks the CaptureAnalyzer found uncaptured don't get a frame of their
+# own: their variables take fresh slots in the enclosing frame, which are
+# released for reuse when the block ends. Uncaptured top-level blocks use
+# the slots of the globals frame; slot_count says how many it needs.
+class Resolver(Visitor):
+
+    def __init__(self, reporter=None):
+        self._reporter = reporter or ErrorReporter(sys.stderr)
+        # Each scope maps a name to [slot, defined]; _scope_frames holds,
+        # per scope, the index in _frames it allocates into and whether the
+        # scope owns that frame.
+        self._scopes = []
+        self._scope_frames = []
+        # Each frame is [next free slot, slots needed].
+        self._frames = [[0, 0]]
+        self._current_function = FunctionType.NONE
+        self.slot_count = 0
+        self._depth = 0
+
+    def resolve(self, statements):
+        CaptureAnalyzer().analyze(statements)
+        self._resolve_statements(statements)
+        self.slot_count = self._frames[0][1]
+
+    def visit_block_stmt(self, stmt: Block):
+        self._begin_scope(stmt.scoped)
+        self._resolve_statements(stmt.statements)
+        stmt.slot_count = self._end_scope()
+
+    def visit_var_stmt(self, stmt: Var):
+        stmt.slot = self._declare(stmt.name)
+        if stmt.initializer is not None:
+            self._resolve(stmt.initializer)
+        self._define(stmt.name)
+
+    def visit_function_stmt(self, stmt: Function):
+        stmt.slot = self._declare(stmt.name)
+        self._define(stmt.name)
+        self._resolve_function(stmt, FunctionType.FUNCTION)
+
+    def visit_expression_stmt(self, stmt: Expression):
+        self._resolve(stmt.expression)
+
+    def visit_if_stmt(self, stmt: If):
+        self._resolve(stmt.condittion)
+        self._resolve(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self._resolve(stmt.else_branch)
+
+    def visit_print_stmt(self, stmt: Print):
+        self._resolve(stmt.expression)
+
+    def visit_return_stmt(self, stmt: Return):
+        if self._current_function == FunctionType.NONE:
+            self._reporter.error(stmt.keyword, "Can't return from top-level code.")
+        if stmt.value is not None:
+            self._resolve(stmt.value)
+
+    def visit_while_stmt(self, stmt: While):
+        self._resolve(stmt.condition)
+        self._resolve(stmt.body)
+
+    def visit_variable_expr(self, expr: Variable):
+        if self._scopes:
+            local = self._scopes[-1].get(expr.name.lexeme)
+            if local is not None and not local[1]:
+                self._reporter.error(expr.name, "Can't read local variable in its own initializer.")
+        expr.depth, expr.slot = self._resolve_local(expr.name)
+
+    def visit_assign_expr(self, expr: Assign):
+        self._resolve(expr.value)
+        expr.depth, expr.slot = self._resolve_local(expr.name)
+
+    def visit_binary_expr(self, expr: Binary):
+        self._resolve(expr.left)
+        self._resolve(expr.right)
+
+    def visit_call_expr(self, expr: Call):
+        self._resolve(expr.callee)
+        for argument in expr.arguments:
+            self._resolve(argument)
+
+    def visit_grouping_expr(self, expr: Grouping):
+        self._resolve(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal):
+        pass
+
+    def visit_logical_expr(self, expr: Logical):
+        self._resolve(expr.left)
+        self._resolve(expr.right)
+
+    def visit_unary_expr(self, expr: Unary):
+        self._resolve(expr.right)
+
+    def _resolve_statements(self, statements):
+        for statement in statements:
+            self._resolve(statement)
+
+    def _resolve(self, node):
+        self._depth += 1
+        if self._depth & 15:
+            node.accept(self)
+        else:
+            descend(node.accept, self)
+        self._depth -= 1
+
+    def _resolve_function(self, function: Function, type):
+        enclosing_function = self._current_function
+        self._current_function = type
+        self._begin_scope(True)
+        for param in function.params:
+            self._declare(param)
+            self._define(param)
+        self._resolve_statements(function.body)
+        function.slot_count = self._end_scope()
+        self._current_function = enclosing_function
+
+    def _resolve_local(self, name):
+        for i in range(len(self._scopes) - 1, -1, -1):
+            local = self._scopes[i].get(name.lexeme)
+            if local is not None:
+                return len(self._frames) - 1 - self._scope_frames[i][0], local[0]
+        return None, None
+
+    def _begin_scope(self, new_frame):
+        if new_frame:
+            self._frames.append([0, 0])
+        self._scopes.append({})
+        self._scope_frames.append((len(self._frames) - 1, new_frame))
+
+    def _end_scope(self):
+        scope = self._scopes.pop()
+        frame_index, owns_frame = self._scope_frames.pop()
+        if owns_frame:
+            return self._frames.pop()[1]
+        # Hoisted scope: hand its slots back to the enclosing frame.
+        self._frames[frame_index][0] -= len(scope)
+        return None
+
+    def _declare(self, name):
+        if not self._scopes:
+            return None
+        scope = self._scopes[-1]
+        if name.lexeme in scope:
+            self._reporter.error(name, "Already a variable with this name in this scope.")
+            return scope[name.lexeme][0]
+        frame = self._frames[self._scope_frames[-1][0]]
+        scope[name.lexeme] = [frame[0], False]
+        frame[0] += 1
+        frame[1] = max(frame[1], frame[0])
+        return scope[name.lexeme][0]
+
+    def _define(self, name):
+        if not self._scopes:
+            return
+        self._scopes[-1][name.lexeme][1] = True
@@ -0,0 +1,68 @@
+# Lox strings built by concatenation. Copying the whole string for every
+# `s = s + x;` makes building a string in a loop quadratic, so a long
+# concatenation returns a Rope instead: a list of parts shared with the
+# rope it was built from plus how many of those parts are its own.
+# Appending to the newest rope of a list extends the list in place; an
+# older rope appended to again copies its parts first. The parts are only
+# joined when the text is needed: printing, comparing, hashing or passing
+# it to a native. Short results stay plain str.
+class Rope:
+    __slots__ = ("_parts", "_count", "_length", "_text")
+
+    def __init__(self, parts, length):
+        self._parts = parts
+        self._count = len(parts)
+        self._length = length
+        self._text = None
+
+    def _append(self, text):
+        parts = self._parts
+        if len(parts) != self._count:
+            parts = parts[:self._count]
+        parts.append(text)
+        return Rope(parts, self._length + len(text))
+
+    def __str__(self):
+        if self._text is None:
+            self._text = "".join(self._parts[:self._count])
+            # The joined text can seed later appends to this rope.
+            self._parts = [self._text]
+            self._count = 1
+        return self._text
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if isinstance(other, (str, Rope)):
+            return self._length == len(other) and str(self) == str(other)
+        return False
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+STRINGS = (str, Rope)
+
+# Concatenations shorter than this are cheaper as a plain str.
+ROPE_THRESHOLD = 256
+
+# Concatenates two Lox strings, either of which may be a Rope.
+def concat(left, right):
+    if type(left) is Rope:
+        return left._append(str(right))
+    if type(right) is Rope:
+        right = str(right)
+    length = len(left) + len(right)
+    if length < ROPE_THRESHOLD:
+        return left + right
+    return Rope([left, right], length)
+
+# The str a native sees for a Lox value.
+def flatten(value):
+    if type(value) is Rope:
+        return str(value)
+    return value
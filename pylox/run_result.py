@@ -0,0 +1,19 @@
+from .lox_error import LoxError
+
+# Outcome of running one program in a Session. `stats` is the run's
+# RunStats when the session collects them, and None otherwise.
+class RunResult:
+    def __init__(self, errors, stats=None):
+        self.errors = errors
+        self.stats = stats
+        self.had_error = any(error.kind == LoxError.COMPILE for error in errors)
+        self.had_runtime_error = any(error.kind == LoxError.RUNTIME for error in errors)
+
+    # The command line's exit status for this outcome.
+    @property
+    def exit_code(self):
+        if self.had_error:
+            return 65
+        if self.had_runtime_error:
+            return 70
+        return 0
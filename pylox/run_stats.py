@@ -0,0 +1,166 @@
+from collections import Counter
+from .deep_stack import descend
+from .expr import Expr
+from .runtime_exception import RuntimeException
+from .stmt import Stmt
+
+# Statistics about one run: how long each phase took, how big the program
+# was, and, for the tree-walking interpreters, what executing it did.
+# A Session created with stats=True fills one in per run and hands a copy
+# back in the RunResult. Counters an engine can't provide stay None.
+class RunStats:
+    # How many environments deep an instrumented run may get before a call
+    # raises a "Stack overflow." runtime error.
+    max_depth = 1000
+
+    def __init__(self):
+        self._instrumented = False
+        self.reset()
+
+    def reset(self):
+        self.scan_time = 0.0
+        self.parse_time = 0.0
+        self.resolve_time = 0.0
+        # Time to load the program from __loxcache__ instead of compiling it.
+        self.load_time = 0.0
+        self.execute_time = 0.0
+        self.tokens = None
+        self.nodes = None
+        self.statements = None
+        self.calls = None
+        self.environments = None
+        self.peak_scope_depth = None
+        # Number of environments each variable lookup or assignment walked
+        # through, mapped to how many times that happened.
+        self.lookups = None
+        if self._instrumented:
+            self.statements = 0
+            self.calls = 0
+            self.environments = 0
+            self.peak_scope_depth = 0
+            self.lookups = Counter()
+
+    # Counts what the interpreter does by wrapping the methods it runs
+    # statements, blocks, calls and variable accesses through, on that one
+    # instance, as the Profiler does. Only the tree and quicken engines run
+    # everything through these.
+    def attach(self, interpreter):
+        self._instrumented = True
+        self.reset()
+        execute = interpreter._execute
+        execute_block = interpreter._execute_block
+        check_call = interpreter._check_call
+        visit_variable_expr = interpreter.visit_variable_expr
+        visit_assign_expr = interpreter.visit_assign_expr
+        nesting = 0
+
+        def _execute(stmt):
+            self.statements += 1
+            return execute(stmt)
+
+        # Every Environment an interpreter creates, for a call or a scoped
+        # block, is entered through _execute_block. The wrappers cost
+        # Python frames, so calls carry on in a new thread when this one
+        # runs low (see deep_stack), up to max_depth.
+        def _execute_block(statements, environment):
+            nonlocal nesting
+            self.environments += 1
+            depth = 0
+            scope = environment
+            while scope is not None:
+                depth += 1
+                scope = scope._enclosing
+            if depth > self.peak_scope_depth:
+                self.peak_scope_depth = depth
+            nesting += 1
+            try:
+                if nesting & 15:
+                    return execute_block(statements, environment)
+                return descend(execute_block, statements, environment)
+            finally:
+                nesting -= 1
+
+        # Every call is checked before it is made, with or without the
+        # Profiler's call visitor in place.
+        def _check_call(paren, callee, arguments):
+            check_call(paren, callee, arguments)
+            if nesting >= self.max_depth:
+                raise RuntimeException(paren, "Stack overflow.")
+            self.calls += 1
+
+        def _visit_variable_expr(expr):
+            self.lookups[self._chain_length(expr)] += 1
+            return visit_variable_expr(expr)
+
+        def _visit_assign_expr(expr):
+            self.lookups[self._chain_length(expr)] += 1
+            return visit_assign_expr(expr)
+
+        interpreter._execute = _execute
+        interpreter._execute_block = _execute_block
+        interpreter._check_call = _check_call
+        interpreter.visit_variable_expr = _visit_variable_expr
+        interpreter.visit_assign_expr = _visit_assign_expr
+        return self
+
+    # Resolved variables are depth hops from the current scope; globals
+    # are looked up directly in the global environment.
+    @staticmethod
+    def _chain_length(expr):
+        if expr.depth is None:
+            return 1
+        return expr.depth + 1
+
+    @staticmethod
+    def count_nodes(statements):
+        seen = set()
+        pending = list(statements)
+        while pending:
+            item = pending.pop()
+            if isinstance(item, list):
+                pending.extend(item)
+            elif isinstance(item, (Expr, Stmt)) and id(item) not in seen:
+                seen.add(id(item))
+                for cls in type(item).__mro__:
+                    for name in getattr(cls, "__slots__", ()):
+                        pending.append(getattr(item, name))
+        return len(seen)
+
+    def snapshot(self):
+        stats = RunStats.__new__(RunStats)
+        stats.__dict__.update(self.__dict__)
+        if self.lookups is not None:
+            stats.lookups = Counter(self.lookups)
+        return stats
+
+    def as_dict(self):
+        stats = dict(self.__dict__)
+        del stats["_instrumented"]
+        if self.lookups is not None:
+            stats["lookups"] = dict(sorted(self.lookups.items()))
+        return stats
+
+    def report(self):
+        lines = [
+            f"scan:             {self.scan_time:.4f}s",
+            f"parse:            {self.parse_time:.4f}s",
+            f"resolve:          {self.resolve_time:.4f}s",
+        ]
+        if self.load_time:
+            lines.append(f"cache load:       {self.load_time:.4f}s")
+        lines.append(f"execute:          {self.execute_time:.4f}s")
+        for label, value in (("tokens", self.tokens), ("AST nodes", self.nodes),
+                             ("statements", self.statements), ("calls", self.calls),
+                             ("environments", self.environments),
+                             ("peak scope depth", self.peak_scope_depth)):
+            lines.append(f"{label + ':':<17} {'n/a' if value is None else value}")
+        if self.lookups is None:
+            lines.append("lookups:          n/a")
+        else:
+            total = sum(self.lookups.values())
+            average = sum(length * count for length, count in self.lookups.items()) / total if total else 0
+            lines.append(f"lookups:          {total} (average chain {average:.2f}, "
+                         f"longest {max(self.lookups, default=0)})")
+            for length, count in sorted(self.lookups.items()):
+                lines.append(f"  chain {length:<9} {count}")
+        return "\n".join(lines)
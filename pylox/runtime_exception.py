@@ -1,5 +1,5 @@
 class RuntimeException(Exception):
     def __init__(self, token, message):
-        super().__init__(self.message)
+        super().__init__(message)
         self.message = message
         self.token = token
@@ -1,6 +1,7 @@
+import sys
 from .token_type import TokenType
 from .token import Token
-import pylox.lox
+from .error_reporter import ErrorReporter
 
 class Scanner:
     keywords = {
@@ -21,7 +22,10 @@ class Scanner:
         "var":    TokenType.VAR,
         "while":  TokenType.WHILE,
     }
-    def __init__(self, source):
+    def __init__(self, source, reporter=None):
+        self._reporter = reporter or ErrorReporter(sys.stderr)
+        if not isinstance(source, str):
+            source = bytes(source).decode()
         self.source = source
         self.start = 0
         self.current = 0
@@ -36,6 +40,9 @@ class Scanner:
         self.tokens.append(Token(TokenType.EOF, "", None, self.line))
         return self.tokens
 
+    def iter_tokens(self):
+        return iter(self.scan_tokens())
+
     def is_at_end(self):
         return self.current >= len(self.source)
     
@@ -103,7 +110,7 @@ class Scanner:
             elif self.isAlpha(c):
                 self.identifier()
             else:
-                pylox.lox.Lox.error(self.line, "Unexpceted character.")
+                self._reporter.error(self.line, "Unexpceted character.")
             return
 
     def advance(self):
@@ -129,18 +136,21 @@ class Scanner:
         return self.source[self.current]
     
     def string(self):
+        # A string spanning lines is reported on the line it starts.
+        line = self.line
         while(self.peek() != '"' and not self.is_at_end()):
             if self.peek() == '\n':
                 self.line += 1
             self.advance()
         
         if self.is_at_end():
-            pylox.lox.Lox.error(self.line, "Unterminated string.")
+            self._reporter.error(self.line, "Unterminated string.")
+            return
         
         self.advance()
         
         value = self.source[self.start + 1:self.current - 1]
-        self.add_token(TokenType.STRING, value)
+        self.tokens.append(Token(TokenType.STRING, self.source[self.start:self.current], value, line))
     
     def isDigit(self, c):
         return c >= '0' and c <= '9'
@@ -156,7 +166,7 @@ class Scanner:
         
         self.add_token(TokenType.NUMBER, float(self.source[self.start:self.current]))    
     def peek_next(self):
-        if self.current + 1 > len(self.source):
+        if self.current + 1 >= len(self.source):
             return '\0'
         return self.source[self.current + 1]
     
@@ -167,11 +177,11 @@ class Scanner:
         while(self.isAlphaNumeric(self.peek())):
             self.advance()
         
-        text = self.source[self.start:self.current]
+        text = sys.intern(self.source[self.start:self.current])
         type = Scanner.keywords.get(text)
         if (type == None):
             type = TokenType.IDENTIFIER
-        self.add_token(type)
+        self.tokens.append(Token(type, text, None, self.line))
     
     def isAlphaNumeric(self, c):
         return self.isAlpha(c) or self.isDigit(c)
@@ -0,0 +1,19 @@
+# Outcome of one script in a batch run: its exit status (as the command
+# line would exit), everything it printed to stdout and stderr, and how
+# long it took.
+class ScriptResult:
+    def __init__(self, path, exit_code, stdout, stderr, seconds):
+        self.path = path
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.seconds = seconds
+
+    def as_dict(self):
+        return {
+            "path": self.path,
+            "exit_code": self.exit_code,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "seconds": self.seconds,
+        }
@@ -0,0 +1,219 @@
+import mmap
+import os
+import time
+from .scanner import Scanner
+from .regex_scanner import RegexScanner
+from .parser import Parser
+from .resolver import Resolver
+from .optimizer import Optimizer
+from .deep_stack import call_with_deep_stack
+from .program_cache import ProgramCache
+from .error_reporter import ErrorReporter
+from .output import Output
+from .run_result import RunResult
+from .run_stats import RunStats
+from .profiler import Profiler
+from .interpreter import Interpreter
+from .closure_interpreter import ClosureInterpreter
+from .vm import VM
+from .transpiled_interpreter import TranspiledInterpreter
+from .quickening_interpreter import QuickeningInterpreter
+from .stack_interpreter import StackInterpreter
+
+# An independent Lox environment for embedding: its own interpreter,
+# globals and error reporter. Programs run in a session see the globals
+# earlier ones defined, like lines in the REPL; reset() forgets them but
+# keeps the natives. Errors come back in the RunResult of each run, and
+# are also printed to `stream` if one is given. Printed values go to
+# `output`, a file-like object (sys.stdout when None), through a buffer
+# of output_buffer characters that is flushed at the end of every run.
+# readLine reads from `input` (sys.stdin when None).
+# With stats=True each RunResult also carries the RunStats of that run.
+class Session:
+    engines = {
+        "tree": Interpreter,
+        "closure": ClosureInterpreter,
+        "vm": VM,
+        "python": TranspiledInterpreter,
+        "quicken": QuickeningInterpreter,
+        "stack": StackInterpreter,
+    }
+    scanners = {
+        "regex": RegexScanner,
+        "char": Scanner,
+    }
+
+    def __init__(self, engine="tree", scanner="regex", optimize=False, cache=False, stream=None,
+                 stats=False, output=None, output_buffer=Output.DEFAULT_BUFFER_SIZE, input=None):
+        self.output = Output(output, output_buffer)
+        self.reporter = ErrorReporter(stream, self.output)
+        self.interpreter = self.engines[engine](self.reporter)
+        self.interpreter.output = self.output
+        self.interpreter.input = input
+        self.scanner = self.scanners[scanner]
+        self.optimize = optimize
+        self.cache = cache
+        self.stats = None
+        self.profiler = None
+        # The TokenStores scanned from the file run_file has mapped.
+        self._stores = None
+        if stats:
+            self.stats = RunStats()
+            if type(self.interpreter) in (Interpreter, QuickeningInterpreter):
+                self.stats.attach(self.interpreter)
+
+    # Starts profiling the Lox functions this session calls, from now on.
+    # Only the tree and quicken engines can be profiled.
+    def profile(self):
+        if type(self.interpreter) not in (Interpreter, QuickeningInterpreter):
+            raise ValueError("only the tree and quicken engines can be profiled")
+        if self.profiler is None:
+            self.profiler = Profiler().attach(self.interpreter)
+        return self.profiler
+
+    def reset(self):
+        self.interpreter.reset()
+        self.reporter.reset()
+
+    def run(self, source):
+        self._start()
+        try:
+            statements = self._compile(source)
+            if statements is not None:
+                self._interpret(statements)
+        finally:
+            self.interpreter.output.flush()
+        return self._result()
+
+    def run_file(self, path):
+        # The script is scanned straight out of a read-only mapping rather
+        # than being read into a str. Functions and classes it defines keep
+        # their tokens, so the stores are detached from the mapping before
+        # it is closed.
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return self._run_file(path, "")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                self._stores = []
+                try:
+                    return self._run_file(path, source)
+                finally:
+                    for store in self._stores:
+                        store.detach()
+                    self._stores = None
+
+    def _run_file(self, path, source):
+        if not self.cache:
+            return self.run(source)
+        self._start()
+        try:
+            self._run_cached(path, source)
+        finally:
+            self.interpreter.output.flush()
+        return self._result()
+
+    def _run_cached(self, path, source):
+        # A cached program skips scanning, parsing and resolving entirely.
+        # The engine's nesting bound is part of the key: the parser enforces
+        # it, so a tree parsed for a deeper-going engine must not be reused.
+        cache = ProgramCache((self.optimize, self.interpreter.max_nesting))
+        start = time.perf_counter()
+        program = call_with_deep_stack(cache.load, path, source)
+        if program is not None and self._stores is not None:
+            self._stores.append(cache.token_store)
+        if program is not None and self.stats is not None:
+            self.stats.load_time = time.perf_counter() - start
+            self.stats.nodes = RunStats.count_nodes(program[0])
+        if program is None:
+            program = call_with_deep_stack(self._analyze, source)
+            if program is not None:
+                call_with_deep_stack(cache.store, path, source, *program)
+        if program is not None:
+            statements, slot_count = program
+            self.interpreter.globals.reserve(slot_count)
+            self._interpret(statements)
+
+    def _scan(self, source):
+        scanner = self.scanner(source, self.reporter)
+        if self._stores is not None and hasattr(scanner, "store"):
+            self._stores.append(scanner.store)
+        return scanner
+
+    def _start(self):
+        self.reporter.reset()
+        if self.stats is not None:
+            self.stats.reset()
+
+    # The stats and profiler hooks add Python frames to every Lox call and
+    # move on to new threads as they need them, so an instrumented program
+    # starts on a thread of its own.
+    def _interpret(self, statements):
+        if self.stats is None and self.profiler is None:
+            self.interpreter.interpret(statements)
+            return
+        start = time.perf_counter()
+        call_with_deep_stack(self.interpreter.interpret, statements)
+        if self.stats is not None:
+            self.stats.execute_time = time.perf_counter() - start
+
+    def _result(self):
+        if self.stats is None:
+            return RunResult(self.reporter.errors)
+        return RunResult(self.reporter.errors, self.stats.snapshot())
+
+    # Runs the front end over source and returns the statements to
+    # interpret, or None after reporting a compile error.
+    def compile(self, source):
+        self._start()
+        return self._compile(source)
+
+    def _compile(self, source):
+        program = call_with_deep_stack(self._analyze, source)
+        if program is None:
+            return None
+        statements, slot_count = program
+        self.interpreter.globals.reserve(slot_count)
+        return statements
+
+    # Scans, parses, resolves and optionally optimizes source. Returns the
+    # statements and the number of global slots, or None on a compile error.
+    def _analyze(self, source):
+        if self.stats is not None:
+            return self._analyze_timed(source)
+        scanner = self._scan(source)
+        parser = Parser(scanner.iter_tokens(), self.reporter, self.interpreter.max_nesting)
+        statements = parser.parse()
+        if self.reporter.had_error:
+            return None
+        resolver = Resolver(self.reporter)
+        resolver.resolve(statements)
+        if self.reporter.had_error:
+            return None
+        if self.optimize:
+            statements = Optimizer(self.interpreter).optimize(statements)
+        return statements, resolver.slot_count
+
+    # _analyze for a session collecting stats. The tokens are all scanned
+    # before parsing starts so the two phases can be timed apart;
+    # optimizing counts as resolving.
+    def _analyze_timed(self, source):
+        stats = self.stats
+        start = time.perf_counter()
+        tokens = self._scan(source).scan_tokens()
+        stats.scan_time = time.perf_counter() - start
+        stats.tokens = len(tokens)
+        start = time.perf_counter()
+        statements = Parser(tokens, self.reporter, self.interpreter.max_nesting).parse()
+        stats.parse_time = time.perf_counter() - start
+        if self.reporter.had_error:
+            return None
+        stats.nodes = RunStats.count_nodes(statements)
+        start = time.perf_counter()
+        resolver = Resolver(self.reporter)
+        resolver.resolve(statements)
+        if not self.reporter.had_error and self.optimize:
+            statements = Optimizer(self.interpreter).optimize(statements)
+        stats.resolve_time = time.perf_counter() - start
+        if self.reporter.had_error:
+            return None
+        return statements, resolver.slot_count
@@ -0,0 +1,282 @@
+from types import GeneratorType
+from .interpreter import Interpreter
+from .lox_function import LoxFunction
+from .runtime_exception import RuntimeException
+from .native_error import NativeError
+from .environment import Environment
+from .expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from .stmt import Block, Expression, Function, If, Print, Return, Var, While
+from .token_type import TokenType
+
+# Returned by StackInterpreter._leaf for nodes that need a generator.
+_PENDING = object()
+
+# Completion of a `return f(...)` whose callee is a Lox function. The
+# enclosing call frame reuses itself for the callee instead of nesting a
+# new one.
+class TailCall:
+    __slots__ = ("function", "arguments", "paren")
+
+    def __init__(self, function, arguments, paren):
+        self.function = function
+        self.arguments = arguments
+        self.paren = paren
+
+# Tree-walking interpreter that keeps its own stack instead of recursing in
+# Python. Every compound node is evaluated by a generator that yields the
+# child nodes it needs and receives their values back; _run drives the
+# generators from an explicit, heap-allocated stack, so neither deep Lox
+# recursion nor deeply nested expressions consume Python frames. Statement
+# generators use the Interpreter's completion convention (None or a
+# 1-tuple holding the returned value). Calls deeper than max_depth raise a
+# "Stack overflow." runtime error. Programs may be nested to any depth.
+class StackInterpreter(Interpreter):
+
+    max_depth = 100000
+    max_nesting = None
+
+    def __init__(self, reporter=None):
+        super().__init__(reporter)
+        self._depth = 0
+        self._routines = {
+            Assign: self._assign,
+            Binary: self._binary_expr,
+            Call: self._call,
+            Logical: self._logical,
+            Unary: self._unary_expr,
+            Block: self._block,
+            Expression: self._expression,
+            If: self._if,
+            Print: self._print,
+            Return: self._return,
+            Var: self._var,
+            While: self._while,
+        }
+
+    def interpret(self, statements):
+        try:
+            self._run(self._sequence(statements))
+        except RuntimeException as err:
+            self.reporter.runtime_error(err)
+
+    def _execute_block(self, statements, environment):
+        # Reached from LoxFunction.call when a native calls back into Lox.
+        return self._run(self._body(statements, environment))
+
+    def _run(self, routine):
+        stack = [routine]
+        value = None
+        environment = self._environment
+        depth = self._depth
+        try:
+            while True:
+                try:
+                    request = stack[-1].send(value)
+                except StopIteration as stop:
+                    stack.pop()
+                    if not stack:
+                        return stop.value
+                    value = stop.value
+                    continue
+                kind = type(request)
+                while kind is Grouping:
+                    request = request.expression
+                    kind = type(request)
+                if kind is Literal:
+                    value = request.value
+                elif kind is Variable:
+                    value = self.visit_variable_expr(request)
+                elif kind is GeneratorType:
+                    stack.append(request)
+                    value = None
+                elif kind is Function:
+                    self.visit_function_stmt(request)
+                    value = None
+                else:
+                    stack.append(self._routines[kind](request))
+                    value = None
+        except BaseException:
+            self._environment = environment
+            self._depth = depth
+            raise
+
+    # Literals and variables are evaluated in place by the routines that
+    # need them instead of making a round trip through _run.
+    def _leaf(self, expr):
+        kind = type(expr)
+        while kind is Grouping:
+            expr = expr.expression
+            kind = type(expr)
+        if kind is Literal:
+            return expr.value
+        if kind is Variable:
+            return self.visit_variable_expr(expr)
+        return _PENDING
+
+    # Statement sequences and call frames.
+
+    def _sequence(self, statements):
+        for statement in statements:
+            completion = yield statement
+            if completion is not None:
+                return completion
+        return None
+
+    def _body(self, statements, environment):
+        previous = self._environment
+        self._environment = environment
+        completion = yield self._sequence(statements)
+        self._environment = previous
+        if type(completion) is TailCall:
+            completion = ((yield self._frame(completion.function, completion.arguments, completion.paren)),)
+        return completion
+
+    def _frame(self, function, arguments, paren):
+        self._depth += 1
+        if self._depth > self.max_depth:
+            raise RuntimeException(paren, "Stack overflow.")
+        previous = self._environment
+        while True:
+            declaration = function._declaration
+            environment = Environment(function._closure, declaration.slot_count)
+            # Parameters occupy the first slots of the function's scope.
+            environment._slots[:len(arguments)] = arguments
+            self._environment = environment
+            completion = yield self._sequence(declaration.body)
+            if type(completion) is not TailCall:
+                break
+            function, arguments = completion.function, completion.arguments
+        self._environment = previous
+        self._depth -= 1
+        if completion is None:
+            return None
+        return completion[0]
+
+    # Statements.
+
+    def _block(self, stmt):
+        if not stmt.scoped:
+            return (yield self._sequence(stmt.statements))
+        previous = self._environment
+        self._environment = Environment(previous, stmt.slot_count)
+        completion = yield self._sequence(stmt.statements)
+        self._environment = previous
+        return completion
+
+    def _expression(self, stmt):
+        yield stmt.expression
+
+    def _if(self, stmt):
+        condition = self._leaf(stmt.condittion)
+        if condition is _PENDING:
+            condition = yield stmt.condittion
+        if self._is_truthy(condition):
+            return (yield stmt.then_branch)
+        elif stmt.else_branch is not None:
+            return (yield stmt.else_branch)
+        return None
+
+    def _print(self, stmt):
+        value = self._leaf(stmt.expression)
+        if value is _PENDING:
+            value = yield stmt.expression
+        self.output.write_line(self._stringify(value))
+
+    def _return(self, stmt):
+        expr = stmt.value
+        if expr is None:
+            return (None,)
+        if type(expr) is not Call:
+            value = self._leaf(expr)
+            if value is _PENDING:
+                value = yield expr
+            return (value,)
+        callee = self._leaf(expr.callee)
+        if callee is _PENDING:
+            callee = yield expr.callee
+        arguments = yield from self._arguments(expr)
+        self._check_call(expr.paren, callee, arguments)
+        if type(callee) is LoxFunction:
+            return TailCall(callee, arguments, expr.paren)
+        return (self._call_native(expr.paren, callee, arguments),)
+
+    def _var(self, stmt):
+        value = None
+        if stmt.initializer is not None:
+            value = self._leaf(stmt.initializer)
+            if value is _PENDING:
+                value = yield stmt.initializer
+        self._define(stmt.name, stmt.slot, value)
+
+    def _while(self, stmt):
+        while self._is_truthy((yield stmt.condition)):
+            completion = yield stmt.body
+            if completion is not None:
+                return completion
+        return None
+
+    # Expressions.
+
+    def _assign(self, expr):
+        value = self._leaf(expr.value)
+        if value is _PENDING:
+            value = yield expr.value
+        if expr.depth is None:
+            self.globals._assign(expr.name, value)
+        else:
+            self._environment.assign_at(expr.depth, expr.slot, value)
+        return value
+
+    def _binary_expr(self, expr):
+        left = self._leaf(expr.left)
+        if left is _PENDING:
+            left = yield expr.left
+        right = self._leaf(expr.right)
+        if right is _PENDING:
+            right = yield expr.right
+        return self._binary(expr.operator, left, right)
+
+    def _call(self, expr):
+        callee = self._leaf(expr.callee)
+        if callee is _PENDING:
+            callee = yield expr.callee
+        arguments = yield from self._arguments(expr)
+        self._check_call(expr.paren, callee, arguments)
+        if type(callee) is LoxFunction:
+            return (yield self._frame(callee, arguments, expr.paren))
+        return self._call_native(expr.paren, callee, arguments)
+
+    # Calls anything but a Lox function: a native, or a function from
+    # another engine.
+    def _call_native(self, paren, callee, arguments):
+        try:
+            return callee.call(self, arguments)
+        except NativeError as error:
+            raise RuntimeException(paren, error.message)
+
+    def _arguments(self, expr):
+        arguments = []
+        for argument in expr.arguments:
+            value = self._leaf(argument)
+            if value is _PENDING:
+                value = yield argument
+            arguments.append(value)
+        return arguments
+
+    def _logical(self, expr):
+        left = self._leaf(expr.left)
+        if left is _PENDING:
+            left = yield expr.left
+        if expr.operator.type == TokenType.OR:
+            if self._is_truthy(left):
+                return left
+        else:
+            if not self._is_truthy(left):
+                return left
+        return (yield expr.right)
+
+    def _unary_expr(self, expr):
+        right = self._leaf(expr.right)
+        if right is _PENDING:
+            right = yield expr.right
+        return self._unary(expr.operator, right)
@@ -4,16 +4,24 @@ from .expr import Expr
 from typing import List
 
 class Stmt:
-    pass
+    __slots__ = ()
 
 class Block(Stmt):
+    __slots__ = ('statements', 'slot_count', 'scoped',)
+    KIND = 8
+
     def __init__(self, statements: List[Stmt]):
         self.statements = statements
+        self.slot_count = None
+        self.scoped = None
 
     def accept(self, visitor):
         return visitor.visit_block_stmt(self)
 
 class Expression(Stmt):
+    __slots__ = ('expression',)
+    KIND = 9
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -21,15 +29,23 @@ class Expression(Stmt):
         return visitor.visit_expression_stmt(self)
 
 class Function(Stmt):
+    __slots__ = ('name', 'params', 'body', 'slot', 'slot_count',)
+    KIND = 10
+
     def __init__(self, name: Token, params: List[Token], body: List[Stmt]):
         self.name = name
         self.params = params
         self.body = body
+        self.slot = None
+        self.slot_count = None
 
     def accept(self, visitor):
         return visitor.visit_function_stmt(self)
 
 class If(Stmt):
+    __slots__ = ('condittion', 'then_branch', 'else_branch',)
+    KIND = 11
+
     def __init__(self, condittion: Expr, then_branch: Stmt, else_branch: Stmt):
         self.condittion = condittion
         self.then_branch = then_branch
@@ -39,6 +55,9 @@ class If(Stmt):
         return visitor.visit_if_stmt(self)
 
 class Print(Stmt):
+    __slots__ = ('expression',)
+    KIND = 12
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -46,6 +65,9 @@ class Print(Stmt):
         return visitor.visit_print_stmt(self)
 
 class Return(Stmt):
+    __slots__ = ('keyword', 'value',)
+    KIND = 13
+
     def __init__(self, keyword: Token, value: Expr):
         self.keyword = keyword
         self.value = value
@@ -54,14 +76,21 @@ class Return(Stmt):
         return visitor.visit_return_stmt(self)
 
 class Var(Stmt):
+    __slots__ = ('name', 'initializer', 'slot',)
+    KIND = 14
+
     def __init__(self, name: Token, initializer: Expr):
         self.name = name
         self.initializer = initializer
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_var_stmt(self)
 
 class While(Stmt):
+    __slots__ = ('condition', 'body',)
+    KIND = 15
+
     def __init__(self, condition: Expr, body: Stmt):
         self.condition = condition
         self.body = body
@@ -0,0 +1,13 @@
+# The text `print` shows for a Lox value. Collections use it for their
+# elements.
+def stringify(object):
+    if object is None:
+        return "nil"
+
+    if isinstance(object, float):
+        text = str(float(object))
+        if text.endswith(".0"):
+            text = text[0:len(text)-2]
+        return text
+
+    return str(object)
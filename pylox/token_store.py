@@ -0,0 +1,53 @@
+from array import array
+from .token_type import TokenType
+from .token_view import TokenView
+
+# Struct-of-arrays store for a scanned source: one byte for the token
+# type and the start/end offsets of each lexeme. Lexemes and literals are
+# sliced from the source only when asked for, and lines come from the
+# scanner's LineTable. Tokens are handed out as TokenViews.
+class TokenStore:
+    _TYPES = tuple(TokenType)
+
+    def __init__(self, source, lines):
+        self.source = source
+        self.lines = lines
+        self._binary = not isinstance(source, str)
+        self.types = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+
+    # Copies a memory-mapped source, for tokens that outlive the mapping.
+    def detach(self):
+        self.lines.detach()
+        self.source = self.lines.source
+
+    def __len__(self):
+        return len(self.types)
+
+    def add(self, type, start, end, lexeme=None):
+        index = len(self.types)
+        self.types.append(type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        return TokenView(self, index, type, lexeme)
+
+    def view(self, index):
+        return TokenView(self, index, self._TYPES[self.types[index]])
+
+    def lexeme(self, index):
+        text = self.source[self.starts[index]:self.ends[index]]
+        if self._binary:
+            text = text.decode()
+        return text
+
+    def literal(self, index):
+        type = self.types[index]
+        if type == TokenType.NUMBER.value:
+            return float(self.lexeme(index))
+        if type == TokenType.STRING.value:
+            return self.lexeme(index)[1:-1]
+        return None
+
+    def line(self, index):
+        return self.lines.line_of(self.starts[index])
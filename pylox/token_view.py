@@ -0,0 +1,30 @@
+# A token in a TokenStore. Only the type (and, for identifiers, the
+# interned name) is held directly; the lexeme, literal, line and source
+# offset are read from the store when used, which is rarely outside of
+# the parser and error reporting. The lexeme is a slot that __getattr__
+# fills in on first use, so later reads cost the same as on a plain Token.
+class TokenView:
+    __slots__ = ("type", "lexeme", "_store", "_index")
+
+    def __init__(self, store, index, type, lexeme=None):
+        self.type = type
+        if lexeme is not None:
+            self.lexeme = lexeme
+        self._store = store
+        self._index = index
+
+    def __getattr__(self, name):
+        if name == "lexeme":
+            self.lexeme = self._store.lexeme(self._index)
+            return self.lexeme
+        if name == "literal":
+            return self._store.literal(self._index)
+        if name == "line":
+            return self._store.line(self._index)
+        if name == "offset":
+            return self._store.starts[self._index]
+        raise AttributeError(name)
+
+    def __repr__(self):
+        literal = self.literal
+        return str(self.type) + " " + self.lexeme + " " + ("" if literal == None else str(literal))
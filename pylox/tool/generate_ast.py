@@ -1,28 +1,38 @@
 import os
 
 EXPR = [
-    "Assign   | name: Token, value: Expr",
+    "Assign   | name: Token, value: Expr | depth, slot",
     "Binary   | left: Expr, operator: Token, right: Expr",
     "Call     | callee: Expr, paren: Token, arguments: List[Expr]",
     "Grouping | expression: Expr",
     "Literal  | value",
     "Logical  | left: Expr, operator: Token, right: Expr",
     "Unary    | operator: Token, right: Expr",
-    "Variable | name: Token",
+    "Variable | name: Token | depth, slot",
 ]
 
 STMT = [
-    "Block      | statements: List[Stmt]",
+    "Block      | statements: List[Stmt] | slot_count, scoped",
     "Expression | expression: Expr",
-    "Function | name: Token, params: List[Token], body: List[Stmt]",
+    "Function | name: Token, params: List[Token], body: List[Stmt] | slot, slot_count",
     "If         | condittion: Expr, then_branch: Stmt, else_branch: Stmt",
     "Print      | expression: Expr",
     "Return     | keyword: Token, value: Expr",
-    "Var        | name: Token, initializer: Expr",
+    "Var        | name: Token, initializer: Expr | slot",
     "While      | condition: Expr, body: Stmt"
 ]
 
-def define_ast(output_dir, basename, types):
+# Literals whose nodes are shared by every program instead of allocated
+# per occurrence.
+SINGLETONS = [
+    "TRUE  | True",
+    "FALSE | False",
+    "NIL   | None",
+]
+
+# Node classes use __slots__ instead of a per-instance __dict__ and carry a
+# small integer KIND tag, unique across Expr and Stmt.
+def define_ast(output_dir, basename, types, first_kind=0, singletons=()):
     with open(output_dir, "w") as f:
         f.write("# Auto-generated by tool/generate_ast.py\n")
         f.write("from .token import Token\n")
@@ -31,24 +41,40 @@ def define_ast(output_dir, basename, types):
         f.write("from typing import List\n")
         f.write("\n")
         f.write(f"class {basename}:\n")
-        f.write("    pass\n")
+        f.write("    __slots__ = ()\n")
         f.write("\n")
 
-        for expr in types:
-            class_name = expr.split('|', 1)[0].strip()
-            fields = expr.split('|', 1)[1].strip()
+        for kind, expr in enumerate(types, first_kind):
+            class_name = expr.split('|')[0].strip()
+            fields = expr.split('|')[1].strip()
+            # Optional third column: annotations filled in by later passes
+            # (e.g. the resolver), initialised to None.
+            annotations = expr.split('|')[2].strip() if expr.count('|') > 1 else ""
+            names = [field.split(":")[0].strip() for field in fields.split(',')]
+            names += [annotation.strip() for annotation in annotations.split(',') if annotation.strip()]
             f.write(f"class {class_name}({basename}):\n")
+            f.write(f"    __slots__ = ({', '.join(repr(name) for name in names)},)\n")
+            f.write(f"    KIND = {kind}\n")
+            f.write("\n")
             f.write(f"    def __init__(self, {fields}):\n")
 
             for field in fields.split(','):
                 field_name = field.split(":")[0].strip()
                 f.write(f"        self.{field_name} = {field_name}\n")
+            for annotation in annotations.split(','):
+                if annotation.strip():
+                    f.write(f"        self.{annotation.strip()} = None\n")
         
             f.write("\n")
             f.write("    def accept(self, visitor):\n")
             f.write(f"        return visitor.visit_{class_name.lower()}_{basename.lower()}(self)\n")
             f.write("\n")
 
+        for singleton in singletons:
+            name = singleton.split('|')[0].strip()
+            value = singleton.split('|')[1].strip()
+            f.write(f"Literal.{name} = Literal({value})\n")
+
 def define_visitor(output_dir, expr_types, stmt_types):
     with open(output_dir, "w") as f:
         f.write("# Auto-generated by tool/generate_ast.py\n")
@@ -76,6 +102,6 @@ def define_visitor(output_dir, expr_types, stmt_types):
 if __name__ == '__main__':
     dirname = os.path.dirname(__file__)
     foldername = os.path.join(dirname, '../')
-    define_ast(foldername + "expr.py", "Expr", EXPR)
-    define_ast(foldername + "stmt.py", "Stmt", STMT)
+    define_ast(foldername + "expr.py", "Expr", EXPR, singletons=SINGLETONS)
+    define_ast(foldername + "stmt.py", "Stmt", STMT, len(EXPR))
     define_visitor(foldername + "visitor.py", EXPR, STMT)
@@ -0,0 +1,18 @@
+from .lox_callable import LoxCallable
+
+
+# A Lox function lowered to a plain Python function by the Transpiler.
+class TranspiledFunction(LoxCallable):
+    def __init__(self, function, name, arity) -> None:
+        self.function = function
+        self.name = name
+        self.arity_count = arity
+
+    def call(self, interpreter, arguments):
+        return self.function(*arguments)
+    
+    def arity(self):
+        return self.arity_count
+    
+    def __repr__(self) -> str:
+        return f"<fn {self.name}>"
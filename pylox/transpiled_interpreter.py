@@ -0,0 +1,33 @@
+from .interpreter import Interpreter
+from .transpiler import Transpiler
+from .transpiler_runtime import GLOBAL_PREFIX, bind, execute
+
+# Execution engine that transpiles each program to Python source with the
+# Transpiler, compiles it with compile() and runs the resulting CPython
+# bytecode. Lox globals live in a namespace that persists between runs.
+class TranspiledInterpreter(Interpreter):
+
+    # Each level of nesting opens up to three parentheses in the generated
+    # code, and CPython's parser allows 200.
+    max_nesting = 64
+
+    def __init__(self, reporter=None):
+        super().__init__(reporter)
+
+    def reset(self):
+        super().reset()
+        self._namespace = {"__name__": "__lox__"}
+        self._units = 0
+        bind(self._namespace, self)
+
+    def interpret(self, statements):
+        defined = [name[len(GLOBAL_PREFIX):] for name in self._namespace if name.startswith(GLOBAL_PREFIX)]
+        source = Transpiler(defined, self._units).transpile(statements)
+        code = compile(source, f"<lox-{self._units}>", "exec")
+        self._units += 1
+        exec(code, self._namespace)
+        execute(self._namespace, self.reporter)
+
+    @staticmethod
+    def transpile(statements, filename="<lox>"):
+        return Transpiler().transpile(statements, filename)
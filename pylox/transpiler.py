@@ -0,0 +1,383 @@
+import math
+from .visitor import Visitor
+from .expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from .stmt import Block, Expression, Function, If, Print, Return, Var, While
+from .token_type import TokenType
+from .transpiler_runtime import GLOBAL_PREFIX
+
+# A Python function being generated: the names it has to declare
+# nonlocal/global and how many loops deep the current statement is.
+class PythonFunction:
+    def __init__(self, enclosing):
+        self.enclosing = enclosing
+        self.nonlocals = set()
+        self.globals = set()
+        self.loop_depth = 0
+
+# Lowers a resolved program to the source of a Python module that runs it
+# with the same semantics. Lox functions become Python functions and
+# variables become Python variables, so CPython's own bytecode does the
+# work; operators take an inline fast path for floats and otherwise fall
+# back to the Interpreter's own _binary/_unary.
+#
+# Locals are renamed l<n>_<name> (one name per declaration, so shadowing
+# is safe) and globals g_<name>; generated helpers all start with "_".
+# Blocks whose variables are captured and that run inside a loop become
+# nested Python functions, so each iteration gets fresh closure cells.
+class Transpiler(Visitor):
+    _fast_binary = {
+        TokenType.MINUS: "-",
+        TokenType.STAR: "*",
+        TokenType.PLUS: "+",
+        TokenType.GREATER: ">",
+        TokenType.GREATER_EQUAL: ">=",
+        TokenType.LESS: "<",
+        TokenType.LESS_EQUAL: "<=",
+    }
+    _comparisons = (TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS,
+                    TokenType.LESS_EQUAL, TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL)
+
+    _LINE_MARK = "\x00"
+
+    def __init__(self, defined_globals=(), unit=0):
+        # Globals known to exist before the program runs (natives and, in
+        # the REPL, earlier definitions) plus those the program has
+        # unconditionally defined so far. Assigning to them needs no check.
+        self._defined_globals = set(defined_globals)
+        self._lines = []
+        self._indent = 0
+        self._line = 1
+        self._scopes = []
+        self._function = None
+        self._counter = 0
+        self._depth = 0
+        # Tokens for operator fallbacks are module globals named after the
+        # unit, so several units can share one namespace (the REPL).
+        self._unit = unit
+        self._tokens = []
+
+    def transpile(self, statements, filename="<lox>"):
+        self._emit(f"# Generated by pylox from {filename}")
+        self._emit("from pylox.transpiler_runtime import _function, _token, run")
+        header = len(self._lines)
+        self._emit("def _program():")
+        self._function = PythonFunction(None)
+        self._block(statements, top_level=True)
+        self._indent += 1
+        self._insert_declarations(header + 1)
+        self._indent -= 1
+
+        for i, (type, lexeme, line) in enumerate(self._tokens):
+            self._lines.insert(header, (0, f"_T{self._unit}_{i} = _token({type}, {lexeme!r}, {line})", line))
+            header += 1
+
+        # _LINES maps each generated file to a tuple giving the Lox line of
+        # every line of the file (1-based). It has to be set before main()
+        # runs, so its entry is filled in once the rest has been emitted.
+        self._emit("_LINES = globals().setdefault('_LINES', {})")
+        table = len(self._lines)
+        self._emit("")
+        self._emit("def main():")
+        self._indent += 1
+        self._emit("return run(globals())")
+        self._indent -= 1
+        self._emit("if __name__ == '__main__':")
+        self._indent += 1
+        self._emit("import sys")
+        self._emit("sys.exit(main())")
+        self._indent -= 1
+
+        lox_lines = [0] + [line for _, _, line in self._lines]
+        self._lines[table] = (0, f"_LINES[_program.__code__.co_filename] = {tuple(lox_lines)!r}", 0)
+        return "\n".join("    " * indent + text for indent, text, _ in self._lines) + "\n"
+
+    def visit_expression_stmt(self, stmt: Expression):
+        self._line = self._line_of(stmt.expression)
+        if isinstance(stmt.expression, Assign):
+            target = self._target(stmt.expression.name)
+            value = self._expression(stmt.expression.value)
+            self._line = stmt.expression.name.line
+            if self._needs_check(stmt.expression.name, target):
+                self._emit(f"{target} = ({value}, {target})[0]")
+            else:
+                self._emit(f"{target} = {self._wrap(value)}")
+        else:
+            self._emit(self._wrap(self._expression(stmt.expression)))
+
+    def visit_print_stmt(self, stmt: Print):
+        self._line = self._line_of(stmt.expression)
+        self._emit(f"_print({self._expression(stmt.expression)})")
+
+    def visit_var_stmt(self, stmt: Var):
+        self._line = stmt.name.line
+        value = self._expression(stmt.initializer) if stmt.initializer is not None else "None"
+        self._emit(f"{self._declare(stmt.name)} = {self._wrap(value)}")
+
+    def visit_function_stmt(self, stmt: Function):
+        self._line = stmt.name.line
+        name = self._declare(stmt.name)
+        function = self._function
+        self._function = PythonFunction(function)
+        self._scopes.append({})
+        params = ", ".join(self._declare(param) for param in stmt.params)
+        self._emit(f"def {name}({params}):")
+        header = len(self._lines)
+        self._indent += 1
+        self._statements(stmt.body)
+        self._scopes.pop()
+        self._insert_declarations(header)
+        self._indent -= 1
+        self._function = function
+        self._line = stmt.name.line
+        self._emit(f"{name} = _function({name}, {stmt.name.lexeme!r}, {len(stmt.params)})")
+
+    def visit_return_stmt(self, stmt: Return):
+        self._line = stmt.keyword.line
+        if stmt.value is None:
+            self._emit("return None")
+        else:
+            self._emit(f"return {self._wrap(self._expression(stmt.value))}")
+
+    def visit_block_stmt(self, stmt: Block):
+        if stmt.scoped and self._function.loop_depth > 0:
+            self._block_function(stmt)
+        else:
+            self._scopes.append({})
+            for statement in stmt.statements:
+                self._statement(statement)
+            self._scopes.pop()
+
+    def visit_if_stmt(self, stmt: If):
+        self._line = self._line_of(stmt.condittion)
+        self._emit(f"if {self._condition(stmt.condittion)}:")
+        self._nested(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self._emit("else:")
+            self._nested(stmt.else_branch)
+
+    def visit_while_stmt(self, stmt: While):
+        self._line = self._line_of(stmt.condition)
+        self._emit(f"while {self._condition(stmt.condition)}:")
+        self._function.loop_depth += 1
+        self._nested(stmt.body)
+        self._function.loop_depth -= 1
+
+    def visit_assign_expr(self, expr: Assign):
+        target = self._target(expr.name)
+        value = self._expression(expr.value)
+        if self._needs_check(expr.name, target):
+            return f"({target} := ({value}, {target})[0])"
+        return f"({target} := {value})"
+
+    def visit_variable_expr(self, expr: Variable):
+        name = self._lookup(expr.name)
+        if name.startswith(GLOBAL_PREFIX) and expr.name.line != self._line:
+            # Put the global on a line of its own so that a NameError maps
+            # back to the right Lox line; see _emit.
+            return f"{self._LINE_MARK}{expr.name.line}{self._LINE_MARK}{name}"
+        return name
+
+    def visit_binary_expr(self, expr: Binary):
+        depth = self._depth
+        self._depth += 1
+        left = self._expression(expr.left)
+        right = self._expression(expr.right)
+        self._depth -= 1
+        operator = expr.operator
+        a, b = f"_a{depth}", f"_b{depth}"
+        fallback = f"_binary({self._token(operator)}, {a}, {b})"
+        both_floats = f"(type({a} := {left}) is float) & (type({b} := {right}) is float)"
+
+        if operator.type == TokenType.EQUAL_EQUAL:
+            return f"({left} == {right})"
+        if operator.type == TokenType.BANG_EQUAL:
+            return f"(not {left} == {right})"
+        if operator.type == TokenType.SLASH:
+            return f"({a} / {b} if ({both_floats}) and {b} != 0.0 else {fallback})"
+        return f"({a} {self._fast_binary[operator.type]} {b} if {both_floats} else {fallback})"
+
+    def visit_logical_expr(self, expr: Logical):
+        depth = self._depth
+        self._depth += 1
+        left = self._expression(expr.left)
+        right = self._expression(expr.right)
+        self._depth -= 1
+        keyword = "or" if expr.operator.type == TokenType.OR else "and"
+        if self._is_boolean(expr.left):
+            return f"({left} {keyword} {right})"
+        value = f"_v{depth}"
+        if keyword == "or":
+            return f"({value} if _truthy({value} := {left}) else {right})"
+        return f"({right} if _truthy({value} := {left}) else {value})"
+
+    def visit_unary_expr(self, expr: Unary):
+        depth = self._depth
+        self._depth += 1
+        right = self._expression(expr.right)
+        self._depth -= 1
+        if expr.operator.type == TokenType.BANG:
+            return f"(not {self._condition(expr.right, right)})"
+        value = f"_u{depth}"
+        return f"(-{value} if type({value} := {right}) is float else _unary({self._token(expr.operator)}, {value}))"
+
+    def visit_call_expr(self, expr: Call):
+        callee = self._expression(expr.callee)
+        arguments = "".join(", " + self._expression(argument) for argument in expr.arguments)
+        return f"_call({self._token(expr.paren)}, {callee}{arguments})"
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return self._expression(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal):
+        # repr() writes infinities and NaN as bare names.
+        if type(expr.value) is float and not math.isfinite(expr.value):
+            return f"float('{expr.value}')"
+        return repr(expr.value)
+
+    def _expression(self, expr):
+        return expr.accept(self)
+
+    def _statement(self, stmt):
+        stmt.accept(self)
+
+    def _statements(self, statements):
+        start = len(self._lines)
+        for statement in statements:
+            self._statement(statement)
+        if len(self._lines) == start:
+            self._emit("pass")
+
+    def _nested(self, stmt):
+        self._indent += 1
+        self._statements([stmt])
+        self._indent -= 1
+
+    def _block(self, statements, top_level=False):
+        self._indent += 1
+        if top_level:
+            for statement in statements:
+                self._statement(statement)
+                if isinstance(statement, (Var, Function)):
+                    self._defined_globals.add(statement.name.lexeme)
+            self._emit("pass")
+        else:
+            self._statements(statements)
+        self._indent -= 1
+
+    def _block_function(self, stmt: Block):
+        # Captured block inside a loop: run it as a nested function so
+        # every iteration gets fresh cells. A `return` inside it returns
+        # the value; falling off the end returns _block_function itself,
+        # which no Lox value can be.
+        self._counter += 1
+        name = f"_block{self._counter}"
+        self._emit(f"def {name}():")
+        header = len(self._lines)
+        function = self._function
+        self._function = PythonFunction(function)
+        self._scopes.append({})
+        self._indent += 1
+        self._statements(stmt.statements)
+        self._emit(f"return {name}")
+        self._indent -= 1
+        self._scopes.pop()
+        self._indent += 1
+        self._insert_declarations(header)
+        self._indent -= 1
+        self._function = function
+        if function.enclosing is None:
+            # No `return` at top level, so there is nothing to propagate.
+            self._emit(f"{name}()")
+            return
+        self._emit(f"_c = {name}()")
+        self._emit(f"if _c is not {name}:")
+        self._indent += 1
+        self._emit("return _c")
+        self._indent -= 1
+
+    def _insert_declarations(self, index):
+        declarations = []
+        if self._function.globals:
+            declarations.append("global " + ", ".join(sorted(self._function.globals)))
+        if self._function.nonlocals:
+            declarations.append("nonlocal " + ", ".join(sorted(self._function.nonlocals)))
+        for offset, declaration in enumerate(declarations):
+            self._lines.insert(index + offset, (self._indent, declaration, self._line))
+
+    def _declare(self, name):
+        if not self._scopes:
+            self._function.globals.add(GLOBAL_PREFIX + name.lexeme)
+            return GLOBAL_PREFIX + name.lexeme
+        self._counter += 1
+        python_name = f"l{self._counter}_{name.lexeme}"
+        self._scopes[-1][name.lexeme] = (python_name, self._function)
+        return python_name
+
+    def _lookup(self, name):
+        for scope in reversed(self._scopes):
+            if name.lexeme in scope:
+                return scope[name.lexeme][0]
+        return GLOBAL_PREFIX + name.lexeme
+
+    def _target(self, name):
+        for scope in reversed(self._scopes):
+            if name.lexeme in scope:
+                python_name, owner = scope[name.lexeme]
+                if owner is not self._function:
+                    self._function.nonlocals.add(python_name)
+                return python_name
+        self._function.globals.add(GLOBAL_PREFIX + name.lexeme)
+        return GLOBAL_PREFIX + name.lexeme
+
+    def _needs_check(self, name, target):
+        # Assigning an undefined global is a runtime error; reading the
+        # old value first raises the NameError that reports it.
+        return target.startswith(GLOBAL_PREFIX) and name.lexeme not in self._defined_globals
+
+    def _condition(self, expr, code=None):
+        code = code if code is not None else self._expression(expr)
+        if self._is_boolean(expr):
+            return self._wrap(code)
+        return f"_truthy({code})"
+
+    def _wrap(self, code):
+        # Code spanning several Lox lines must be parenthesized so that
+        # Python accepts the line breaks _emit puts in it.
+        if self._LINE_MARK in code:
+            return f"({code})"
+        return code
+
+    def _is_boolean(self, expr):
+        while isinstance(expr, Grouping):
+            expr = expr.expression
+        if isinstance(expr, Literal):
+            return isinstance(expr.value, bool)
+        if isinstance(expr, Binary):
+            return expr.operator.type in self._comparisons
+        return isinstance(expr, Unary) and expr.operator.type == TokenType.BANG
+
+    def _token(self, token):
+        self._tokens.append((token.type.value, token.lexeme, token.line))
+        return f"_T{self._unit}_{len(self._tokens) - 1}"
+
+    def _line_of(self, expr):
+        for attribute in ("operator", "paren", "name"):
+            token = getattr(expr, attribute, None)
+            if token is not None:
+                return token.line
+        for attribute in ("left", "callee", "expression", "right", "value"):
+            child = getattr(expr, attribute, None)
+            if child is not None and not isinstance(child, (float, str, bool)):
+                return self._line_of(child)
+        return self._line
+
+    def _emit(self, text):
+        if self._LINE_MARK not in text:
+            self._lines.append((self._indent, text, self._line))
+            return
+        # Text carrying line marks is split into one physical line per Lox
+        # line, each recorded with its own Lox line.
+        parts = text.split(self._LINE_MARK)
+        self._lines.append((self._indent, parts[0], self._line))
+        for i in range(1, len(parts), 2):
+            self._lines.append((self._indent + 1, parts[i + 1], int(parts[i])))
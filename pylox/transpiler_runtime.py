@@ -0,0 +1,76 @@
+# Support code for Python modules generated by the Transpiler. A module
+# imports the name-independent helpers directly; bind() fills in the
+# helpers that need an interpreter (printing, calling natives, operator
+# fallbacks) and the natives themselves, as module globals.
+from .interpreter import Interpreter
+from .lox_callable import LoxCallable
+from .native_error import NativeError
+from .runtime_exception import RuntimeException
+from .token import Token
+from .token_type import TokenType
+from .transpiled_function import TranspiledFunction
+
+GLOBAL_PREFIX = "g_"
+
+def _token(type, lexeme, line):
+    return Token(TokenType(type), lexeme, None, line)
+
+def _function(function, name, arity):
+    return TranspiledFunction(function, name, arity)
+
+def bind(namespace, interpreter):
+    stringify = interpreter._stringify
+
+    def call(token, callee, *arguments):
+        if type(callee) is TranspiledFunction and len(arguments) == callee.arity_count:
+            return callee.function(*arguments)
+        if not isinstance(callee, LoxCallable):
+            raise RuntimeException(token, "Can only call functions and classes.")
+        if len(arguments) != callee.arity():
+            raise RuntimeException(token, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+        try:
+            return callee.call(interpreter, list(arguments))
+        except NativeError as error:
+            raise RuntimeException(token, error.message)
+
+    def print_value(value):
+        interpreter.output.write_line(stringify(value))
+
+    namespace["_call"] = call
+    namespace["_print"] = print_value
+    namespace["_truthy"] = interpreter._is_truthy
+    namespace["_binary"] = interpreter._binary
+    namespace["_unary"] = interpreter._unary
+    for name, value in interpreter.globals._values.items():
+        namespace[GLOBAL_PREFIX + name] = value
+
+def execute(namespace, reporter):
+    try:
+        namespace["_program"]()
+    except RuntimeException as err:
+        reporter.runtime_error(err)
+    except NameError as err:
+        # The only names generated code can fail to find are Lox globals.
+        name = err.name[len(GLOBAL_PREFIX):]
+        line = _lox_line(namespace, err.__traceback__)
+        reporter.runtime_error(RuntimeException(_token(TokenType.IDENTIFIER.value, name, line),
+                                                f"Undefined variable '{name}'."))
+
+def run(namespace, interpreter=None):
+    # Entry point of a generated module run on its own.
+    interpreter = interpreter or Interpreter()
+    bind(namespace, interpreter)
+    try:
+        execute(namespace, interpreter.reporter)
+    finally:
+        interpreter.output.flush()
+    return 70 if interpreter.reporter.had_runtime_error else 0
+
+def _lox_line(namespace, traceback):
+    line = 0
+    while traceback is not None:
+        frame = traceback.tb_frame
+        if frame.f_globals is namespace:
+            line = namespace["_LINES"][frame.f_code.co_filename][traceback.tb_lineno]
+        traceback = traceback.tb_next
+    return line
@@ -0,0 +1,26 @@
+from array import array
+from .stringify import stringify
+
+# A fixed-length vector of Lox numbers, stored unboxed in an array('d')
+# so the vector natives can work on it in bulk.
+class Vector:
+    __slots__ = ("values",)
+
+    # Vectors longer than this print as their ends and their length.
+    SUMMARY_THRESHOLD = 6
+
+    def __init__(self, values):
+        self.values = values if type(values) is array else array('d', values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __str__(self):
+        values = self.values
+        if len(values) <= self.SUMMARY_THRESHOLD:
+            return "<vector [" + ", ".join(map(stringify, values)) + "]>"
+        shown = self.SUMMARY_THRESHOLD // 2
+        return ("<vector [" + ", ".join(map(stringify, values[:shown])) + ", ..., "
+                + ", ".join(map(stringify, values[-shown:])) + f"] length {len(values)}>")
+
+    __repr__ = __str__
@@ -0,0 +1,149 @@
+import math
+import operator
+from array import array
+from itertools import repeat
+from .builtin import Builtin
+from .lox_callable import LoxCallable
+from .native_error import NativeError
+from .vector import Vector
+
+# Natives creating and working on Vectors. Lox has no methods, so every
+# operation is a global function taking the vector first. Arithmetic,
+# reductions, slicing and sorting run over the whole array in C;
+# vectorMap and vectorFilter call back into Lox once per element.
+
+def _vector(value):
+    if type(value) is not Vector:
+        raise NativeError("Expected a vector.")
+    return value.values
+
+def _number(value):
+    if not isinstance(value, (int, float)):
+        raise NativeError("Expected a number.")
+    return float(value)
+
+def _index(value, limit):
+    if not isinstance(value, (int, float)) or not float(value).is_integer():
+        raise NativeError("Vector index must be a whole number.")
+    index = int(value)
+    if not 0 <= index < limit:
+        raise NativeError("Vector index out of range.")
+    return index
+
+def _function(value):
+    if not isinstance(value, LoxCallable) or value.arity() != 1:
+        raise NativeError("Expected a function of one argument.")
+    return value
+
+
+def vector(interpreter, size):
+    size = _number(size)
+    if size < 0 or not size.is_integer():
+        raise NativeError("Vector size must be a non-negative whole number.")
+    return Vector(array('d', bytes(8 * int(size))))
+
+def vector_range(interpreter, start, stop):
+    start = _number(start)
+    stop = _number(stop)
+    if not math.isfinite(start) or not math.isfinite(stop):
+        raise NativeError("Vector range bounds must be finite.")
+    count = max(0, math.ceil(stop - start))
+    return Vector(array('d', (start + i for i in range(count))))
+
+def vector_length(interpreter, vector):
+    return float(len(_vector(vector)))
+
+def vector_get(interpreter, vector, index):
+    values = _vector(vector)
+    return values[_index(index, len(values))]
+
+def vector_set(interpreter, vector, index, value):
+    values = _vector(vector)
+    values[_index(index, len(values))] = _number(value)
+    return None
+
+
+# Elementwise arithmetic of two vectors of the same length, or of a vector
+# and a number. Scalar / gives nil for a zero divisor, but a Vector holds
+# only numbers, so vectorDiv by a zero element is a "Division by zero."
+# error instead.
+def _elementwise(function):
+    def apply(interpreter, left, right):
+        values = _vector(left)
+        if type(right) is Vector:
+            others = right.values
+            if len(others) != len(values):
+                raise NativeError("Vectors must have the same length.")
+        else:
+            others = repeat(_number(right), len(values))
+        try:
+            return Vector(array('d', map(function, values, others)))
+        except ZeroDivisionError:
+            raise NativeError("Division by zero.")
+    return apply
+
+def vector_dot(interpreter, left, right):
+    values = _vector(left)
+    others = _vector(right)
+    if len(others) != len(values):
+        raise NativeError("Vectors must have the same length.")
+    return sum(map(operator.mul, values, others))
+
+def vector_sum(interpreter, vector):
+    return float(sum(_vector(vector)))
+
+def _reduction(function):
+    def apply(interpreter, vector):
+        values = _vector(vector)
+        if not values:
+            return None
+        return function(values)
+    return apply
+
+def vector_slice(interpreter, vector, start, end):
+    values = _vector(vector)
+    end = _index(end, len(values) + 1)
+    start = _index(start, end + 1)
+    return Vector(values[start:end])
+
+def vector_sort(interpreter, vector):
+    return Vector(array('d', sorted(_vector(vector))))
+
+def vector_map(interpreter, vector, function):
+    values = _vector(vector)
+    function = _function(function)
+    results = array('d', bytes(8 * len(values)))
+    for i, value in enumerate(values):
+        result = function.call(interpreter, [value])
+        if not isinstance(result, (int, float)):
+            raise NativeError("Map function must return a number.")
+        results[i] = result
+    return Vector(results)
+
+def vector_filter(interpreter, vector, function):
+    values = _vector(vector)
+    function = _function(function)
+    is_truthy = interpreter._is_truthy
+    return Vector(array('d', [value for value in values
+                              if is_truthy(function.call(interpreter, [value]))]))
+
+
+VECTOR_NATIVES = {
+    "Vector": Builtin(vector, 1),
+    "vectorRange": Builtin(vector_range, 2),
+    "vectorLength": Builtin(vector_length, 1),
+    "vectorGet": Builtin(vector_get, 2),
+    "vectorSet": Builtin(vector_set, 3),
+    "vectorAdd": Builtin(_elementwise(operator.add), 2),
+    "vectorSub": Builtin(_elementwise(operator.sub), 2),
+    "vectorMul": Builtin(_elementwise(operator.mul), 2),
+    "vectorDiv": Builtin(_elementwise(operator.truediv), 2),
+    "vectorDot": Builtin(vector_dot, 2),
+    "vectorSum": Builtin(vector_sum, 1),
+    "vectorMin": Builtin(_reduction(min), 1),
+    "vectorMax": Builtin(_reduction(max), 1),
+    "vectorSlice": Builtin(vector_slice, 3),
+    "vectorSort": Builtin(vector_sort, 1),
+    "vectorMap": Builtin(vector_map, 2),
+    "vectorFilter": Builtin(vector_filter, 2),
+}
@@ -0,0 +1,3 @@
+from .compiler import Compiler
+from .disassembler import disassemble
+from .vm import VM
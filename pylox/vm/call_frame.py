@@ -0,0 +1,6 @@
+class CallFrame:
+    def __init__(self, closure, base):
+        self.closure = closure
+        self.ip = 0
+        # Stack index of slot 0, which holds the closure being called.
+        self.base = base
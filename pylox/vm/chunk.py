@@ -0,0 +1,34 @@
+from array import array
+from bisect import bisect_right
+
+# A compiled function body: a flat array of code units (opcodes and their
+# operands), the constant pool they index into, and a run-length encoded
+# table mapping code offsets back to the tokens they were compiled from.
+# A token's line is only looked up when get_line asks for it, which
+# outside of the disassembler means a runtime error.
+class Chunk:
+    def __init__(self):
+        self.code = array('I')
+        self.constants = []
+        self._constant_index = {}
+        self._token_starts = array('I')
+        self._tokens = []
+
+    def write(self, unit, token):
+        if not self._tokens or self._tokens[-1] is not token:
+            self._token_starts.append(len(self.code))
+            self._tokens.append(token)
+        self.code.append(unit)
+
+    def add_constant(self, value):
+        # Keyed on the type too, so that 1.0 and True get separate entries.
+        key = (type(value), value)
+        if key not in self._constant_index:
+            self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return self._constant_index[key]
+
+    # Code compiled before any token was seen is on line 1.
+    def get_line(self, offset):
+        token = self._tokens[bisect_right(self._token_starts, offset) - 1]
+        return 1 if token is None else token.line
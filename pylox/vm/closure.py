@@ -0,0 +1,15 @@
+from ..lox_callable import LoxCallable
+
+class VMClosure(LoxCallable):
+    def __init__(self, function, upvalues):
+        self.function = function
+        self.upvalues = upvalues
+
+    def call(self, interpreter, arguments):
+        return interpreter.call_closure(self, arguments)
+
+    def arity(self):
+        return self.function.arity
+
+    def __repr__(self) -> str:
+        return repr(self.function)
@@ -0,0 +1,267 @@
+from ..visitor import Visitor
+from ..expr import Assign, Binary, Call, Grouping, Literal, Logical, Unary, Variable
+from ..stmt import Block, Expression, Function, If, Print, Return, Var, While
+from ..token_type import TokenType
+from .function import VMFunction
+from .op_code import OpCode
+
+# Per-function compiler state: the function being built, its locals (as
+# [name, scope depth, captured]) and the upvalues it captures (as
+# (index, is_local) pairs), linked to the state of the enclosing function.
+class FunctionState:
+    def __init__(self, enclosing, function):
+        self.enclosing = enclosing
+        self.function = function
+        # Slot 0 holds the closure being called.
+        self.locals = [["", 0, False]]
+        self.upvalues = []
+        self.scope_depth = 0
+
+# Compiles a resolved program into bytecode for the VM. Locals live in
+# stack slots, variables captured by closures become upvalues and
+# everything else is a global looked up by name.
+class Compiler(Visitor):
+    _binary_ops = {
+        TokenType.PLUS: OpCode.ADD,
+        TokenType.MINUS: OpCode.SUBTRACT,
+        TokenType.STAR: OpCode.MULTIPLY,
+        TokenType.SLASH: OpCode.DIVIDE,
+        TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+        TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+        TokenType.GREATER: OpCode.GREATER,
+        TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+        TokenType.LESS: OpCode.LESS,
+        TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    }
+
+    def __init__(self):
+        self._state = None
+        self._token = None
+
+    def compile(self, statements):
+        self._state = FunctionState(None, VMFunction(None, 0))
+        for statement in statements:
+            self._compile(statement)
+        self._emit(OpCode.NIL)
+        self._emit(OpCode.RETURN)
+        return self._state.function
+
+    def visit_expression_stmt(self, stmt: Expression):
+        self._compile(stmt.expression)
+        self._emit(OpCode.POP)
+
+    def visit_print_stmt(self, stmt: Print):
+        self._compile(stmt.expression)
+        self._emit(OpCode.PRINT)
+
+    def visit_var_stmt(self, stmt: Var):
+        self._token = stmt.name
+        if stmt.initializer is not None:
+            self._compile(stmt.initializer)
+        else:
+            self._emit(OpCode.NIL)
+        self._define_variable(stmt.name)
+
+    def visit_function_stmt(self, stmt: Function):
+        self._token = stmt.name
+        if self._state.scope_depth > 0:
+            # Declare the local first so the body can refer to itself.
+            self._add_local(stmt.name)
+        self._function(stmt)
+        if self._state.scope_depth == 0:
+            self._emit(OpCode.DEFINE_GLOBAL, self._identifier_constant(stmt.name))
+
+    def visit_return_stmt(self, stmt: Return):
+        self._token = stmt.keyword
+        if stmt.value is None:
+            self._emit(OpCode.NIL)
+        else:
+            self._compile(stmt.value)
+        self._emit(OpCode.RETURN)
+
+    def visit_block_stmt(self, stmt: Block):
+        self._begin_scope()
+        for statement in stmt.statements:
+            self._compile(statement)
+        self._end_scope()
+
+    def visit_if_stmt(self, stmt: If):
+        self._compile(stmt.condittion)
+        then_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        self._emit(OpCode.POP)
+        self._compile(stmt.then_branch)
+        else_jump = self._emit_jump(OpCode.JUMP)
+        self._patch_jump(then_jump)
+        self._emit(OpCode.POP)
+        if stmt.else_branch is not None:
+            self._compile(stmt.else_branch)
+        self._patch_jump(else_jump)
+
+    def visit_while_stmt(self, stmt: While):
+        loop_start = len(self._chunk().code)
+        self._compile(stmt.condition)
+        exit_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        self._emit(OpCode.POP)
+        self._compile(stmt.body)
+        self._emit_loop(loop_start)
+        self._patch_jump(exit_jump)
+        self._emit(OpCode.POP)
+
+    def visit_assign_expr(self, expr: Assign):
+        self._compile(expr.value)
+        self._token = expr.name
+        self._named_variable(expr.name, OpCode.SET_LOCAL, OpCode.SET_UPVALUE, OpCode.SET_GLOBAL)
+
+    def visit_variable_expr(self, expr: Variable):
+        self._token = expr.name
+        self._named_variable(expr.name, OpCode.GET_LOCAL, OpCode.GET_UPVALUE, OpCode.GET_GLOBAL)
+
+    def visit_binary_expr(self, expr: Binary):
+        self._compile(expr.left)
+        self._compile(expr.right)
+        self._token = expr.operator
+        self._emit(self._binary_ops[expr.operator.type])
+
+    def visit_logical_expr(self, expr: Logical):
+        self._compile(expr.left)
+        if expr.operator.type == TokenType.OR:
+            else_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+            end_jump = self._emit_jump(OpCode.JUMP)
+            self._patch_jump(else_jump)
+            self._emit(OpCode.POP)
+            self._compile(expr.right)
+            self._patch_jump(end_jump)
+        else:
+            end_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+            self._emit(OpCode.POP)
+            self._compile(expr.right)
+            self._patch_jump(end_jump)
+
+    def visit_unary_expr(self, expr: Unary):
+        self._compile(expr.right)
+        self._token = expr.operator
+        if expr.operator.type == TokenType.BANG:
+            self._emit(OpCode.NOT)
+        else:
+            self._emit(OpCode.NEGATE)
+
+    def visit_call_expr(self, expr: Call):
+        self._compile(expr.callee)
+        for argument in expr.arguments:
+            self._compile(argument)
+        self._token = expr.paren
+        self._emit(OpCode.CALL, len(expr.arguments))
+
+    def visit_grouping_expr(self, expr: Grouping):
+        self._compile(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal):
+        if expr.value is None:
+            self._emit(OpCode.NIL)
+        elif expr.value is True:
+            self._emit(OpCode.TRUE)
+        elif expr.value is False:
+            self._emit(OpCode.FALSE)
+        else:
+            self._emit(OpCode.CONSTANT, self._chunk().add_constant(expr.value))
+
+    def _compile(self, node):
+        node.accept(self)
+
+    def _function(self, stmt: Function):
+        self._state = FunctionState(self._state, VMFunction(stmt.name.lexeme, len(stmt.params)))
+        self._begin_scope()
+        for param in stmt.params:
+            self._add_local(param)
+        for statement in stmt.body:
+            self._compile(statement)
+        self._emit(OpCode.NIL)
+        self._emit(OpCode.RETURN)
+
+        state = self._state
+        self._state = state.enclosing
+        state.function.upvalue_count = len(state.upvalues)
+        self._token = stmt.name
+        self._emit(OpCode.CLOSURE, self._chunk().add_constant(state.function))
+        for index, is_local in state.upvalues:
+            self._emit(1 if is_local else 0)
+            self._emit(index)
+
+    def _define_variable(self, name):
+        if self._state.scope_depth > 0:
+            self._add_local(name)
+            return
+        self._emit(OpCode.DEFINE_GLOBAL, self._identifier_constant(name))
+
+    def _named_variable(self, name, local_op, upvalue_op, global_op):
+        slot = self._resolve_local(self._state, name)
+        if slot is not None:
+            self._emit(local_op, slot)
+            return
+        index = self._resolve_upvalue(self._state, name)
+        if index is not None:
+            self._emit(upvalue_op, index)
+            return
+        self._emit(global_op, self._identifier_constant(name))
+
+    def _resolve_local(self, state, name):
+        for i in range(len(state.locals) - 1, -1, -1):
+            if state.locals[i][0] == name.lexeme:
+                return i
+        return None
+
+    def _resolve_upvalue(self, state, name):
+        if state.enclosing is None:
+            return None
+        local = self._resolve_local(state.enclosing, name)
+        if local is not None:
+            state.enclosing.locals[local][2] = True
+            return self._add_upvalue(state, local, True)
+        upvalue = self._resolve_upvalue(state.enclosing, name)
+        if upvalue is not None:
+            return self._add_upvalue(state, upvalue, False)
+        return None
+
+    def _add_upvalue(self, state, index, is_local):
+        if (index, is_local) in state.upvalues:
+            return state.upvalues.index((index, is_local))
+        state.upvalues.append((index, is_local))
+        return len(state.upvalues) - 1
+
+    def _add_local(self, name):
+        self._state.locals.append([name.lexeme, self._state.scope_depth, False])
+
+    def _identifier_constant(self, name):
+        return self._chunk().add_constant(name.lexeme)
+
+    def _begin_scope(self):
+        self._state.scope_depth += 1
+
+    def _end_scope(self):
+        state = self._state
+        state.scope_depth -= 1
+        while state.locals and state.locals[-1][1] > state.scope_depth:
+            if state.locals[-1][2]:
+                self._emit(OpCode.CLOSE_UPVALUE)
+            else:
+                self._emit(OpCode.POP)
+            state.locals.pop()
+
+    def _chunk(self):
+        return self._state.function.chunk
+
+    def _emit(self, *units):
+        chunk = self._chunk()
+        for unit in units:
+            chunk.write(unit, self._token)
+
+    def _emit_jump(self, op):
+        self._emit(op, 0)
+        return len(self._chunk().code) - 1
+
+    def _patch_jump(self, offset):
+        self._chunk().code[offset] = len(self._chunk().code) - offset - 1
+
+    def _emit_loop(self, loop_start):
+        self._emit(OpCode.LOOP)
+        self._emit(len(self._chunk().code) - loop_start + 1)
@@ -0,0 +1,55 @@
+from .function import VMFunction
+from .op_code import OpCode
+
+_CONSTANT_OPS = (OpCode.CONSTANT, OpCode.GET_GLOBAL, OpCode.DEFINE_GLOBAL, OpCode.SET_GLOBAL)
+_SLOT_OPS = (OpCode.GET_LOCAL, OpCode.SET_LOCAL, OpCode.GET_UPVALUE, OpCode.SET_UPVALUE, OpCode.CALL)
+_JUMP_OPS = (OpCode.JUMP, OpCode.JUMP_IF_FALSE, OpCode.LOOP)
+
+def disassemble(function: VMFunction):
+    lines = []
+    _disassemble_function(function, lines)
+    return "\n".join(lines)
+
+def _disassemble_function(function, lines):
+    chunk = function.chunk
+    lines.append(f"== {function.name or '<script>'} ==")
+    offset = 0
+    nested = []
+    while offset < len(chunk.code):
+        offset = _disassemble_instruction(chunk, offset, lines, nested)
+    for function in nested:
+        _disassemble_function(function, lines)
+
+def _disassemble_instruction(chunk, offset, lines, nested):
+    line = chunk.get_line(offset)
+    if offset > 0 and line == chunk.get_line(offset - 1):
+        prefix = f"{offset:04d}    | "
+    else:
+        prefix = f"{offset:04d} {line:4d} "
+
+    op = OpCode(chunk.code[offset])
+    if op in _CONSTANT_OPS:
+        index = chunk.code[offset + 1]
+        lines.append(f"{prefix}{str(op):<16} {index:4d} '{chunk.constants[index]}'")
+        return offset + 2
+    if op in _SLOT_OPS:
+        lines.append(f"{prefix}{str(op):<16} {chunk.code[offset + 1]:4d}")
+        return offset + 2
+    if op in _JUMP_OPS:
+        jump = chunk.code[offset + 1]
+        target = offset + 2 - jump if op == OpCode.LOOP else offset + 2 + jump
+        lines.append(f"{prefix}{str(op):<16} {offset:4d} -> {target}")
+        return offset + 2
+    if op == OpCode.CLOSURE:
+        index = chunk.code[offset + 1]
+        function = chunk.constants[index]
+        nested.append(function)
+        lines.append(f"{prefix}{str(op):<16} {index:4d} {function!r}")
+        offset += 2
+        for _ in range(function.upvalue_count):
+            kind = "local" if chunk.code[offset] else "upvalue"
+            lines.append(f"{offset:04d}    |                     {kind} {chunk.code[offset + 1]}")
+            offset += 2
+        return offset
+    lines.append(f"{prefix}{op}")
+    return offset + 1
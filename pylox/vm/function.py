@@ -0,0 +1,13 @@
+from .chunk import Chunk
+
+class VMFunction:
+    def __init__(self, name, arity):
+        self.name = name
+        self.arity = arity
+        self.upvalue_count = 0
+        self.chunk = Chunk()
+
+    def __repr__(self) -> str:
+        if self.name is None:
+            return "<script>"
+        return f"<fn {self.name}>"
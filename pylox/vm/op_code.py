@@ -0,0 +1,39 @@
+from enum import IntEnum, unique
+
+@unique
+class OpCode(IntEnum):
+    CONSTANT = 0
+    NIL = 1
+    TRUE = 2
+    FALSE = 3
+    POP = 4
+    GET_LOCAL = 5
+    SET_LOCAL = 6
+    GET_GLOBAL = 7
+    DEFINE_GLOBAL = 8
+    SET_GLOBAL = 9
+    GET_UPVALUE = 10
+    SET_UPVALUE = 11
+    EQUAL = 12
+    NOT_EQUAL = 13
+    GREATER = 14
+    GREATER_EQUAL = 15
+    LESS = 16
+    LESS_EQUAL = 17
+    ADD = 18
+    SUBTRACT = 19
+    MULTIPLY = 20
+    DIVIDE = 21
+    NOT = 22
+    NEGATE = 23
+    PRINT = 24
+    JUMP = 25
+    JUMP_IF_FALSE = 26
+    LOOP = 27
+    CALL = 28
+    CLOSURE = 29
+    CLOSE_UPVALUE = 30
+    RETURN = 31
+
+    def __str__(self):
+        return "OP_" + self.name
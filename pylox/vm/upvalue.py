@@ -0,0 +1,12 @@
+# A variable captured by a closure. While the variable is still on the VM
+# stack, cell is the stack itself and index its slot; closing the upvalue
+# moves the value into a private one-element cell, so reads and writes
+# are always cell[index].
+class Upvalue:
+    def __init__(self, stack, index):
+        self.cell = stack
+        self.index = index
+
+    def close(self):
+        self.cell = [self.cell[self.index]]
+        self.index = 0
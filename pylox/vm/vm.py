@@ -0,0 +1,309 @@
+from ..interpreter import Interpreter
+from ..lox_callable import LoxCallable
+from ..runtime_exception import RuntimeException
+from ..rope import STRINGS, concat
+from ..native_error import NativeError
+from ..token import Token
+from ..token_type import TokenType
+from .call_frame import CallFrame
+from .closure import VMClosure
+from .compiler import Compiler
+from .disassembler import disassemble
+from .op_code import OpCode
+from .upvalue import Upvalue
+
+CONSTANT = OpCode.CONSTANT.value
+NIL = OpCode.NIL.value
+TRUE = OpCode.TRUE.value
+FALSE = OpCode.FALSE.value
+POP = OpCode.POP.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+SET_LOCAL = OpCode.SET_LOCAL.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+SET_GLOBAL = OpCode.SET_GLOBAL.value
+GET_UPVALUE = OpCode.GET_UPVALUE.value
+SET_UPVALUE = OpCode.SET_UPVALUE.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+GREATER = OpCode.GREATER.value
+GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+LESS = OpCode.LESS.value
+LESS_EQUAL = OpCode.LESS_EQUAL.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+NOT = OpCode.NOT.value
+NEGATE = OpCode.NEGATE.value
+PRINT = OpCode.PRINT.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+LOOP = OpCode.LOOP.value
+CALL = OpCode.CALL.value
+CLOSURE = OpCode.CLOSURE.value
+CLOSE_UPVALUE = OpCode.CLOSE_UPVALUE.value
+RETURN = OpCode.RETURN.value
+
+# Stack-based virtual machine executing bytecode produced by the Compiler.
+# Lox calls push a CallFrame instead of recursing in Python; the whole
+# program runs in the flat dispatch loop in _run. Shares globals, natives
+# and value semantics with the tree-walking Interpreter.
+class VM(Interpreter):
+    FRAMES_MAX = 10000
+
+    def __init__(self, reporter=None):
+        super().__init__(reporter)
+        self.show_disassembly = False
+        self._reset_stack()
+
+    def interpret(self, statements):
+        function = Compiler().compile(statements)
+        if self.show_disassembly:
+            self.output.write_line(disassemble(function))
+        try:
+            self.call_closure(VMClosure(function, []), [])
+        except RuntimeException as err:
+            self._reset_stack()
+            self.reporter.runtime_error(err)
+
+    def call_closure(self, closure, arguments):
+        self._stack.append(closure)
+        self._stack.extend(arguments)
+        self._push_frame(closure, len(arguments))
+        return self._run(len(self._frames) - 1)
+
+    def _reset_stack(self):
+        self._stack = []
+        self._frames = []
+        self._open_upvalues = {}
+
+    def _push_frame(self, closure, arg_count):
+        if len(self._frames) == self.FRAMES_MAX:
+            raise self._error("Stack overflow.")
+        self._frames.append(CallFrame(closure, len(self._stack) - arg_count - 1))
+
+    def _capture_upvalue(self, index):
+        upvalue = self._open_upvalues.get(index)
+        if upvalue is None:
+            upvalue = Upvalue(self._stack, index)
+            self._open_upvalues[index] = upvalue
+        return upvalue
+
+    def _close_upvalues(self, last):
+        for index in [index for index in self._open_upvalues if index >= last]:
+            self._open_upvalues.pop(index).close()
+
+    def _error(self, message):
+        frame = self._frames[-1]
+        line = frame.closure.function.chunk.get_line(frame.ip - 1)
+        return RuntimeException(Token(TokenType.EOF, "", None, line), message)
+
+    def _run(self, exit_depth):
+        stack = self._stack
+        push = stack.append
+        pop = stack.pop
+        frames = self._frames
+        global_values = self.globals._values
+        is_truthy = self._is_truthy
+        is_equal = self._is_equal
+        stringify = self._stringify
+        write_line = self.output.write_line
+
+        frame = frames[-1]
+        closure = frame.closure
+        code = closure.function.chunk.code
+        constants = closure.function.chunk.constants
+        base = frame.base
+        ip = frame.ip
+
+        while True:
+            op = code[ip]
+            ip += 1
+
+            if op == GET_LOCAL:
+                push(stack[base + code[ip]])
+                ip += 1
+            elif op == CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == SET_LOCAL:
+                stack[base + code[ip]] = stack[-1]
+                ip += 1
+            elif op == POP:
+                pop()
+            elif op == JUMP_IF_FALSE:
+                # Inlined Interpreter._is_truthy.
+                condition = stack[-1]
+                if condition is None or condition == False:
+                    ip += code[ip] + 1
+                else:
+                    ip += 1
+            elif op == JUMP:
+                ip += code[ip] + 1
+            elif op == LOOP:
+                ip -= code[ip] - 1
+            elif op == GET_GLOBAL:
+                name = constants[code[ip]]
+                ip += 1
+                try:
+                    push(global_values[name])
+                except KeyError:
+                    frame.ip = ip
+                    raise self._error(f"Undefined variable '{name}'.")
+            elif op == GET_UPVALUE:
+                upvalue = closure.upvalues[code[ip]]
+                ip += 1
+                push(upvalue.cell[upvalue.index])
+            elif op == SET_UPVALUE:
+                upvalue = closure.upvalues[code[ip]]
+                ip += 1
+                upvalue.cell[upvalue.index] = stack[-1]
+            elif op == ADD:
+                right = pop()
+                left = stack[-1]
+                if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+                    stack[-1] = left + right
+                elif isinstance(left, STRINGS) and isinstance(right, STRINGS):
+                    stack[-1] = concat(left, right)
+                else:
+                    frame.ip = ip
+                    raise self._error("Operands must be two numbers or two strings.")
+            elif op == LESS:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = float(left) < float(right)
+            elif op == SUBTRACT:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = float(left) - float(right)
+            elif op == GREATER:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = float(left) > float(right)
+            elif op == MULTIPLY:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = float(left) * float(right)
+            elif op == LESS_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = float(left) <= float(right)
+            elif op == GREATER_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = float(left) >= float(right)
+            elif op == DIVIDE:
+                right = pop()
+                left = stack[-1]
+                if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = None if is_equal(right, 0) else float(left) / float(right)
+            elif op == EQUAL:
+                right = pop()
+                stack[-1] = is_equal(stack[-1], right)
+            elif op == NOT_EQUAL:
+                right = pop()
+                stack[-1] = not is_equal(stack[-1], right)
+            elif op == CALL:
+                arg_count = code[ip]
+                ip += 1
+                frame.ip = ip
+                callee = stack[-1 - arg_count]
+                if isinstance(callee, VMClosure):
+                    if arg_count != callee.function.arity:
+                        raise self._error(f"Expected {callee.function.arity} arguments but got {arg_count}.")
+                    self._push_frame(callee, arg_count)
+                    frame = frames[-1]
+                    closure = callee
+                    code = closure.function.chunk.code
+                    constants = closure.function.chunk.constants
+                    base = frame.base
+                    ip = 0
+                elif isinstance(callee, LoxCallable):
+                    if arg_count != callee.arity():
+                        raise self._error(f"Expected {callee.arity()} arguments but got {arg_count}.")
+                    arguments = stack[len(stack) - arg_count:]
+                    try:
+                        result = callee.call(self, arguments)
+                    except NativeError as error:
+                        raise self._error(error.message)
+                    del stack[len(stack) - arg_count - 1:]
+                    push(result)
+                else:
+                    raise self._error("Can only call functions and classes.")
+            elif op == RETURN:
+                result = pop()
+                if self._open_upvalues:
+                    self._close_upvalues(base)
+                frames.pop()
+                del stack[base:]
+                if len(frames) == exit_depth:
+                    return result
+                push(result)
+                frame = frames[-1]
+                closure = frame.closure
+                code = closure.function.chunk.code
+                constants = closure.function.chunk.constants
+                base = frame.base
+                ip = frame.ip
+            elif op == NIL:
+                push(None)
+            elif op == TRUE:
+                push(True)
+            elif op == FALSE:
+                push(False)
+            elif op == NOT:
+                stack[-1] = not is_truthy(stack[-1])
+            elif op == NEGATE:
+                if not isinstance(stack[-1], (int, float)):
+                    frame.ip = ip
+                    raise self._error("Operand must be a number.")
+                stack[-1] = -float(stack[-1])
+            elif op == PRINT:
+                write_line(stringify(pop()))
+            elif op == DEFINE_GLOBAL:
+                global_values[constants[code[ip]]] = pop()
+                ip += 1
+            elif op == SET_GLOBAL:
+                name = constants[code[ip]]
+                ip += 1
+                if name not in global_values:
+                    frame.ip = ip
+                    raise self._error(f"Undefined variable '{name}'.")
+                global_values[name] = stack[-1]
+            elif op == CLOSURE:
+                function = constants[code[ip]]
+                ip += 1
+                upvalues = []
+                for _ in range(function.upvalue_count):
+                    is_local = code[ip]
+                    index = code[ip + 1]
+                    ip += 2
+                    if is_local:
+                        upvalues.append(self._capture_upvalue(base + index))
+                    else:
+                        upvalues.append(closure.upvalues[index])
+                push(VMClosure(function, upvalues))
+            elif op == CLOSE_UPVALUE:
+                self._close_upvalues(len(stack) - 1)
+                pop()
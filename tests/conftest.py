@@ -0,0 +1,32 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pylox.session import Session
+
+ENGINES = list(Session.engines)
+
+
+# Runs Lox source in a fresh Session and returns what it printed and the
+# errors it reported, each as the command line shows it.
+def run_lox(source, engine="tree", **options):
+    output = io.StringIO()
+    result = Session(engine, output=output, **options).run(source)
+    return output.getvalue(), [str(error) for error in result.errors]
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request):
+    return request.param
+
+
+# run_lox on the engine under test.
+@pytest.fixture
+def run(engine):
+    def run(source, **options):
+        return run_lox(source, engine, **options)
+    return run
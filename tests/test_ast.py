@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+from pylox.error_reporter import ErrorReporter
+from pylox.expr import Expr, Literal
+from pylox.parser import Parser
+from pylox.regex_scanner import RegexScanner
+from pylox.stmt import Stmt
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "pylox", "tool"))
+
+import generate_ast
+
+PYLOX = os.path.join(os.path.dirname(__file__), "..", "pylox")
+
+NODE_CLASSES = Expr.__subclasses__() + Stmt.__subclasses__()
+
+
+def parse(source):
+    return Parser(RegexScanner(source, ErrorReporter()).scan_tokens()).parse()
+
+
+def test_generated_modules_are_up_to_date(tmp_path):
+    generate_ast.define_ast(str(tmp_path / "expr.py"), "Expr", generate_ast.EXPR,
+                            singletons=generate_ast.SINGLETONS)
+    generate_ast.define_ast(str(tmp_path / "stmt.py"), "Stmt", generate_ast.STMT, len(generate_ast.EXPR))
+    generate_ast.define_visitor(str(tmp_path / "visitor.py"), generate_ast.EXPR, generate_ast.STMT)
+    for name in ("expr.py", "stmt.py", "visitor.py"):
+        with open(os.path.join(PYLOX, name)) as file:
+            assert (tmp_path / name).read_text() == file.read()
+
+
+@pytest.mark.parametrize("cls", NODE_CLASSES, ids=lambda cls: cls.__name__)
+def test_nodes_have_no_instance_dict(cls):
+    assert "__dict__" not in dir(cls)
+
+
+def test_kinds_are_unique():
+    assert sorted(cls.KIND for cls in NODE_CLASSES) == list(range(len(NODE_CLASSES)))
+
+
+def test_literals_are_shared():
+    statements = parse('print true; print true; print nil; print 1; print 1; print "a"; print "a"; print 1 == true;')
+    values = [statement.expression for statement in statements]
+    assert values[0] is values[1] is Literal.TRUE
+    assert values[2] is Literal.NIL
+    assert values[3] is values[4]
+    assert values[5] is values[6]
+    comparison = values[7]
+    assert comparison.left is values[3]
+    assert comparison.right is Literal.TRUE
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+from pylox.batch_runner import BatchRunner
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+SCRIPTS = {
+    "ok.lox": ("print 1 + 1;", 0, "2\n", ""),
+    "compile.lox": ("print ;", 65, "", "[line 1] Error at ';': Expect expression.\n"),
+    "runtime.lox": ('print "a";\nprint -"a";', 70, "a\n", "Operand must be a number.\n[line 2]\n"),
+    "globals.lox": ("print ok;", 70, "", "Undefined variable 'ok'.\n[line 1]\n"),
+}
+
+# Lox recursion deep enough to exhaust Python's stack on the tree engine.
+CRASH = "fun f(n) { if (n < 1) return 0; return f(n - 1) + 1; }\nprint f(100000);"
+
+
+def write_scripts(directory):
+    paths = []
+    for name, (source, *_) in SCRIPTS.items():
+        path = directory / name
+        path.write_text(source)
+        paths.append(str(path))
+    return paths
+
+
+def test_results_come_back_in_order(tmp_path):
+    paths = write_scripts(tmp_path) * 3
+    results = BatchRunner(jobs=2).run(paths)
+    assert [result.path for result in results] == paths
+    for result in results:
+        _, exit_code, stdout, stderr = SCRIPTS[os.path.basename(result.path)]
+        assert (result.exit_code, result.stdout, result.stderr) == (exit_code, stdout, stderr)
+
+
+def test_failures_only_fail_their_script(tmp_path):
+    crash = tmp_path / "crash.lox"
+    crash.write_text(CRASH)
+    ok = tmp_path / "ok.lox"
+    ok.write_text("print 1;")
+    missing = str(tmp_path / "missing.lox")
+    crashed, unreadable, fine = BatchRunner(jobs=1).run([str(crash), missing, str(ok)])
+    assert crashed.exit_code == 70
+    assert crashed.stderr.startswith("Traceback")
+    assert crashed.stderr.rstrip().endswith("RecursionError: maximum recursion depth exceeded")
+    assert (unreadable.exit_code, unreadable.stderr) == (66, f"Can't open {missing}: No such file or directory\n")
+    assert (fine.exit_code, fine.stdout) == (0, "1\n")
+
+
+def test_manifest(tmp_path):
+    (tmp_path / "scripts").mkdir()
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# scripts to run\nscripts/a.lox\n\n  scripts/b.lox  \n")
+    assert BatchRunner.read_manifest(str(manifest)) == [
+        str(tmp_path / "scripts" / "a.lox"), str(tmp_path / "scripts" / "b.lox")]
+
+
+def test_command_line(tmp_path):
+    paths = write_scripts(tmp_path)
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "lox.py"), "-j", "2", *paths],
+                            capture_output=True, text=True)
+    assert result.returncode == 70
+    assert result.stdout.splitlines()[-1].startswith("4 scripts, 3 failed, ")
+    assert "Undefined variable 'ok'." in result.stderr
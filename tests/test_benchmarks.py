@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import run as benchmarks
+
+
+def phases(**times):
+    return {phase: {"min": seconds, "median": seconds, "mean": seconds} for phase, seconds in times.items()}
+
+
+def test_compare_flags_regressions_beyond_the_threshold(capsys):
+    baseline = {"fib": phases(parse=0.100, interpret=1.0, scan=0.0001)}
+    results = {"fib": phases(parse=0.105, interpret=1.2, scan=0.0009), "new": phases(parse=1.0)}
+    assert benchmarks.compare(results, baseline, 0.10) == [("fib", "interpret", 1.2)]
+    report = capsys.readouterr().out
+    assert "interpret" in report and "REGRESSION" in report
+    assert "scan" not in report
+
+
+def test_measure_times_every_phase():
+    result = benchmarks.measure("var a = 1; print a + 1;", "tree", "regex", 2)
+    assert set(result) == set(benchmarks.PHASES) | {"total"}
+    for stats in result.values():
+        assert 0 <= stats["min"] <= stats["median"]
+
+
+def test_generated_source_compiles():
+    result = benchmarks.measure(benchmarks.generate(0.05), "tree", "regex", 1)
+    assert result["total"]["min"] > 0
+
+
+def test_committed_baseline_is_the_default():
+    args = benchmarks.parse_args([])
+    assert args.baseline == benchmarks.BASELINE
+    assert benchmarks.parse_args(["--no-baseline"]).baseline is None
+    with open(benchmarks.BASELINE) as file:
+        baseline = json.load(file)
+    assert (baseline["engine"], baseline["scanner"], baseline["megabytes"]) == (args.engine, args.scanner, args.megabytes)
+    assert set(baseline["benchmarks"]) == set(benchmarks.PROGRAMS) | {"generated"}
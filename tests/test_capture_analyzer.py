@@ -0,0 +1,66 @@
+from pylox.capture_analyzer import CaptureAnalyzer
+from pylox.error_reporter import ErrorReporter
+from pylox.parser import Parser
+from pylox.regex_scanner import RegexScanner
+
+
+def analyze(source):
+    reporter = ErrorReporter()
+    statements = Parser(RegexScanner(source, reporter).scan_tokens(), reporter).parse()
+    CaptureAnalyzer().analyze(statements)
+    return statements
+
+
+def test_only_captured_blocks_are_scoped():
+    plain, captured, shadowed = analyze("""
+        { var a = 1; print a; }
+        { var b = 2; fun f() { return b; } }
+        { var c = 3; fun g(c) { return c; } }
+    """)
+    assert not plain.scoped
+    assert captured.scoped
+    assert not shadowed.scoped
+
+
+def test_capture_from_a_nested_function_scopes_the_outer_block():
+    outer, = analyze("""
+        { var a = 1; { fun f() { fun g() { return a; } return g; } } }
+    """)
+    inner = outer.statements[1]
+    assert outer.scoped
+    assert not inner.scoped
+
+
+def test_hoisted_blocks_keep_their_own_values(run):
+    assert run("""
+        fun f(n) {
+          { var a = n; if (n > 0) f(n - 1); print a; }
+          { var b = n * 10; print b; }
+        }
+        f(2);
+    """) == ("0\n0\n1\n10\n2\n20\n", [])
+
+
+def test_each_iteration_captures_a_fresh_variable(run):
+    assert run("""
+        var first;
+        var second;
+        for (var i = 0; i < 2; i = i + 1) {
+          var j = i;
+          fun show() { print j; }
+          if (i == 0) first = show; else second = show;
+        }
+        first();
+        second();
+    """) == ("0\n1\n", [])
+
+
+def test_hoisted_variables_are_not_shared_between_blocks(run):
+    assert run("""
+        {
+          var a = "outer";
+          { var a = "first"; print a; }
+          { var b; print b; }
+          print a;
+        }
+    """) == ("first\nnil\nouter\n", [])
@@ -0,0 +1,90 @@
+import pytest
+
+
+def test_lists(run):
+    assert run("""
+        var list = List();
+        listAppend(list, 1);
+        listAppend(list, "two");
+        listAppend(list, nil);
+        print list;
+        print listLength(list);
+        print listGet(list, 1);
+        listSet(list, 1, 2);
+        print listPop(list);
+        print list;
+        listAppend(list, list);
+        print list;
+    """) == ("[1, two, nil]\n3\ntwo\nnil\n[1, 2]\n[1, 2, [...]]\n", [])
+
+
+def test_maps(run):
+    assert run("""
+        var counts = Map();
+        var words = List();
+        listAppend(words, "lox");
+        listAppend(words, "map");
+        listAppend(words, "lox");
+        var it = iterate(words);
+        while (hasNext(it)) {
+          var word = next(it);
+          mapSet(counts, word, mapGet(counts, word, 0) + 1);
+        }
+        print counts;
+        print mapHas(counts, "map");
+        print mapRemove(counts, "map");
+        print mapRemove(counts, "map");
+        print mapLength(counts);
+        print mapKeys(counts);
+        print mapValues(counts);
+        mapSet(counts, nil, counts);
+        print counts;
+    """) == ("{lox: 2, map: 1}\nTrue\n1\nnil\n1\n[lox]\n[2]\n{lox: 2, nil: {...}}\n", [])
+
+
+def test_iteration(run):
+    assert run("""
+        var list = List();
+        listAppend(list, nil);
+        listAppend(list, false);
+        var it = iterate(list);
+        while (hasNext(it)) print next(it);
+        print hasNext(it);
+        print next(it);
+        var map = Map();
+        mapSet(map, "a", 1);
+        mapSet(map, "b", 2);
+        var keys = iterate(map);
+        while (hasNext(keys)) mapRemove(map, next(keys));
+        print mapLength(map);
+        var vector = iterate(vectorRange(0, 2));
+        while (hasNext(vector)) print next(vector);
+        print it;
+    """) == ("nil\nFalse\nFalse\nnil\n0\n0\n1\n<iterator>\n", [])
+
+
+def test_collections_are_compared_by_identity(run):
+    assert run("""
+        var a = List();
+        var b = List();
+        print a == b;
+        print a == a;
+        var map = Map();
+        mapSet(map, a, "a");
+        print mapGet(map, b, "missing");
+        print mapGet(map, a, "missing");
+    """) == ("False\nTrue\nmissing\na\n", [])
+
+
+@pytest.mark.parametrize("source, message", [
+    ("listGet(List(), 0);", "List index out of range."),
+    ("listGet(List(), -1);", "List index out of range."),
+    ("listGet(List(), 0.5);", "List index must be a whole number."),
+    ("listPop(List());", "Can't pop from an empty list."),
+    ("listAppend(Map(), 1);", "Expected a list."),
+    ("mapGet(List(), 1, 2);", "Expected a map."),
+    ("iterate(1);", "Can only iterate over lists, maps, vectors and files."),
+    ("next(List());", "Expected an iterator."),
+])
+def test_collection_errors(run, source, message):
+    assert run("print 1;\n" + source) == ("1\n", [message + "\n[line 2]"])
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from pylox.deep_stack import call_with_deep_stack, descend
+from pylox.session import Session
+from conftest import ENGINES, run_lox
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+DEPTH = 20000
+
+
+def test_stack_engine_runs_deeply_nested_programs():
+    assert run_lox("print " + "(" * DEPTH + "1" + ")" * DEPTH + ";", "stack") == ("1\n", [])
+    assert run_lox("print " + "-" * DEPTH + "1;", "stack") == ("1\n", [])
+    assert run_lox("{" * 5000 + "print 1;" + "}" * 5000, "stack") == ("1\n", [])
+    assert run_lox("print 0" + " + 1" * DEPTH + ";", "stack") == (f"{DEPTH}\n", [])
+
+
+@pytest.mark.parametrize("engine", [engine for engine in ENGINES if engine != "stack"])
+def test_other_engines_report_too_much_nesting(engine):
+    assert run_lox("print " + "(" * 1000 + "1" + ")" * 1000 + ";", engine) == (
+        "", ["[line 1] Error at '(': Too much nesting."])
+    assert run_lox("print\n" + "-" * 1000 + "1;", engine) == (
+        "", ["[line 2] Error at '-': Too much nesting."])
+
+
+def test_nesting_within_every_engines_limit(run):
+    depth = 60
+    assert run("print " + "(" * depth + "1" + ")" * depth + ";") == ("1\n", [])
+    assert run("{" * depth + "print 1;" + "}" * depth) == ("1\n", [])
+    assert run("print 0" + " + 1" * depth + ";") == (f"{depth}\n", [])
+
+
+def test_recursion_limit_is_left_alone():
+    limit = sys.getrecursionlimit()
+    seen = []
+
+    def watch():
+        seen.append(sys.getrecursionlimit())
+
+    def deep(n):
+        if n % 1000 == 0:
+            watch()
+        return 0 if n == 0 else descend(deep, n - 1) + 1
+
+    assert call_with_deep_stack(deep, 5 * limit) == 5 * limit
+    Session("stack").compile("print " + "(" * DEPTH + "1" + ")" * DEPTH + ";")
+    assert set(seen) == {limit}
+    assert sys.getrecursionlimit() == limit
+
+
+# A deep compile on one thread used to raise the process-wide recursion
+# limit, letting native <-> Lox recursion on another thread overflow the C
+# stack. It runs in a subprocess so a crash fails the test.
+def test_native_recursion_during_a_deep_compile():
+    script = f"""
+import sys, threading
+sys.path.insert(0, {ROOT!r})
+from pylox.session import Session
+deep = "print " + "(" * {DEPTH} + "1" + ")" * {DEPTH} + ";"
+stop = threading.Event()
+def compile():
+    session = Session("stack")
+    while not stop.is_set():
+        session.compile(deep)
+thread = threading.Thread(target=compile)
+thread.start()
+try:
+    Session("tree").run('''
+        fun sq(x) {{
+          if (x < 1) return 0;
+          var v = Vector(1);
+          vectorSet(v, 0, x - 1);
+          return vectorGet(vectorMap(v, sq), 0) + 1;
+        }}
+        print sq(100000);
+    ''')
+except RecursionError:
+    print("RecursionError")
+finally:
+    stop.set()
+    thread.join()
+"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=300)
+    assert (result.returncode, result.stdout) == (0, "RecursionError\n")
@@ -0,0 +1,117 @@
+import pytest
+
+# Programs every engine must run with the same output and errors as the
+# tree-walking Interpreter, whose messages these are (typos included).
+PROGRAMS = {
+    "arithmetic": ("""
+        print 1 + 2 * 3;
+        print (1 + 2) * 3;
+        print 7 / 2;
+        print -(4 - 6);
+        print 1 / 0;
+        print 2 > 1;
+        print 2 <= 1;
+        print 1 == 1;
+        print 1 != 2;
+    """, "7\n9\n3.5\n2\nnil\nTrue\nFalse\nTrue\nTrue\n", []),
+    "values": ("""
+        print nil;
+        print !nil;
+        print "a" + "b";
+        print "x" == "x";
+        print nil == false;
+        print clock;
+        fun f() {}
+        print f;
+        print f();
+    """, "nil\nTrue\nab\nTrue\nFalse\n<native fn>\n<fn f>\nnil\n", []),
+    "logic": ("""
+        print nil or "default";
+        print "first" or nope;
+        print false and nope;
+        print 1 and 2;
+        var a = 0;
+        if (a = 1) print "assigned " + "one";
+        if (nil) print "no"; else print "else";
+    """, "default\nfirst\nFalse\n2\nassigned one\nelse\n", []),
+    "loops": ("""
+        var total = 0;
+        for (var i = 0; i < 5; i = i + 1) total = total + i;
+        print total;
+        var n = 3;
+        while (n > 0) { print n; n = n - 1; }
+        for (;;) { print "once"; stop(); }
+    """, "10\n3\n2\n1\nonce\n", ["Undefined variable 'stop'.\n[line 7]"]),
+    "recursion": ("""
+        fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        print fib(15);
+        fun even(n) { if (n == 0) return true; return odd(n - 1); }
+        fun odd(n) { if (n == 0) return false; return even(n - 1); }
+        print even(10);
+    """, "610\nTrue\n", []),
+    "closures": ("""
+        fun adder(n) { fun add(x) { return x + n; } return add; }
+        var add2 = adder(2);
+        print add2(3);
+        var get;
+        var set;
+        {
+          var shared = "before";
+          fun g() { return shared; }
+          fun s(value) { shared = value; }
+          get = g;
+          set = s;
+        }
+        set("after");
+        print get();
+    """, "5\nafter\n", []),
+    "operand errors": ("""
+        print "ok";
+        print 1 +
+          "a";
+    """, "ok\n", ["Operands must be two numbers or two strings.\n[line 3]"]),
+    "unary error": ('print -"a";', "", ["Operand must be a number.\n[line 1]"]),
+    "comparison error": ('print 1 < "a";', "", ["Operand must be a number.\n[line 1]"]),
+    "call errors": ("""
+        fun f(a) {}
+        f(1, 2);
+    """, "", ["Expected 1 arguments but got 2.\n[line 3]"]),
+    "call non-function": ('"not a function"();', "", ["Can only call functions and classes.\n[line 1]"]),
+    "error inside a function": ("""
+        fun inner() {
+          return nope;
+        }
+        fun outer() { return inner(); }
+        print outer();
+    """, "", ["Undefined variable 'nope'.\n[line 3]"]),
+    "compile errors": ("""
+        print 1
+        var = 2;
+        print "fine";
+        1 = 2;
+    """, "", [
+        "[line 3] Error at 'var': Expect ';' after value.",
+        "[line 5] Error at '=': Invalid assignment target.",
+    ]),
+    "scan errors": ('print "unterminated;\n', "", ["[line 2] Error: Unterminated string.",
+                                                   "[line 2] Error at end: Expect expression."]),
+    "unexpected character": ("print 1;\n@", "", ["[line 2] Error: Unexpceted character."]),
+}
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_program(run, name):
+    source, output, errors = PROGRAMS[name]
+    assert run(source) == (output, errors)
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_optimized_program(run, name):
+    source, output, errors = PROGRAMS[name]
+    assert run(source, optimize=True) == (output, errors)
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_char_scanner(run, name):
+    source, output, errors = PROGRAMS[name]
+    assert run(source, scanner="char") == (output, errors)
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+from pylox.session import Session
+from conftest import run_lox
+
+
+@pytest.fixture
+def data(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("first\nsecond ☃\n\nlast", encoding="utf-8")
+    return path
+
+
+def test_read_line_from_input(engine):
+    output = io.StringIO()
+    session = Session(engine, output=output, input=io.StringIO("one\ntwo"))
+    session.run("""
+        print "prompt";
+        var line = readLine();
+        while (line != nil) { print "got " + line; line = readLine(); }
+        print readLine();
+    """)
+    assert output.getvalue() == "prompt\ngot one\ngot two\nnil\n"
+
+
+def test_file_read_line(run, data):
+    assert run(f"""
+        var file = openFile("{data}");
+        var line = fileReadLine(file);
+        while (line != nil) {{ print "[" + line + "]"; line = fileReadLine(file); }}
+        print fileReadLine(file);
+        closeFile(file);
+    """) == ("[first]\n[second ☃]\n[]\n[last]\nnil\n", [])
+
+
+def test_file_lines_and_chunks(run, data):
+    assert run(f"""
+        var lines = fileLines(openFile("{data}"));
+        var count = 0;
+        while (hasNext(lines)) {{ next(lines); count = count + 1; }}
+        print count;
+        var file = openFile("{data}");
+        print fileRead(file, 8);
+        print fileRead(file, 100);
+        print fileRead(file, 1);
+        var it = iterate(openFile("{data}"));
+        print next(it);
+    """) == ("4\nfirst\nse\ncond ☃\n\nlast\nnil\nfirst\n", [])
+
+
+def test_file_errors(run, data, tmp_path):
+    missing = tmp_path / "missing.txt"
+    binary = tmp_path / "binary.dat"
+    binary.write_bytes(b"\xff\xfe\x00")
+    assert run(f'openFile("{missing}");') == (
+        "", [f"Can't open file '{missing}': No such file or directory.\n[line 1]"])
+    assert run(f'var f = openFile("{binary}");\nfileReadLine(f);') == (
+        "", [f"File '{binary}' is not valid UTF-8.\n[line 2]"])
+    assert run(f'var f = openFile("{data}");\ncloseFile(f);\nfileReadLine(f);') == (
+        "", ["File is closed.\n[line 3]"])
+    assert run(f'fileRead(openFile("{data}"), 0);') == (
+        "", ["Read size must be a positive whole number.\n[line 1]"])
+    assert run("openFile(1);") == ("", ["File path must be a string.\n[line 1]"])
+    assert run("fileReadLine(1);") == ("", ["Expected a file.\n[line 1]"])
+
+
+def test_read_line_from_stdin(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("typed\n"))
+    assert run_lox("print readLine();") == ("typed\n", [])
@@ -0,0 +1,96 @@
+import pytest
+
+# Engines whose functions keep their AST, so the PurityChecker can look
+# inside them.
+CHECKED_ENGINES = ("tree", "quicken", "stack")
+
+
+def test_memoized_recursion(run):
+    assert run("""
+        var calls = 0;
+        fun fib(n) { calls = calls + 1; if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        fib = memoize(fib, nil);
+        print fib(30);
+        print calls;
+        print memoStats(fib);
+        print fib;
+    """) == ("832040\n31\n{hits: 28, misses: 31, size: 31, capacity: nil}\n<fn fib>\n", [])
+
+
+def test_least_recently_used_results_are_evicted(run):
+    assert run("""
+        fun square(n) { print "computing " + "square"; return n * n; }
+        var cached = memoize(square, 2);
+        cached(1);
+        cached(2);
+        cached(1);
+        cached(3);
+        print memoStats(cached);
+        cached(1);
+        cached(2);
+        memoClear(cached);
+        print memoStats(cached);
+    """) == ("computing square\n" * 3 + "{hits: 1, misses: 3, size: 2, capacity: 2}\n"
+             + "computing square\n" + "{hits: 2, misses: 4, size: 0, capacity: 2}\n", [])
+
+
+def test_arguments_are_keyed_by_type_and_value(run):
+    assert run("""
+        fun describe(x) { return x; }
+        var cached = memoize(describe, nil);
+        print cached(1);
+        print cached(true);
+        print cached("1");
+        print cached(nil);
+        print cached(List());
+        print memoStats(cached);
+    """) == ("1\nTrue\n1\nnil\n[]\n{hits: 0, misses: 4, size: 4, capacity: nil}\n", [])
+
+
+def test_purity(run, engine):
+    output, errors = run("""
+        var total = 0;
+        fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        fun local(n) { var a = n; { var b = a * 2; a = b; } return a; }
+        fun callsPure(n) { return fib(n) + local(n); }
+        fun reads(n) { return total + n; }
+        fun writes(n) { total = n; return n; }
+        fun prints(n) { print n; return n; }
+        fun native(n) { return clock(); }
+        fun closes(n) { fun inner() { return n; } return inner; }
+        fun outer() { var captured = 1; fun inner(n) { return captured + n; } return inner; }
+        print isPure(fib);
+        print isPure(local);
+        print isPure(callsPure);
+        print isPure(reads);
+        print isPure(writes);
+        print isPure(prints);
+        print isPure(native);
+        print isPure(closes);
+        print isPure(outer());
+        print isPure(clock);
+        print memoizePure(reads, nil) == reads;
+    """)
+    pure = "True" if engine in CHECKED_ENGINES else "False"
+    assert (output, errors) == (f"{pure}\n{pure}\n{pure}\n" + "False\n" * 7 + "True\n", [])
+
+
+def test_memoize_pure(run, engine):
+    output, errors = run("""
+        fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        var cached = memoizePure(fib, 10);
+        print cached(20);
+        print cached == fib;
+    """)
+    assert (output, errors) == ("6765\n" + ("False" if engine in CHECKED_ENGINES else "True") + "\n", [])
+
+
+@pytest.mark.parametrize("source, message", [
+    ("memoize(1, nil);", "Can only memoize functions."),
+    ("fun f(n) { return n; } memoize(f, 0);", "Capacity must be a positive whole number or nil."),
+    ("fun f(n) { return n; } memoizePure(f, 1.5);", "Capacity must be a positive whole number or nil."),
+    ("memoStats(clock);", "Expected a memoized function."),
+    ("memoClear(nil);", "Expected a memoized function."),
+])
+def test_memo_errors(run, source, message):
+    assert run("print 1;\n" + source) == ("1\n", [message + "\n[line 2]"])
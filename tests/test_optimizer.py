@@ -0,0 +1,48 @@
+from pylox.error_reporter import ErrorReporter
+from pylox.expr import Binary
+from pylox.interpreter import Interpreter
+from pylox.optimizer import Optimizer
+from pylox.parser import Parser
+from pylox.regex_scanner import RegexScanner
+from pylox.resolver import Resolver
+from pylox.stmt import Print, While
+
+
+def optimize(source):
+    reporter = ErrorReporter()
+    statements = Parser(RegexScanner(source, reporter).scan_tokens(), reporter).parse()
+    Resolver(reporter).resolve(statements)
+    return Optimizer(Interpreter(reporter)).optimize(statements)
+
+
+def test_folds_constant_operators():
+    print_stmt, = optimize('print (1 + 2) * 3 - -4 == 13 and "a" + "b";')
+    assert print_stmt.expression.value == "ab"
+
+
+def test_leaves_failing_operations_in_place():
+    print_stmt, = optimize('print 1 + "a";')
+    expr = print_stmt.expression
+    assert type(expr) is Binary
+    assert (expr.left.value, expr.right.value) == (1.0, "a")
+
+
+def test_removes_constant_branches_and_loops():
+    statements = optimize("""
+        if (false) print "never";
+        if (true) print "then"; else print "else";
+        while (false) print "never";
+        while (true) print "forever";
+    """)
+    assert [type(statement) for statement in statements] == [Print, While]
+    assert statements[0].expression.value == "then"
+
+
+def test_strips_statements_after_return():
+    function, = optimize("fun f() { return 1; print \"unreachable\"; }")
+    assert len(function.body) == 1
+
+
+def test_optimized_programs_fail_on_the_same_line(run):
+    source = 'var a = 1;\nprint a;\nprint -"x" +\n  1;'
+    assert run(source, optimize=True) == run(source) == ("1\n", ["Operand must be a number.\n[line 3]"])
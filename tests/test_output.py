@@ -0,0 +1,64 @@
+import contextlib
+import io
+
+from pylox.output import Output
+from pylox.session import Session
+
+
+class RecordingStream:
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_lines_are_written_once_the_buffer_fills():
+    stream = RecordingStream()
+    output = Output(stream, buffer_size=10)
+    output.write_line("four")
+    output.write_line("five")
+    assert stream.writes == []
+    output.write_line("!")
+    assert stream.writes == ["four\nfive\n!\n"]
+    output.write_line("tail")
+    output.flush()
+    assert stream.writes == ["four\nfive\n!\n", "tail\n"]
+
+
+def test_unbuffered_output_writes_every_line():
+    stream = RecordingStream()
+    output = Output(stream, buffer_size=0)
+    output.write_line("a")
+    output.write_line("b")
+    assert stream.writes == ["a\n", "b\n"]
+
+
+def test_default_stream_is_the_current_stdout():
+    output = Output()
+    output.write_line("captured")
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        output.flush()
+    assert captured.getvalue() == "captured\n"
+
+
+def test_every_run_flushes(engine):
+    stream = RecordingStream()
+    session = Session(engine, output=stream)
+    session.run("for (var i = 0; i < 100; i = i + 1) print i;")
+    assert stream.writes == ["".join(f"{i}\n" for i in range(100))]
+    session.run("print 1 + nil;")
+    assert len(stream.writes) == 1
+
+
+def test_output_and_errors_stay_in_order(engine):
+    combined = io.StringIO()
+    session = Session(engine, stream=combined, output=combined)
+    session.run('print "first";\nprint -"second";')
+    session.run('print "third";')
+    assert combined.getvalue() == "first\nOperand must be a number.\n[line 2]\nthird\n"
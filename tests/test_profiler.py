@@ -0,0 +1,80 @@
+import io
+
+import pytest
+
+from pylox.profiler import Profiler
+from pylox.session import Session
+
+PROGRAM = """
+fun leaf(n) { return n; }
+fun fib(n) { if (n < 2) return leaf(n); return fib(n - 1) + fib(n - 2); }
+print fib(5);
+print clock() > 0;
+"""
+
+
+@pytest.fixture(params=["tree", "quicken"])
+def profiled(request):
+    output = io.StringIO()
+    session = Session(request.param, output=output)
+    profiler = session.profile()
+    assert session.run(PROGRAM).errors == []
+    assert output.getvalue() == "5\nTrue\n"
+    return profiler
+
+
+def test_calls_and_edges(profiled):
+    assert profiled.calls == {"fib:3": 15, "leaf:2": 8, "clock (native)": 1}
+    assert {edge: count for edge, (count, _) in profiled.edges.items()} == {
+        ("<script>", "fib:3"): 1,
+        ("fib:3", "fib:3"): 14,
+        ("fib:3", "leaf:2"): 8,
+        ("<script>", "clock (native)"): 1,
+    }
+
+
+def test_times(profiled):
+    # Recursive calls only count towards cumulative time once.
+    assert profiled.cumulative_time["fib:3"] >= profiled.self_time["fib:3"] > 0
+    assert profiled.cumulative_time["fib:3"] >= profiled.cumulative_time["leaf:2"]
+    assert sum(profiled.self_time.values()) == pytest.approx(sum(profiled.stacks.values()))
+
+
+def test_collapsed_stacks(profiled):
+    stacks = [line.rsplit(" ", 1)[0] for line in profiled.collapsed_stacks().splitlines()]
+    assert stacks == sorted(stacks)
+    assert "fib:3;fib:3;fib:3;fib:3;leaf:2" in stacks
+    assert "clock (native)" in stacks
+
+
+def test_report(profiled):
+    report = profiled.report().splitlines()
+    assert report[0].split() == ["calls", "self", "(s)", "cumul", "(s)", "per", "call", "(ms)", "function"]
+    assert len(report) == 1 + 3 + 1 + 1 + 4
+
+
+def test_only_tree_engines_can_be_profiled():
+    with pytest.raises(ValueError):
+        Session("vm").profile()
+
+
+def test_profiled_recursion_reaches_the_same_depth():
+    source = "fun down(n) { if (n < 1) return 0; return down(n - 1) + 1; }\nprint down(80);"
+    output = io.StringIO()
+    session = Session("tree", output=output)
+    session.profile()
+    assert session.run(source).errors == []
+    assert output.getvalue() == "80\n"
+
+
+@pytest.mark.parametrize("engine", ["tree", "quicken"])
+def test_profiled_runaway_recursion_overflows(engine):
+    output = io.StringIO()
+    session = Session(engine, output=output)
+    profiler = session.profile()
+    result = session.run('fun f(n) { return f(n + 1); }\nprint "start";\nf(0);')
+    assert output.getvalue() == "start\n"
+    assert [str(error) for error in result.errors] == ["Stack overflow.\n[line 1]"]
+    assert profiler.calls["f:1"] == Profiler.max_depth
+    assert session.run("fun down(n) { if (n < 1) return 0; return down(n - 1) + 1; }\nprint down(500);").errors == []
+    assert output.getvalue() == "start\n500\n"
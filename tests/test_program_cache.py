@@ -0,0 +1,92 @@
+import io
+import os
+
+import pytest
+
+from pylox.program_cache import ProgramCache
+from pylox.session import Session
+
+SCRIPT = """
+var greeting = "hello";
+fun shout(text) { return text + "!"; }
+{
+  var local = shout(greeting);
+  print local;
+}
+for (var i = 0; i < 2; i = i + 1) print i * 1.5;
+if (false) print "dead"; else print nil;
+print shout(
+  1);
+"""
+
+OUTPUT = "hello!\n0\n1.5\nnil\n"
+ERRORS = ["Operands must be two numbers or two strings.\n[line 3]"]
+
+
+def run_file(path, engine="tree", **options):
+    output = io.StringIO()
+    result = Session(engine, cache=True, output=output, **options).run_file(str(path))
+    return output.getvalue(), [str(error) for error in result.errors]
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "script.lox"
+    path.write_text(SCRIPT)
+    return path
+
+
+@pytest.mark.parametrize("options", [{}, {"optimize": True}, {"scanner": "char"}], ids=["plain", "optimized", "char"])
+def test_cached_runs_match_uncached_runs(script, engine, options):
+    cache = ProgramCache.path_for(str(script))
+    assert run_file(script, engine, **options) == (OUTPUT, ERRORS)
+    assert os.path.exists(cache)
+    written = os.path.getmtime(cache)
+    assert run_file(script, engine, **options) == (OUTPUT, ERRORS)
+    assert os.path.getmtime(cache) == written
+
+
+def test_entry_location(script):
+    assert ProgramCache.path_for(str(script)) == str(script.parent / "__loxcache__" / "script.loxc")
+
+
+def test_changed_source_is_recompiled(script):
+    run_file(script)
+    script.write_text('print "changed";')
+    assert run_file(script) == ("changed\n", [])
+
+
+def test_options_get_separate_entries(script):
+    run_file(script)
+    cache = ProgramCache((True,))
+    with open(script, "rb") as file:
+        assert cache.load(str(script), file.read()) is None
+
+
+def test_unreadable_entry_is_rewritten(script):
+    run_file(script)
+    cache = ProgramCache.path_for(str(script))
+    with open(cache, "rb") as file:
+        header = file.read(4 + 32)
+    with open(cache, "wb") as file:
+        file.write(header + b"garbage")
+    assert run_file(script) == (OUTPUT, ERRORS)
+    with open(cache, "rb") as file:
+        assert file.read() != header + b"garbage"
+
+
+def test_compile_errors_are_not_cached(tmp_path):
+    path = tmp_path / "broken.lox"
+    path.write_text("print 1 +;")
+    assert run_file(path) == ("", ["[line 1] Error at ';': Expect expression."])
+    assert not os.path.exists(ProgramCache.path_for(str(path)))
+
+
+@pytest.mark.parametrize("first, second, depth", [("stack", "tree", 400), ("tree", "python", 150)])
+def test_engines_with_different_nesting_bounds_share_a_cache(tmp_path, first, second, depth):
+    path = tmp_path / "deep.lox"
+    path.write_text("print " + "-" * depth + "1;")
+    expected = "1\n" if depth % 2 == 0 else "-1\n"
+    assert run_file(path, first) == (expected, [])
+    assert run_file(path, second) == ("", ["[line 1] Error at '-': Too much nesting."])
+    assert run_file(path, first) == (expected, [])
@@ -0,0 +1,57 @@
+import io
+
+from pylox.session import Session
+
+
+def run(source):
+    output = io.StringIO()
+    session = Session("quicken", output=output)
+    errors = [str(error) for error in session.run(source).errors]
+    return output.getvalue(), errors, session.interpreter
+
+
+def test_sites_specialise_and_deoptimise():
+    output, errors, interpreter = run("""
+        fun add(a, b) { return a + b; }
+        print add(1, 2);
+        print add(3, 4);
+        print add("a", "b");
+        print add(5, 6);
+    """)
+    assert (output, errors) == ("3\n7\nab\n11\n", [])
+    assert interpreter.specialized == {"FloatAdd": 1}
+    assert interpreter.deoptimized == {"FloatAdd": 1}
+
+
+def test_guard_failure_reports_the_generic_error():
+    output, errors, interpreter = run("""
+        fun less(a, b) { return a < b; }
+        print less(1, 2);
+        print less(1,
+          nil);
+    """)
+    assert (output, errors) == ("True\n", ["Operand must be a number.\n[line 2]"])
+    assert interpreter.deoptimized == {"FloatLess": 1}
+
+
+def test_logical_sites_keep_non_boolean_operands():
+    output, errors, interpreter = run("""
+        fun either(a, b) { return a or b; }
+        print either(false, true);
+        print either(nil, "fallback");
+        print either("first", 1);
+    """)
+    assert (output, errors) == ("True\nfallback\nfirst\n", [])
+    assert interpreter.specialized == {"BoolOr": 1}
+    assert interpreter.deoptimized == {"BoolOr": 1}
+
+
+def test_report():
+    _, _, interpreter = run("var x = 1; for (var i = 0; i < 3; i = i + 1) x = -x;")
+    assert interpreter.quickening_report() == (
+        "specialized sites: 3\n"
+        "  FloatAdd: 1\n"
+        "  FloatLess: 1\n"
+        "  FloatNegate: 1\n"
+        "deoptimized sites: 0"
+    )
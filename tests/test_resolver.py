@@ -0,0 +1,92 @@
+from pylox.error_reporter import ErrorReporter
+from pylox.parser import Parser
+from pylox.regex_scanner import RegexScanner
+from pylox.resolver import Resolver
+
+
+def resolve(source):
+    reporter = ErrorReporter()
+    statements = Parser(RegexScanner(source, reporter).scan_tokens(), reporter).parse()
+    resolver = Resolver(reporter)
+    resolver.resolve(statements)
+    return statements, resolver, [str(error) for error in reporter.errors]
+
+
+def test_locals_get_depth_and_slot():
+    statements, _, errors = resolve("fun f(a, b) { var c = a; fun g() { return b + c; } }")
+    assert errors == []
+    f = statements[0]
+    c = f.body[0]
+    g = f.body[1]
+    assert c.initializer.depth == 0 and c.initializer.slot == 0
+    b, c_read = g.body[0].value.left, g.body[0].value.right
+    assert (b.depth, b.slot) == (1, 1)
+    assert (c_read.depth, c_read.slot) == (1, 2)
+
+
+def test_unresolved_names_are_globals():
+    statements, _, errors = resolve("fun f() { return later; } var later = 1;")
+    assert errors == []
+    assert statements[0].body[0].value.depth is None
+
+
+def test_shadowing_and_scopes(run):
+    assert run("""
+        var a = "global";
+        {
+          fun show() { print a; }
+          show();
+          var a = "block";
+          show();
+          print a;
+          { var a = "inner"; print a; }
+          print a;
+        }
+        print a;
+    """) == ("global\nglobal\nblock\ninner\nblock\nglobal\n", [])
+
+
+def test_closures_see_assignments(run):
+    assert run("""
+        fun counter() {
+          var count = 0;
+          fun increment() { count = count + 1; return count; }
+          return increment;
+        }
+        var a = counter();
+        var b = counter();
+        a(); a();
+        print a();
+        print b();
+    """) == ("3\n1\n", [])
+
+
+def test_slots_released_by_a_block_are_reused(run):
+    assert run("""
+        fun f() {
+          { var a = 1; var b = 2; print a + b; }
+          { var c = 3; print c; }
+          var d = 4;
+          print d;
+        }
+        f();
+        { var x = "x"; print x; }
+        { var y = "y"; print y; }
+    """) == ("3\n3\n4\nx\ny\n", [])
+
+
+def test_static_errors(run):
+    assert run("""
+        fun f() { var a = 1; var a = 2; }
+        { var b = b; }
+        return 1;
+    """) == ("", [
+        "[line 2] Error at 'a': Already a variable with this name in this scope.",
+        "[line 3] Error at 'b': Can't read local variable in its own initializer.",
+        "[line 4] Error at 'return': Can't return from top-level code.",
+    ])
+
+
+def test_undefined_global_is_a_runtime_error(run):
+    assert run("print 1;\nprint nope;\nprint 2;") == ("1\n", ["Undefined variable 'nope'.\n[line 2]"])
+    assert run("nope = 1;") == ("", ["Undefined variable 'nope'.\n[line 1]"])
@@ -0,0 +1,63 @@
+import io
+
+from pylox.interpreter import Interpreter
+from pylox.return_exception import ReturnException
+from pylox.session import Session
+
+PROGRAM = """
+    fun find(limit) {
+      for (var i = 0; i < limit; i = i + 1) {
+        var j = 0;
+        while (j <= i) {
+          if (i * j == 6) { { return i + j; } }
+          j = j + 1;
+        }
+      }
+    }
+    fun falsy(which) {
+      if (which == 0) return nil;
+      if (which == 1) return false;
+      if (which == 2) return;
+      return 0;
+    }
+    fun none() { var a = 1; }
+    fun after(n) {
+      { var a = "block"; if (n > 0) return after(n - 1) + a; }
+      return "";
+    }
+    print find(10);
+    print falsy(0);
+    print falsy(1);
+    print falsy(2);
+    print falsy(3);
+    print none();
+    print after(2);
+    var outer = "still global";
+    print outer;
+"""
+
+OUTPUT = "5\nnil\nFalse\nnil\n0\nnil\nblockblock\nstill global\n"
+
+
+def test_return_completes_through_every_statement(run):
+    assert run(PROGRAM) == (OUTPUT, [])
+
+
+# The return path engines used before completion values: LoxFunction.call
+# still accepts it.
+class ExceptionReturnInterpreter(Interpreter):
+
+    def visit_return_stmt(self, stmt):
+        value = None
+        if stmt.value is not None:
+            value = self._evaluate(stmt.value)
+        raise ReturnException(value)
+
+
+def test_return_exception_is_still_caught():
+    output = io.StringIO()
+    session = Session(output=output)
+    session.interpreter = ExceptionReturnInterpreter(session.reporter)
+    session.interpreter.output = session.output
+    assert session.run(PROGRAM).errors == []
+    assert output.getvalue() == OUTPUT
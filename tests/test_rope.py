@@ -0,0 +1,61 @@
+from pylox.rope import ROPE_THRESHOLD, Rope, concat, flatten
+
+
+def test_short_concatenations_stay_str():
+    assert concat("ab", "cd") == "abcd"
+    assert type(concat("ab", "cd")) is str
+
+
+def test_long_concatenations_build_a_rope():
+    left = "a" * ROPE_THRESHOLD
+    rope = concat(left, "b")
+    assert type(rope) is Rope
+    assert len(rope) == ROPE_THRESHOLD + 1
+    assert str(rope) == left + "b"
+    assert flatten(rope) == left + "b"
+    assert flatten("plain") == "plain"
+
+
+def test_ropes_compare_and_hash_like_their_text():
+    text = "x" * ROPE_THRESHOLD + "y"
+    rope = concat("x" * ROPE_THRESHOLD, "y")
+    assert rope == text and text == rope
+    assert rope != text + "z"
+    assert rope == concat("x" * ROPE_THRESHOLD, "y")
+    assert hash(rope) == hash(text)
+    assert {rope: 1}[text] == 1
+    assert rope != 1
+
+
+def test_appending_to_an_older_rope_leaves_newer_ones_alone():
+    base = concat("a" * ROPE_THRESHOLD, "b")
+    first = concat(base, "c")
+    second = concat(base, "d")
+    third = concat(first, "e")
+    assert [str(rope) for rope in (base, first, second, third)] == [
+        "a" * ROPE_THRESHOLD + suffix for suffix in ("b", "bc", "bd", "bce")]
+
+
+def test_appending_after_flattening():
+    rope = concat("a" * ROPE_THRESHOLD, "b")
+    str(rope)
+    assert str(concat(rope, "c")) == "a" * ROPE_THRESHOLD + "bc"
+    assert str(concat("z", rope)) == "z" + "a" * ROPE_THRESHOLD + "b"
+
+
+def test_string_building_in_lox(run):
+    assert run("""
+        var s = "";
+        for (var i = 0; i < 300; i = i + 1) s = s + "ab";
+        var t = s;
+        s = s + "!";
+        t = t + "?";
+        print s == t;
+        var same = "";
+        for (var i = 0; i < 300; i = i + 1) same = same + "ab";
+        print same + "!" == s;
+        var lengths = Map();
+        mapSet(lengths, s, 1);
+        print mapGet(lengths, same + "!", 0);
+        print s;
+    """) == ("False\nTrue\n1\n" + "ab" * 300 + "!\n", [])
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+from pylox.line_table import LineTable
+from pylox.session import Session
+
+LIBRARY = """// A library of functions.
+fun double(x) { return x * 2; }
+fun bad(x) {
+  return x + "ç";
+}
+"""
+
+
+@pytest.fixture
+def index_builds(monkeypatch):
+    builds = []
+    index = LineTable._index
+
+    def counting_index(self):
+        builds.append(self)
+        return index(self)
+
+    monkeypatch.setattr(LineTable, "_index", counting_index)
+    return builds
+
+
+def errors(result):
+    return [str(error) for error in result.errors]
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_functions_outlive_the_mapped_script(tmp_path, engine, cache):
+    script = tmp_path / "library.lox"
+    script.write_text(LIBRARY, encoding="utf-8")
+    for _ in range(2):
+        output = io.StringIO()
+        session = Session(engine, cache=cache, output=output)
+        assert errors(session.run_file(str(script))) == []
+        assert errors(session.run("print double(21);\nbad(1);")) == ["Operands must be two numbers or two strings.\n[line 4]"]
+        assert output.getvalue() == "42\n"
+
+
+def test_empty_script(tmp_path, engine):
+    script = tmp_path / "empty.lox"
+    script.write_text("")
+    assert errors(Session(engine).run_file(str(script))) == []
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure", "vm", "quicken", "stack"])
+@pytest.mark.parametrize("cache", [False, True])
+def test_lines_are_only_found_for_errors(tmp_path, engine, cache, index_builds):
+    script = tmp_path / "script.lox"
+    script.write_text(LIBRARY + "print double(2);\n", encoding="utf-8")
+    for _ in range(2):
+        session = Session(engine, cache=cache, output=io.StringIO())
+        assert errors(session.run_file(str(script))) == []
+        assert index_builds == []
+    script.write_text(LIBRARY + "print bad(2);\n", encoding="utf-8")
+    assert errors(Session(engine, cache=cache, output=io.StringIO()).run_file(str(script))) == [
+        "Operands must be two numbers or two strings.\n[line 4]"]
+    assert len(index_builds) == 1
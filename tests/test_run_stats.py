@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+from pylox.regex_scanner import RegexScanner
+from pylox.run_stats import RunStats
+from pylox.session import Session
+
+PROGRAM = """
+var total = 0;
+fun add(n) { total = total + n; }
+for (var i = 0; i < 3; i = i + 1) { add(i); }
+print total;
+"""
+
+TOKENS = len(RegexScanner(PROGRAM).scan_tokens())
+
+
+def run(engine, source=PROGRAM):
+    output = io.StringIO()
+    result = Session(engine, stats=True, output=output).run(source)
+    assert output.getvalue() == "3\n"
+    return result.stats
+
+
+@pytest.mark.parametrize("engine", ["tree", "quicken"])
+def test_instrumented_engines_count_execution(engine):
+    stats = run(engine)
+    assert stats.tokens == TOKENS
+    assert stats.calls == 3
+    # The loop's blocks capture nothing, so only the calls get environments.
+    assert stats.environments == 3
+    assert stats.peak_scope_depth == 2
+    assert stats.statements > 0
+    assert sum(stats.lookups.values()) > 0
+
+
+def test_every_engine_reports_phases(engine):
+    stats = run(engine)
+    assert stats.tokens == TOKENS
+    assert stats.nodes > 0
+    assert stats.scan_time > 0 and stats.parse_time > 0
+    if engine not in ("tree", "quicken"):
+        assert (stats.statements, stats.calls, stats.lookups) == (None, None, None)
+        assert "calls:            n/a" in stats.report()
+
+
+def test_each_run_gets_its_own_stats():
+    session = Session(stats=True, output=io.StringIO())
+    first = session.run("fun f() {} f(); f();").stats
+    second = session.run("f();").stats
+    assert (first.calls, second.calls) == (2, 1)
+
+
+def test_report_and_dict():
+    stats = run("tree")
+    report = stats.report()
+    assert report.startswith("scan:")
+    assert "environments:     3" in report
+    values = stats.as_dict()
+    assert values["calls"] == 3
+    assert "_instrumented" not in values
+
+
+@pytest.mark.parametrize("engine", ["tree", "quicken"])
+def test_instrumented_runaway_recursion_overflows(engine):
+    session = Session(engine, stats=True, output=io.StringIO())
+    result = session.run("fun f(n) { { var local = n; f(local + 1); } }\nf(0);")
+    assert [str(error) for error in result.errors] == ["Stack overflow.\n[line 1]"]
+    assert result.stats.calls == RunStats.max_depth
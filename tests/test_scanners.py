@@ -0,0 +1,60 @@
+import pytest
+
+from pylox.error_reporter import ErrorReporter
+from pylox.regex_scanner import RegexScanner
+from pylox.scanner import Scanner
+from pylox.token_type import TokenType
+
+SOURCE = """// a comment
+var cafe = "multi
+line string";
+fun f(a, b) { return a >= b and !(a == b) or a != nil; }
+print 12.5 + .5 - 3. * 4 / 2 < 1 <= 0 > -1;
+while (true) { if (false) {} else {} for (;;) {} }
+"snow ☃" // trailing comment without a newline"""
+
+
+def tokens(scanner, source):
+    reporter = ErrorReporter()
+    scanned = [(token.type, token.lexeme, token.literal, token.line)
+               for token in scanner(source, reporter).scan_tokens()]
+    return scanned, [str(error) for error in reporter.errors]
+
+
+def test_scanners_agree():
+    expected = tokens(Scanner, SOURCE)
+    assert expected[1] == []
+    assert tokens(RegexScanner, SOURCE) == expected
+    assert tokens(RegexScanner, SOURCE.encode()) == expected
+
+
+def test_tokens():
+    scanned, _ = tokens(RegexScanner, 'var s = "a\nb"; print 1.5;\n')
+    assert scanned == [
+        (TokenType.VAR, "var", None, 1),
+        (TokenType.IDENTIFIER, "s", None, 1),
+        (TokenType.EQUAL, "=", None, 1),
+        (TokenType.STRING, '"a\nb"', "a\nb", 1),
+        (TokenType.SEMICOLON, ";", None, 2),
+        (TokenType.PRINT, "print", None, 2),
+        (TokenType.NUMBER, "1.5", 1.5, 2),
+        (TokenType.SEMICOLON, ";", None, 2),
+        (TokenType.EOF, "", None, 3),
+    ]
+
+
+@pytest.mark.parametrize("source", [
+    'print "unterminated;\n',
+    "var a = 1;\n@ # var b;\n",
+    "print 1;\n\"multi\nline",
+])
+def test_scanners_report_the_same_errors(source):
+    expected = tokens(Scanner, source)
+    assert expected[1]
+    assert tokens(RegexScanner, source) == expected
+    assert tokens(RegexScanner, source.encode()) == expected
+
+
+def test_identifiers_are_interned():
+    first, second = [token.lexeme for token in RegexScanner("counter counter").scan_tokens()[:2]]
+    assert first is second
@@ -0,0 +1,60 @@
+import io
+
+from pylox.lox_error import LoxError
+from pylox.session import Session
+
+
+def test_globals_persist_between_runs(engine):
+    output = io.StringIO()
+    session = Session(engine, output=output)
+    session.run("var count = 1; fun bump() { count = count + 1; return count; }")
+    session.run("bump();")
+    assert session.run("print bump();").errors == []
+    assert output.getvalue() == "3\n"
+
+
+def test_reset_forgets_globals_but_keeps_natives(engine):
+    output = io.StringIO()
+    session = Session(engine, output=output)
+    session.run("var kept = 1;")
+    session.reset()
+    result = session.run("print vectorLength(Vector(2));\nprint kept;")
+    assert output.getvalue() == "2\n"
+    assert [str(error) for error in result.errors] == ["Undefined variable 'kept'.\n[line 2]"]
+
+
+def test_sessions_are_independent(engine):
+    first_output, second_output = io.StringIO(), io.StringIO()
+    first = Session(engine, output=first_output)
+    second = Session(engine, output=second_output)
+    first.run('var name = "first";')
+    second.run('var name = "second";')
+    first.run("print name;")
+    second.run("print name;")
+    assert (first_output.getvalue(), second_output.getvalue()) == ("first\n", "second\n")
+
+
+def test_results(engine):
+    session = Session(engine, output=io.StringIO())
+    result = session.run("print 1")
+    assert (result.had_error, result.had_runtime_error, result.exit_code) == (True, False, 65)
+    assert [(error.kind, error.line, error.message, error.where) for error in result.errors] == [
+        (LoxError.COMPILE, 1, "Expect ';' after value.", " at end")]
+    result = session.run("print -nil;")
+    assert (result.had_error, result.had_runtime_error, result.exit_code) == (False, True, 70)
+    assert session.run("print 1;").exit_code == 0
+
+
+def test_errors_are_printed_after_the_output_before_them(engine):
+    stream = io.StringIO()
+    output = io.StringIO()
+    session = Session(engine, stream=stream, output=output)
+    session.run('print "before";\nprint nope;')
+    assert output.getvalue() == "before\n"
+    assert stream.getvalue() == "Undefined variable 'nope'.\n[line 2]\n"
+
+
+def test_compile_returns_statements_or_none(engine):
+    session = Session(engine, output=io.StringIO())
+    assert session.compile("print 1 +;") is None
+    assert len(session.compile("var a = 1; print a;")) == 2
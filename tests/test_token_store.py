@@ -0,0 +1,44 @@
+import mmap
+
+from pylox.line_table import LineTable
+from pylox.regex_scanner import RegexScanner
+from pylox.token_store import TokenStore
+from pylox.token_type import TokenType
+
+
+def test_views_read_from_the_store():
+    source = 'print "hi";\nvar n = 2.5;'
+    store = TokenStore(source, LineTable(source))
+    string = store.add(TokenType.STRING, 6, 10)
+    number = store.add(TokenType.NUMBER, 20, 23)
+    assert len(store) == 2
+    assert (string.lexeme, string.literal, string.line, string.offset) == ('"hi"', "hi", 1, 6)
+    assert (number.lexeme, number.literal, number.line, number.offset) == ("2.5", 2.5, 2, 20)
+    assert store.view(1).lexeme == "2.5"
+
+
+def test_bytes_sources_are_decoded():
+    source = 'print "snow ☃";'.encode()
+    tokens = RegexScanner(source).scan_tokens()
+    assert [token.lexeme for token in tokens] == ["print", '"snow ☃"', ";", ""]
+    assert tokens[1].literal == "snow ☃"
+
+
+def test_scanner_fills_the_store():
+    scanner = RegexScanner("var a = 1;\nprint a;")
+    tokens = scanner.scan_tokens()
+    assert len(scanner.store) == len(tokens) == 9
+    assert list(scanner.store.types) == [token.type.value for token in tokens]
+    assert scanner.lines._newlines is None
+    assert tokens[-2].line == 2
+
+
+def test_detach_copies_a_mapped_source(tmp_path):
+    path = tmp_path / "script.lox"
+    path.write_bytes(b"var a = 1;\nprint a;")
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        scanner = RegexScanner(source)
+        tokens = scanner.scan_tokens()
+        scanner.store.detach()
+    assert [token.lexeme for token in tokens[5:8]] == ["print", "a", ";"]
+    assert tokens[6].line == 2
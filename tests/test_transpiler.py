@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+HUGE = "1" + "0" * 400
+
+
+def transpile_and_run(tmp_path, source, *options):
+    script = tmp_path / "script.lox"
+    script.write_text(source)
+    module = tmp_path / "script.py"
+    subprocess.run([sys.executable, os.path.join(ROOT, "lox.py"), *options, "--transpile", str(module), str(script)],
+                   check=True)
+    return subprocess.run([sys.executable, str(module)], capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": ROOT})
+
+
+def test_module_runs_directly(tmp_path):
+    result = transpile_and_run(tmp_path, "fun square(x) { return x * x; }\nprint square(12);\n")
+    assert (result.returncode, result.stdout, result.stderr) == (0, "144\n", "")
+
+
+def test_module_reports_runtime_errors_on_lox_lines(tmp_path):
+    result = transpile_and_run(tmp_path, "print 1;\n\nprint nope;\n")
+    assert (result.returncode, result.stdout, result.stderr) == (70, "1\n", "Undefined variable 'nope'.\n[line 3]\n")
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_non_finite_literals(run, optimize):
+    assert run(f"""
+        print {HUGE};
+        print -{HUGE};
+        var nan = {HUGE} - {HUGE};
+        print nan == nan;
+        print {HUGE} - {HUGE};
+    """, optimize=optimize) == ("inf\n-inf\nFalse\nnan\n", [])
+
+
+def test_module_with_non_finite_literals(tmp_path):
+    result = transpile_and_run(tmp_path, f"print {HUGE};\nprint {HUGE} - {HUGE};\n", "-O")
+    assert (result.returncode, result.stdout) == (0, "inf\nnan\n")
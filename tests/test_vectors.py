@@ -0,0 +1,67 @@
+import pytest
+
+
+def test_vector_operations(run):
+    assert run("""
+        var v = vectorRange(1, 5);
+        print v;
+        print vectorLength(v);
+        print vectorGet(v, 2);
+        vectorSet(v, 0, 10);
+        print vectorAdd(v, 1);
+        print vectorMul(v, vectorRange(0, 4));
+        print vectorDiv(v, 2);
+        print vectorDot(v, v);
+        print vectorSum(v);
+        print vectorMin(v);
+        print vectorMax(Vector(0));
+        print vectorSlice(v, 1, 3);
+        print vectorSort(v);
+        print vectorRange(0, 10);
+        print Vector(2);
+    """) == ("""<vector [1, 2, 3, 4]>
+4
+3
+<vector [11, 3, 4, 5]>
+<vector [0, 2, 6, 12]>
+<vector [5, 1, 1.5, 2]>
+129
+19
+2
+nil
+<vector [2, 3]>
+<vector [2, 3, 4, 10]>
+<vector [0, 1, 2, ..., 7, 8, 9] length 10>
+<vector [0, 0]>
+""", [])
+
+
+def test_vectors_call_back_into_lox(run):
+    assert run("""
+        fun square(x) { return x * x; }
+        var v = vectorRange(0, 4);
+        print vectorMap(v, square);
+        fun big(x) { return x > 1; }
+        print vectorFilter(v, big);
+    """) == ("<vector [0, 1, 4, 9]>\n<vector [2, 3]>\n", [])
+
+
+@pytest.mark.parametrize("source, message", [
+    ("vectorGet(Vector(2), 2);", "Vector index out of range."),
+    ("vectorGet(Vector(2), 0.5);", "Vector index must be a whole number."),
+    ("vectorSet(Vector(2), 0, \"a\");", "Expected a number."),
+    ("Vector(-1);", "Vector size must be a non-negative whole number."),
+    ("vectorAdd(Vector(2), Vector(3));", "Vectors must have the same length."),
+    ("vectorDiv(Vector(1), 0);", "Division by zero."),
+    ("vectorLength(List());", "Expected a vector."),
+    ("vectorMap(Vector(1), clock);", "Expected a function of one argument."),
+    ("fun f(x) { return nil; } vectorMap(Vector(1), f);", "Map function must return a number."),
+])
+def test_vector_errors(run, source, message):
+    assert run("print 1;\n" + source) == ("1\n", [message + "\n[line 2]"])
+
+
+def test_division_by_zero_differs_from_scalar_division(run):
+    # A vector can't hold the nil that scalar / gives for a zero divisor.
+    assert run("print 1 / 0;\nvectorDiv(vectorRange(1, 3), vectorRange(0, 2));") == (
+        "nil\n", ["Division by zero.\n[line 2]"])
@@ -0,0 +1,50 @@
+import io
+
+from pylox.session import Session
+from conftest import run_lox
+
+
+def test_disassembly():
+    output = io.StringIO()
+    session = Session("vm", output=output)
+    session.interpreter.show_disassembly = True
+    session.run("print 1;\nprint nope;")
+    assert output.getvalue() == (
+        "== <script> ==\n"
+        "0000    1 OP_CONSTANT         0 '1.0'\n"
+        "0002    | OP_PRINT\n"
+        "0003    2 OP_GET_GLOBAL       1 'nope'\n"
+        "0005    | OP_PRINT\n"
+        "0006    | OP_NIL\n"
+        "0007    | OP_RETURN\n"
+        "1\n"
+    )
+
+
+def test_deep_recursion_overflows_the_frame_stack():
+    assert run_lox("fun f(n) {\n  return f(n + 1);\n}\nf(0);", "vm") == ("", ["Stack overflow.\n[line 2]"])
+
+
+def test_upvalues_are_closed_per_iteration():
+    assert run_lox("""
+        var closures = List();
+        for (var i = 0; i < 3; i = i + 1) {
+          var captured = i;
+          fun show() { print captured; }
+          listAppend(closures, show);
+        }
+        for (var i = 0; i < 3; i = i + 1) listGet(closures, i)();
+    """, "vm") == ("0\n1\n2\n", [])
+
+
+def test_runtime_error_lines_of_multiline_expressions():
+    assert run_lox('var a = 1;\nprint a +\n  a -\n  "b";', "vm") == ("", ["Operand must be a number.\n[line 3]"])
+
+
+def test_runs_again_after_a_runtime_error():
+    output = io.StringIO()
+    session = Session("vm", output=output)
+    errors = session.run("fun f() { return nope; }\nprint f();").errors
+    assert [str(error) for error in errors] == ["Undefined variable 'nope'.\n[line 1]"]
+    assert session.run("fun g(n) { return n * 2; }\nprint g(21);").errors == []
+    assert output.getvalue() == "42\n"